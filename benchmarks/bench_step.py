@@ -0,0 +1,48 @@
+"""
+Steps/second of the stepping paths:
+  step()       allocating reference
+  step_into()  in-place, one State-free step at a time
+  advance()    fused multi-step kernel used by SimOrchestrator.tick(n)
+
+    python -m benchmarks.bench_step [seconds_of_sim]
+"""
+from __future__ import annotations
+
+import sys
+import time
+
+from bioflow.sim.state import StateBuffer, Params
+from bioflow.sim.engine import step, step_into, advance
+from bioflow.sim.orchestrator import SimOrchestrator
+
+
+def bench(sim_seconds: float = 60.0) -> dict[str, float]:
+    p = Params()
+    n = int(sim_seconds / p.dt)
+    s0 = SimOrchestrator(p).state
+
+    s = s0
+    t0 = time.perf_counter()
+    for _ in range(n):
+        s = step(s, p)
+    r_step = n / (time.perf_counter() - t0)
+
+    buf = StateBuffer(s0)
+    t0 = time.perf_counter()
+    for _ in range(n):
+        step_into(buf, p)
+    r_into = n / (time.perf_counter() - t0)
+
+    buf = StateBuffer(s0)
+    t0 = time.perf_counter()
+    advance(buf, p, n)
+    r_adv = n / (time.perf_counter() - t0)
+
+    return {"step": r_step, "step_into": r_into, "advance": r_adv}
+
+
+if __name__ == "__main__":
+    secs = float(sys.argv[1]) if len(sys.argv) > 1 else 60.0
+    r = bench(secs)
+    for name, rate in r.items():
+        print(f"{name:<10}: {rate:>10.0f} steps/s  ({rate / r['step']:.2f}x)")
@@ -0,0 +1,395 @@
+"""
+Benchmark suite for the hot paths (physics, health check, UI frame).
+
+    bioflow-bench                               run everything, print a table
+    bioflow-bench -k step --quick               subset, short budget
+    bioflow-bench --json out.json               write results
+    bioflow-bench --baseline base.json --threshold 0.15
+                                                exit 1 if any case regressed by >15%
+
+benchmarks/baseline.json is the committed reference run (its "meta" names the
+machine); refresh it with --json when a change moves the numbers on purpose,
+and compare on comparable hardware.
+
+Rates ("steps/s", "calls/s") are better when higher, times ("us/frame",
+"us/call", "ms/start") when lower. Each case runs `repeat` timed rounds of about
+budget/repeat seconds and reports the best round. UI cases run on an
+offscreen Qt platform and are skipped if PySide6 is unavailable.
+"""
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional, Sequence
+
+from bioflow.sim.state import Params, StateBuffer
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    unit: str                            # "steps/s" | "calls/s" | "us/frame" | "us/call" | "ms/start"
+    # setup() -> run(n): does ~n units of work and returns (units done, busy ns),
+    # busy ns None meaning "time the whole call"; cases that must keep untimed
+    # work (pumping the sim, spawning a process) out of the result time themselves
+    setup: Callable[[], Callable[[int], tuple[int, Optional[int]]]]
+
+    @property
+    def higher_is_better(self) -> bool:
+        return self.unit.endswith("/s")
+
+    @property
+    def ns_per_unit(self) -> float:
+        return 1e6 if self.unit.startswith("ms/") else 1e3
+
+
+CASES: list[Case] = []
+
+
+def case(name: str, unit: str):
+    def register(setup):
+        CASES.append(Case(name, unit, setup))
+        return setup
+    return register
+
+
+# --- Physics ---
+
+def _initial():
+    from bioflow.sim.orchestrator import SimOrchestrator
+    p = Params()
+    return SimOrchestrator(p).state, p
+
+
+@case("engine.step", "steps/s")
+def _step():
+    from bioflow.sim.engine import step
+    s0, p = _initial()
+
+    def run(n: int) -> tuple[int, Optional[int]]:
+        s = s0
+        for _ in range(n):
+            s = step(s, p)
+        return n, None
+    return run
+
+
+@case("engine.step_into", "steps/s")
+def _step_into():
+    from bioflow.sim.engine import step_into
+    s0, p = _initial()
+    buf = StateBuffer(s0)
+
+    def run(n: int) -> tuple[int, Optional[int]]:
+        for _ in range(n):
+            step_into(buf, p)
+        return n, None
+    return run
+
+
+@case("engine.advance", "steps/s")
+def _advance():
+    from bioflow.sim.engine import advance
+    s0, p = _initial()
+    buf = StateBuffer(s0)
+
+    def run(n: int) -> tuple[int, Optional[int]]:
+        advance(buf, p, n)
+        return n, None
+    return run
+
+
+@case("orchestrator.tick(1000)", "steps/s")
+def _tick():
+    from bioflow.sim.orchestrator import SimOrchestrator
+    sim = SimOrchestrator()
+    sim.play()
+
+    def run(n: int) -> tuple[int, Optional[int]]:
+        calls = max(1, n // 1000)
+        for _ in range(calls):
+            sim.tick(1000)
+        return calls * 1000, None
+    return run
+
+
+@case("engine.compute_derived", "calls/s")
+def _compute_derived():
+    from bioflow.sim.engine import compute_derived
+    s0, p = _initial()
+
+    def run(n: int) -> tuple[int, Optional[int]]:
+        for _ in range(n):
+            compute_derived(s0, p)
+        return n, None
+    return run
+
+
+@case("heart.pump_flow_ml_s", "calls/s")
+def _pump():
+    from bioflow.sim.heart import pump_flow_ml_s
+
+    def run(n: int) -> tuple[int, Optional[int]]:
+        t = 0.0
+        for _ in range(n):
+            pump_flow_ml_s(t, 70.0, 70.0, 0.35)
+            t += 0.01
+        return n, None
+    return run
+
+
+@case("vessels.peripheral_flow_nonlinear_ml_s", "calls/s")
+def _periph():
+    from bioflow.sim.vessels import peripheral_flow_nonlinear_ml_s
+
+    def run(n: int) -> tuple[int, Optional[int]]:
+        for i in range(n):
+            peripheral_flow_nonlinear_ml_s(90.0 + (i & 7), 1.0, 0.015)
+        return n, None
+    return run
+
+
+@case("validate.assess", "us/call")
+def _assess():
+    from bioflow.sim.validate import assess
+    s0, p = _initial()
+
+    def run(n: int) -> tuple[int, Optional[int]]:
+        for _ in range(n):
+            assess(s0, p)
+        return n, None
+    return run
+
+
+# --- UI (offscreen Qt) ---
+
+def _qapp():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication(sys.argv[:1])
+
+
+@case("PlotsPanel.update_from_state", "us/frame")
+def _plots():
+    _qapp()
+    from bioflow.sim.orchestrator import SimOrchestrator
+    from bioflow.ui.plots import PlotsPanel
+    panel = PlotsPanel()
+    panel.ensure_plots()
+    sim = SimOrchestrator()
+    sim.play()
+    for _ in range(1000):  # a full 10 s window on screen
+        panel.update_from_state(sim.tick(1))
+
+    def run(n: int) -> tuple[int, Optional[int]]:
+        for _ in range(n):
+            panel.update_from_state(sim.tick(1))
+        return n, None
+    return run
+
+
+@case("MainWindow.on_tick", "us/frame")
+def _on_tick():
+    app = _qapp()
+    from bioflow.ui.main_window import MainWindow
+    win = MainWindow()
+    win.timer.stop()
+    win.worker.stop()
+    win.show()
+    for _ in range(100):
+        win.worker.pump(2)
+        win.on_tick()
+    app.processEvents()
+
+    def run(n: int) -> tuple[int, Optional[int]]:
+        # Frame = on_tick plus the repaints it schedules; the physics for
+        # each frame (~16 ms of sim) is pumped outside the timed region.
+        busy = 0
+        for _ in range(n):
+            win.worker.pump(2)
+            t0 = time.perf_counter_ns()
+            win.on_tick()
+            app.processEvents()
+            busy += time.perf_counter_ns() - t0
+        return n, busy
+    return run
+
+
+# Child process for the cold-start case: prints perf_counter_ns after the
+# imports, after MainWindow() and once the first paint pass has finished.
+_FIRST_PAINT = """
+import sys, time
+from PySide6.QtCore import QEvent, QObject, QTimer
+from PySide6.QtWidgets import QApplication
+from bioflow.ui.main_window import MainWindow
+t_import = time.perf_counter_ns()
+app = QApplication(sys.argv[:1])
+win = MainWindow()
+t_built = time.perf_counter_ns()
+
+def done():
+    print(t_import, t_built, time.perf_counter_ns(), flush=True)
+    win.close()
+    app.quit()
+
+class FirstPaint(QObject):
+    seen = False
+    def eventFilter(self, obj, ev):
+        if ev.type() == QEvent.Paint and not self.seen:
+            self.seen = True
+            QTimer.singleShot(0, done)   # runs once this paint pass is done
+        return False
+
+watch = FirstPaint()
+app.installEventFilter(watch)
+win.show()
+app.exec()
+"""
+
+
+def cold_start() -> dict[str, float]:
+    """
+    Launch a fresh interpreter that opens the main window; milliseconds from
+    spawn to imports done, to MainWindow built, and to the first painted frame.
+    """
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    t0 = time.perf_counter_ns()
+    out = subprocess.run([sys.executable, "-c", _FIRST_PAINT], env=env, check=True,
+                         capture_output=True, text=True).stdout
+    t_import, t_built, t_paint = (int(x) for x in out.split()[-3:])
+    return {
+        "imports_ms": (t_import - t0) / 1e6,
+        "window_built_ms": (t_built - t0) / 1e6,
+        "first_paint_ms": (t_paint - t0) / 1e6,
+    }
+
+
+@case("app.cold_start_to_first_paint", "ms/start")
+def _cold_start():
+    import PySide6  # noqa: F401  (skip the case, not fail, without Qt)
+
+    def run(n: int) -> tuple[int, Optional[int]]:
+        return n, sum(int(cold_start()["first_paint_ms"] * 1e6) for _ in range(n))
+    return run
+
+
+# --- Runner ---
+
+def measure(c: Case, budget_s: float = 1.0, repeat: int = 3) -> float:
+    """Best-of-`repeat` value of one case, in c.unit."""
+    run = c.setup()
+    # Calibrate n so one round takes ~budget_s / repeat
+    n, elapsed = 1, 0.0
+    while True:
+        t0 = time.perf_counter_ns()
+        run(n)
+        elapsed = (time.perf_counter_ns() - t0) / 1e9
+        if elapsed >= 0.02 or n >= 1 << 26:
+            break
+        n *= 4
+    n = max(1, int(n * (budget_s / repeat) / max(elapsed, 1e-9)))
+
+    best: Optional[float] = None
+    for _ in range(repeat):
+        t0 = time.perf_counter_ns()
+        done, busy_ns = run(n)
+        ns = busy_ns if busy_ns is not None else time.perf_counter_ns() - t0
+        value = done / (ns / 1e9) if c.higher_is_better else ns / c.ns_per_unit / done
+        if best is None or (value > best if c.higher_is_better else value < best):
+            best = value
+    return float(best)
+
+
+def run_suite(patterns: Sequence[str] = (), budget_s: float = 1.0, repeat: int = 3,
+              out=sys.stdout) -> dict:
+    results: dict[str, dict] = {}
+    for c in CASES:
+        if patterns and not any(fnmatch.fnmatch(c.name, f"*{p}*") for p in patterns):
+            continue
+        try:
+            value = measure(c, budget_s, repeat)
+        except ImportError as exc:  # e.g. no PySide6 on a headless box
+            results[c.name] = {"skipped": str(exc), "unit": c.unit}
+            print(f"{c.name:<42} skipped ({exc})", file=out)
+            continue
+        results[c.name] = {"value": value, "unit": c.unit, "higher_is_better": c.higher_is_better}
+        print(f"{c.name:<42} {value:>14,.1f} {c.unit}", file=out)
+    return {"meta": _meta(budget_s, repeat), "results": results}
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Names (with the change) of cases that got worse than baseline by more than threshold."""
+    worse = []
+    for name, r in current["results"].items():
+        b = baseline.get("results", {}).get(name)
+        if "value" not in r or not b or "value" not in b:
+            continue
+        change = r["value"] / b["value"] - 1.0
+        slower = -change if r["higher_is_better"] else change
+        if slower > threshold:
+            worse.append(f"{name}: {b['value']:,.1f} -> {r['value']:,.1f} {r['unit']} ({slower:+.1%} slower)")
+    return worse
+
+
+def _meta(budget_s: float, repeat: int) -> dict:
+    import numpy
+    return {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": numpy.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "budget_s": budget_s,
+        "repeat": repeat,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="bioflow-bench", description="BioFlow hot-path benchmarks")
+    ap.add_argument("-k", dest="patterns", action="append", default=[],
+                    help="only cases whose name contains this (repeatable, glob ok)")
+    ap.add_argument("--list", action="store_true", help="list case names and exit")
+    ap.add_argument("--budget", type=float, default=1.0, help="seconds per case")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--quick", action="store_true", help="short budget (0.2 s per case)")
+    ap.add_argument("--json", dest="json_out", default=None, help="write results here")
+    ap.add_argument("--baseline", default=None, help="results JSON to compare against")
+    ap.add_argument("--threshold", type=float, default=0.10,
+                    help="allowed slowdown vs baseline before failing (fraction)")
+    args = ap.parse_args(argv)
+
+    if args.list:
+        for c in CASES:
+            print(f"{c.name}  [{c.unit}]")
+        return 0
+
+    budget = 0.2 if args.quick else args.budget
+    res = run_suite(args.patterns, budget, args.repeat)
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(res, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            base = json.load(f)
+        worse = compare(res, base, args.threshold)
+        if worse:
+            print(f"\nRegressions beyond {args.threshold:.0%}:")
+            for line in worse:
+                print("  " + line)
+            return 1
+        print(f"\nNo regressions beyond {args.threshold:.0%} vs {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,178 @@
+"""
+Headless command-line runner (no Qt imports).
+
+    bioflow-sim presets
+    bioflow-sim run --preset high_resistance --duration 600 --sample-interval 0.1 -o out.csv
+    bioflow-sim run --params scenario.json --set hr_bpm=95 --format bin -o out.bin
+
+Formats:
+  csv    header row + one row per sample (STATE_FIELDS order)
+  jsonl  one JSON object per sample
+  bin    raw little-endian float64 rows, STATE_FIELDS order, no header
+  rec    columnar recording with header and index (bioflow.sim.recording)
+"""
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import struct
+import sys
+from dataclasses import fields
+from typing import IO, Optional, Sequence
+
+from bioflow.sim import presets
+from bioflow.sim.heart import PUMP_INTERP_MODES
+from bioflow.sim.integrators import INTEGRATORS
+from bioflow.sim.orchestrator import SimOrchestrator
+from bioflow.sim.state import Params, State, STATE_FIELDS
+
+
+def load_params(preset: Optional[str], params_file: Optional[str], overrides: Sequence[str]) -> dict:
+    """Preset (default baseline), then fields from a JSON file, then KEY=VALUE overrides."""
+    base = presets.get(preset or "baseline")
+    updates: dict = {}
+    if params_file:
+        with open(params_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError(f"{params_file}: expected a JSON object of Params fields")
+        updates.update(data)
+    for item in overrides:
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"--set expects KEY=VALUE, got {item!r}")
+        updates[key.strip()] = value.strip()
+
+    known = {f.name: f for f in fields(Params)}
+    for key, value in list(updates.items()):
+        if key not in known:
+            raise ValueError(f"unknown parameter {key!r}")
+        if known[key].type == "str":
+            updates[key] = str(value)
+        elif known[key].type == "int":
+            updates[key] = int(value)
+        else:
+            updates[key] = float(value)
+
+    # The pump table is built lazily inside the run; reject bad options here
+    interp = updates.get("pump_interp", base.pump_interp)
+    if interp not in PUMP_INTERP_MODES:
+        raise ValueError(f"pump_interp must be one of {PUMP_INTERP_MODES}, got {interp!r}")
+    if 0 < updates.get("pump_table_size", base.pump_table_size) < 4:
+        raise ValueError("pump_table_size must be 0 (analytic pump) or >= 4")
+    return {"base": base, "updates": updates}
+
+
+class _Writer:
+    def __init__(self, fmt: str, out: IO, params: Params) -> None:
+        self.fmt = fmt
+        self.out = out
+        if fmt == "csv":
+            self._csv = csv.writer(out, lineterminator="\n")
+            self._csv.writerow(STATE_FIELDS)
+        elif fmt == "bin":
+            self._row = struct.Struct("<" + "d" * len(STATE_FIELDS))
+        elif fmt == "rec":
+            from bioflow.sim.recording import Recorder
+            self._rec = Recorder(out)
+            self._rec.begin(params)
+
+    def write(self, s: State) -> None:
+        row = [getattr(s, name) for name in STATE_FIELDS]
+        if self.fmt == "csv":
+            self._csv.writerow(repr(v) for v in row)
+        elif self.fmt == "jsonl":
+            self.out.write(json.dumps(dict(zip(STATE_FIELDS, row))) + "\n")
+        elif self.fmt == "rec":
+            self._rec.append(s)
+        else:
+            self.out.write(self._row.pack(*row))
+
+    def close(self) -> None:
+        if self.fmt == "rec":
+            self._rec.close()
+
+
+def run(
+    params: Params,
+    updates: dict,
+    duration_s: float,
+    sample_interval_s: float,
+    out: IO,
+    fmt: str = "csv",
+    integrator: str = "euler",
+) -> int:
+    """Simulate and stream samples; returns the number of samples written."""
+    sim = SimOrchestrator(params, integrator=integrator)
+    if updates:
+        sim.update_params(**updates)
+    sim.play()
+
+    dt = sim.params.dt
+    every = max(1, round(sample_interval_s / dt))
+    total_steps = round(duration_s / dt)
+
+    writer = _Writer(fmt, out, sim.params)
+    writer.write(sim.state)
+    written = 1
+    done = 0
+    while done < total_steps:
+        k = min(every, total_steps - done)
+        writer.write(sim.tick(k))
+        done += k
+        written += 1
+    writer.close()
+    out.flush()
+    return written
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="bioflow-sim", description="Headless BioFlow simulation runner")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("presets", help="list preset names")
+
+    r = sub.add_parser("run", help="run a simulation and stream samples")
+    r.add_argument("--preset", choices=sorted(presets.PRESETS), default=None)
+    r.add_argument("--params", dest="params_file", default=None,
+                   help="JSON object of Params fields applied on top of the preset")
+    r.add_argument("--set", dest="overrides", action="append", default=[], metavar="KEY=VALUE")
+    r.add_argument("--duration", type=float, required=True, help="simulated seconds")
+    r.add_argument("--sample-interval", type=float, default=0.01, help="seconds between samples")
+    r.add_argument("--integrator", choices=sorted(INTEGRATORS), default="euler")
+    r.add_argument("--format", choices=("csv", "jsonl", "bin", "rec"), default="csv")
+    r.add_argument("-o", "--output", default="-", help="output path ('-' = stdout)")
+
+    args = ap.parse_args(argv)
+
+    if args.command == "presets":
+        for name in presets.PRESETS:
+            print(name)
+        return 0
+
+    try:
+        cfg = load_params(args.preset, args.params_file, args.overrides)
+    except (ValueError, OSError) as exc:
+        ap.error(str(exc))
+
+    binary = args.format in ("bin", "rec")
+    if args.output == "-":
+        out = sys.stdout.buffer if binary else sys.stdout
+        try:
+            run(cfg["base"], cfg["updates"], args.duration, args.sample_interval, out,
+                args.format, args.integrator)
+        except BrokenPipeError:
+            # Reader went away (e.g. piped into head); don't complain on exit
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            return 1
+    else:
+        with open(args.output, "wb" if binary else "w", newline=None if binary else "") as out:
+            run(cfg["base"], cfg["updates"], args.duration, args.sample_interval, out,
+                args.format, args.integrator)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
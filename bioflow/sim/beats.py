@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import math
+from collections import deque
+from dataclasses import dataclass, fields
+from typing import Callable, Optional, Union
+
+from .heart import clamp
+from .state import Params, State, StateBuffer
+
+
+@dataclass(frozen=True)
+class Beat:
+    """Hemodynamics of one cardiac cycle (means are time-averaged over the beat)."""
+    index: int                      # beats since the meter started
+    t_start: float                  # start of the pump cycle
+    duration_s: float
+    hr_bpm: float                   # 60 / duration
+    P_sys_mmHg: float
+    P_dia_mmHg: float
+    MAP_mmHg: float
+    pulse_pressure_mmHg: float
+    P_ven_mean_mmHg: float
+    Q_periph_mean_ml_s: float
+    stroke_volume_ml: float         # pump flow integrated over the beat
+    cardiac_output_l_min: float
+    V_pool_mean_ml: float
+
+
+BEAT_FIELDS: tuple[str, ...] = tuple(f.name for f in fields(Beat))
+
+# Integrated signals, in accumulator order
+_SIGNALS = ("P_art_mmHg", "P_ven_mmHg", "Q_periph_ml_s", "Q_pump_ml_s", "V_pool_ml")
+
+
+def beat_period_s(hr_bpm: float) -> float:
+    """Pump cycle length, with the same HR clamp as heart.pump_flow_ml_s."""
+    return 60.0 / clamp(hr_bpm, 20.0, 250.0)
+
+
+class BeatMeter:
+    """
+    Streaming per-beat metrics: an orchestrator sink (sim.attach(meter))
+    that turns every step into running integrals and emits one Beat each
+    time the pump starts a new cycle. Work per step is constant, and nothing
+    but the open beat is held, so a long run costs one record per beat.
+
+    A beat starts where the pump phase (t mod 60/hr_bpm, as in
+    heart.pump_flow_ml_s) wraps to zero. Integrals use the trapezoid rule
+    with the step that straddles the boundary split at the exact boundary
+    time, so beat means don't jitter with the boundary's phase against dt.
+    The partial beats before the first and after the last boundary are not
+    reported; neither is a beat cut short by a reset. A reset (on_reset, or
+    time going backwards in feed) restarts metering from the new state, so
+    a run restarted at t=0 reports its first beat.
+
+    Completed beats go to on_beat(beat) and to `beats` (the newest `keep`,
+    or all of them with keep=None). feed() takes samples directly, e.g.
+    the rows of a Recording, after start(params).
+    """
+
+    def __init__(self, on_beat: Optional[Callable[[Beat], None]] = None,
+                 *, keep: Optional[int] = None) -> None:
+        self.on_beat = on_beat
+        self.beats: deque[Beat] = deque(maxlen=keep)
+        self.count = 0
+        self.period = beat_period_s(Params().hr_bpm)
+        self._t = math.nan              # previous sample
+        self._y = (0.0,) * len(_SIGNALS)
+        self._open = False              # a beat start has been seen
+        self._t0 = 0.0
+        self._acc = [0.0] * len(_SIGNALS)
+        self._hi = -math.inf
+        self._lo = math.inf
+
+    # --- Sink protocol ---
+
+    def on_attach(self, sim) -> None:
+        self.start(sim.params, sim.state)
+
+    def on_step(self, buf: StateBuffer) -> None:
+        self.feed(buf)
+
+    def on_params(self, t: float, changes: dict) -> None:
+        if "hr_bpm" in changes:
+            self.period = beat_period_s(changes["hr_bpm"])
+
+    def on_reset(self, sim) -> None:
+        self.start(sim.params, sim.state)
+
+    def on_detach(self, sim) -> None:
+        pass
+
+    # --- Direct use ---
+
+    def start(self, params: Params, state: Union[State, StateBuffer, None] = None) -> None:
+        """Begin metering under params; state (if given) is the first sample."""
+        self.period = beat_period_s(params.hr_bpm)
+        self._t = math.nan
+        self._open = False
+        if state is not None:
+            self.feed(state)
+
+    def feed(self, s: Union[State, StateBuffer]) -> None:
+        t = s.t
+        y = (s.P_art_mmHg, s.P_ven_mmHg, s.Q_periph_ml_s, s.Q_pump_ml_s, s.V_pool_ml)
+        t_prev = self._t
+        if not t > t_prev:
+            # First sample, or time went backwards (reset/seek): start over
+            self._t, self._y = t, y
+            self._open = t % self.period == 0.0
+            if self._open:
+                self._begin(t, y)
+            return
+
+        y_prev = self._y
+        tb = t - t % self.period        # start of the current pump cycle
+        if tb > t_prev:
+            # A beat boundary inside (t_prev, t]: split the step there
+            f = (tb - t_prev) / (t - t_prev)
+            yb = tuple(a + f * (b - a) for a, b in zip(y_prev, y))
+            if self._open:
+                self._add(t_prev, y_prev, tb, yb)
+                self._emit(tb)
+            self._open = True
+            self._begin(tb, yb)
+            if t > tb:
+                self._add(tb, yb, t, y)
+        elif self._open:
+            self._add(t_prev, y_prev, t, y)
+        self._t, self._y = t, y
+
+    def _begin(self, t0: float, y: tuple) -> None:
+        self._t0 = t0
+        self._acc = [0.0] * len(_SIGNALS)
+        self._hi = self._lo = y[0]
+
+    def _add(self, t0: float, y0: tuple, t1: float, y1: tuple) -> None:
+        h = 0.5 * (t1 - t0)
+        acc = self._acc
+        for i in range(len(_SIGNALS)):
+            acc[i] += h * (y0[i] + y1[i])
+        p = y1[0]
+        if p > self._hi:
+            self._hi = p
+        if p < self._lo:
+            self._lo = p
+
+    def _emit(self, t_end: float) -> None:
+        T = t_end - self._t0
+        P_art, P_ven, Q_periph, Q_pump, V_pool = (a / T for a in self._acc)
+        sv = self._acc[3]
+        beat = Beat(
+            index=self.count,
+            t_start=self._t0,
+            duration_s=T,
+            hr_bpm=60.0 / T,
+            P_sys_mmHg=self._hi,
+            P_dia_mmHg=self._lo,
+            MAP_mmHg=P_art,
+            pulse_pressure_mmHg=self._hi - self._lo,
+            P_ven_mean_mmHg=P_ven,
+            Q_periph_mean_ml_s=Q_periph,
+            stroke_volume_ml=sv,
+            cardiac_output_l_min=Q_pump * 60.0 / 1000.0,
+            V_pool_mean_ml=V_pool,
+        )
+        self.count += 1
+        self.beats.append(beat)
+        if self.on_beat is not None:
+            self.on_beat(beat)
+
+    # --- Results ---
+
+    @property
+    def last(self) -> Optional[Beat]:
+        return self.beats[-1] if self.beats else None
+
+    def columns(self) -> dict:
+        """Kept beats as NumPy columns, one array per Beat field."""
+        import numpy as np  # array path only
+
+        return {
+            name: np.array([getattr(b, name) for b in self.beats],
+                           dtype=np.int64 if name == "index" else float)
+            for name in BEAT_FIELDS
+        }
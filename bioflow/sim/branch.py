@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+from .batch import BatchEngine
+from .engine import derive_into
+from .integrators import Integrator, make_integrator
+from .state import Params, State, StateBuffer, STATE_FIELDS, clamp_param_updates
+
+Variant = Union[Params, Mapping[str, float]]
+
+# Below this many Euler branches the fused scalar kernel (engine.advance,
+# ~1M steps/s) beats BatchEngine's per-step NumPy overhead
+BATCH_MIN_BRANCHES = 128
+
+
+@dataclass(frozen=True)
+class Branches:
+    """
+    Trajectories of K what-if futures forked from one state.
+
+    traj maps every State field to a (K, samples) array; column 0 is the
+    fork point (re-derived under each branch's params).
+    """
+    params: list[Params]
+    traj: dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.params)
+
+    @property
+    def t(self) -> np.ndarray:
+        return self.traj["t"][0]
+
+    def branch(self, i: int) -> dict[str, np.ndarray]:
+        return {name: a[i] for name, a in self.traj.items()}
+
+    def final(self, i: int) -> State:
+        return State(**{name: float(a[i, -1]) for name, a in self.traj.items()})
+
+
+def fork(
+    state: State,
+    base: Params,
+    variants: Sequence[Variant],
+    duration_s: float,
+    *,
+    sample_interval_s: Optional[float] = None,
+    integrator: Optional[Integrator] = None,
+) -> Branches:
+    """
+    Run each variant (full Params, or field updates applied to base and
+    clamped like SimOrchestrator.update_params) from `state` for duration_s.
+
+    Each branch runs a private copy of `integrator` (same config and
+    caches; default Euler). Wide Euler forks (BATCH_MIN_BRANCHES or more)
+    run together as BatchEngine lanes instead, which reproduce the scalar
+    engine bit-for-bit. All branches share base.dt, so samples line up.
+    """
+    if integrator is None:
+        integrator = make_integrator("euler")
+    params = [
+        v if isinstance(v, Params)
+        else replace(base, **clamp_param_updates(dict(v), {"dt": integrator.dt_range}))
+        for v in variants
+    ]
+    if not params:
+        raise ValueError("fork needs at least one variant")
+    if any(p.dt != base.dt for p in params):
+        raise ValueError("branches must keep the current dt")
+
+    n = max(0, round(duration_s / base.dt))
+    every = 1 if sample_interval_s is None else max(1, round(sample_interval_s / base.dt))
+    stops = list(range(0, n + 1, every))
+    if stops[-1] != n:
+        stops.append(n)
+
+    traj = {name: np.empty((len(params), len(stops))) for name in STATE_FIELDS}
+
+    if integrator.name == "euler" and len(params) >= BATCH_MIN_BRANCHES:
+        engine = BatchEngine(params, [state] * len(params))
+        s = engine.s
+        done = 0
+        for j, stop in enumerate(stops):
+            engine.step(stop - done)
+            done = stop
+            for name in STATE_FIELDS:
+                traj[name][:, j] = s[name]
+    else:
+        for i, p in enumerate(params):
+            integ = make_integrator(integrator.name, **integrator.config())
+            integ.load_cache(integrator.cache())
+            buf = StateBuffer(state)
+            derive_into(buf, p)
+            done = 0
+            for j, stop in enumerate(stops):
+                integ.advance(buf, p, stop - done)
+                done = stop
+                for name in STATE_FIELDS:
+                    traj[name][i, j] = getattr(buf, name)
+
+    return Branches(params, traj)
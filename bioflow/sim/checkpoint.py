@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import bisect
+import json
+import math
+import struct
+from dataclasses import asdict
+from typing import Optional
+
+from .state import Params, State, STATE_FIELDS
+
+MAGIC = b"BFCK"
+VERSION = 1
+_HEAD = struct.Struct("<4sBxxxI")                     # magic, version, meta length
+_STATE = struct.Struct("<" + "d" * len(STATE_FIELDS))  # raw float64, exact bits
+
+
+def dumps(state, params: Params, paused: bool, integrator) -> bytes:
+    """
+    Serialize one orchestrator snapshot.
+
+    State fields are packed as raw float64 (bit-exact); params, the paused
+    flag and the integrator's name, config and cache() go in a compact JSON
+    trailer (Python's float repr round-trips exactly).
+    """
+    meta = json.dumps({
+        "params": asdict(params),
+        "paused": paused,
+        "integrator": {
+            "name": integrator.name,
+            "config": integrator.config(),
+            "cache": integrator.cache(),
+        },
+    }, separators=(",", ":")).encode()
+    return (_HEAD.pack(MAGIC, VERSION, len(meta))
+            + _STATE.pack(*(getattr(state, name) for name in STATE_FIELDS))
+            + meta)
+
+
+def loads(blob: bytes) -> tuple[State, Params, bool, dict]:
+    """Inverse of dumps: (state, params, paused, integrator dict)."""
+    magic, version, meta_len = _HEAD.unpack_from(blob)
+    if magic != MAGIC:
+        raise ValueError("not a bioflow checkpoint")
+    if version != VERSION:
+        raise ValueError(f"unsupported checkpoint version {version}")
+    values = _STATE.unpack_from(blob, _HEAD.size)
+    meta = json.loads(blob[_HEAD.size + _STATE.size:_HEAD.size + _STATE.size + meta_len])
+    return (State(**dict(zip(STATE_FIELDS, values))), Params(**meta["params"]),
+            bool(meta["paused"]), meta["integrator"])
+
+
+class CheckpointStore:
+    """
+    Time-ordered checkpoints of one run, taken every `every_s` simulated
+    seconds (plus whenever params change, so params are constant between two
+    neighbours). Holds at most `keep` blobs; the oldest are dropped first.
+    """
+
+    def __init__(self, every_s: float, keep: int = 256) -> None:
+        if every_s <= 0 or keep <= 0:
+            raise ValueError("every_s and keep must be positive")
+        self.every_s = every_s
+        self.keep = keep
+        self.times: list[float] = []
+        self.blobs: list[bytes] = []
+        self._next = -math.inf
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def clear(self) -> None:
+        self.times.clear()
+        self.blobs.clear()
+        self._next = -math.inf
+
+    def add(self, t: float, blob: bytes) -> None:
+        """Append a checkpoint at t, replacing any taken at or after t."""
+        self.truncate_after(t, inclusive=True)
+        self.times.append(t)
+        self.blobs.append(blob)
+        if len(self.times) > self.keep:
+            del self.times[0], self.blobs[0]
+        self._next = t + self.every_s
+
+    def truncate_after(self, t: float, inclusive: bool = False) -> None:
+        i = (bisect.bisect_left if inclusive else bisect.bisect_right)(self.times, t)
+        del self.times[i:], self.blobs[i:]
+        self._next = self.times[-1] + self.every_s if self.times else -math.inf
+
+    def due(self, t: float) -> bool:
+        return t >= self._next - 1e-9
+
+    def steps_until_due(self, t: float, dt: float) -> int:
+        return max(1, math.ceil((self._next - t) / dt - 1e-9))
+
+    def at_or_before(self, t: float) -> Optional[bytes]:
+        i = bisect.bisect_right(self.times, t + 1e-9)
+        return self.blobs[i - 1] if i else None
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import math
+from typing import Callable, Optional
+
+from .heart import clamp, pump_table, pumped_volume_ml
+from .state import Params
+from .vessels import resistance_coefficients
+
+# Params fields feeding each group of derived constants
+GROUPS: dict[str, tuple[str, ...]] = {
+    "compliance": ("V0_art_ml", "V0_ven_ml", "V0_pool_ml",
+                   "arterial_compliance", "venous_compliance", "pool_compliance"),
+    "resistance": ("peripheral_resistance", "resistance_nonlinearity"),
+    "pump": ("hr_bpm", "stroke_volume_ml", "systole_fraction", "pump_table_size", "pump_interp"),
+    "pooling": ("venous_pooling_target", "pooling_tau_s", "total_volume_ml"),
+}
+
+
+def _compliance(p: Params) -> tuple:
+    return (p.V0_art_ml, p.V0_ven_ml, p.V0_pool_ml,
+            max(p.arterial_compliance, 1e-9), max(p.venous_compliance, 1e-9),
+            max(p.pool_compliance, 1e-9))
+
+
+def _resistance(p: Params) -> tuple:
+    return resistance_coefficients(p.peripheral_resistance, p.resistance_nonlinearity)
+
+
+def _pump(p: Params) -> tuple:
+    hr = clamp(p.hr_bpm, 20.0, 250.0)
+    sv = clamp(p.stroke_volume_ml, 0.0, 400.0)
+    sf = clamp(p.systole_fraction, 0.10, 0.70)
+    period = 60.0 / hr
+    systole = sf * period
+    A = sv * math.pi / (2.0 * systole)
+    table = None
+    if p.pump_table_size > 0:
+        table = pump_table(p.pump_table_size, p.pump_interp,
+                           p.hr_bpm, p.stroke_volume_ml, p.systole_fraction)
+    return (not (hr <= 0.0 or sv <= 0.0), period, systole, A, table)
+
+
+def _pooling(p: Params) -> tuple:
+    return (clamp(p.venous_pooling_target, 0.0, 0.6) * p.total_volume_ml,
+            max(p.pooling_tau_s, 1e-6))
+
+
+_BUILDERS: dict[str, Callable[[Params], tuple]] = {
+    "compliance": _compliance,
+    "resistance": _resistance,
+    "pump": _pump,
+    "pooling": _pooling,
+}
+
+
+class CompiledParams:
+    """
+    Every constant the engine derives from a Params (clamps, floors, beat
+    period, systole length, pump amplitude, pool target, resistance
+    coefficients), computed once per Params revision.
+
+    Constants are built in GROUPS; compiling with `prev` reuses each group
+    whose fields did not change, so a slider moving one field only rebuilds
+    that field's group. Use compiled(p), which caches the result on p.
+    """
+
+    __slots__ = (
+        "params", "revision", "groups", "dt", "total_ml",
+        "V0_art", "V0_ven", "V0_pool", "C_art", "C_ven", "C_pool",
+        "R0", "R0_sq", "c_res",
+        "pump_on", "period", "systole", "A", "table",
+        "target_pool", "tau",
+    )
+
+    def __init__(self, p: Params, prev: Optional["CompiledParams"] = None) -> None:
+        groups = {}
+        for name, names in GROUPS.items():
+            if prev is not None and all(getattr(p, f) == getattr(prev.params, f) for f in names):
+                groups[name] = prev.groups[name]
+            else:
+                groups[name] = _BUILDERS[name](p)
+        self.params = p
+        self.revision = p.revision
+        self.groups = groups
+        self.dt = p.dt
+        self.total_ml = p.total_volume_ml
+        self.V0_art, self.V0_ven, self.V0_pool, self.C_art, self.C_ven, self.C_pool = groups["compliance"]
+        self.R0, self.R0_sq, self.c_res = groups["resistance"]
+        self.pump_on, self.period, self.systole, self.A, self.table = groups["pump"]
+        self.target_pool, self.tau = groups["pooling"]
+
+    def pump_flow(self, t_s: float) -> float:
+        """engine.pump_flow_for(t_s, params), bit-for-bit."""
+        table = self.table
+        if table is not None:
+            return table.flow_at_phase(t_s % table.period)
+        if not self.pump_on:
+            return 0.0
+        phase = t_s % self.period
+        if phase >= self.systole:
+            return 0.0
+        return self.A * math.sin(math.pi * (phase / self.systole))
+
+    def pumped_volume(self, t0_s: float, t1_s: float) -> float:
+        """Exact volume the pump moves over [t0_s, t1_s] (either waveform)."""
+        if self.table is not None:
+            return self.table.volume(t0_s, t1_s)
+        p = self.params
+        return pumped_volume_ml(t0_s, t1_s, p.hr_bpm, p.stroke_volume_ml, p.systole_fraction)
+
+
+def compiled(p: Params, prev: Optional[CompiledParams] = None) -> CompiledParams:
+    """CompiledParams for p, cached on p (built from prev's groups if given)."""
+    c = p.__dict__.get("_compiled")
+    if c is None:
+        c = CompiledParams(p, prev)
+        object.__setattr__(p, "_compiled", c)
+    return c
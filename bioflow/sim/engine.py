@@ -1,36 +1,49 @@
 from __future__ import annotations
+import math
 from dataclasses import replace
-from .state import State, Params
-from .heart import pump_flow_ml_s
-from .vessels import pressure_from_volume, peripheral_flow_nonlinear_ml_s
+from typing import Callable, Optional
+from .state import State, StateBuffer, Params
+from .compiled import CompiledParams, compiled
 
 
 def clamp(x: float, lo: float, hi: float) -> float:
     return lo if x < lo else hi if x > hi else x
 
 
-def compute_derived(s: State, p: Params) -> State:
-    P_art = pressure_from_volume(
-        s.V_art_ml, p.V0_art_ml, p.arterial_compliance)
-    P_ven = pressure_from_volume(s.V_ven_ml, p.V0_ven_ml, p.venous_compliance)
-    P_pool = pressure_from_volume(s.V_pool_ml, p.V0_pool_ml, p.pool_compliance)
+def pump_flow_for(t_s: float, p: Params) -> float:
+    """Pump flow for params p: exact half-sine, or the tabulated waveform if enabled."""
+    return compiled(p).pump_flow(t_s)
+
+
+def derive_values(c: CompiledParams, t: float, V_art: float, V_ven: float,
+                  V_pool: float) -> tuple[float, float, float, float, float, float]:
+    """
+    (P_art, P_ven, P_pool, Q_periph, Q_pump, Q_pool) from volumes, with the
+    params' constants precompiled (see compiled.compiled).
+    Same math as vessels.pressure_from_volume / peripheral_flow_nonlinear_ml_s
+    and heart.pump_flow_ml_s.
+    """
+    P_art = (V_art - c.V0_art) / c.C_art
+    if P_art < 0.0:
+        P_art = 0.0
+    P_ven = (V_ven - c.V0_ven) / c.C_ven
+    if P_ven < 0.0:
+        P_ven = 0.0
+    P_pool = (V_pool - c.V0_pool) / c.C_pool
+    if P_pool < 0.0:
+        P_pool = 0.0
 
     dP = P_art - P_ven
-    Q_periph = peripheral_flow_nonlinear_ml_s(
-        dP, p.peripheral_resistance, p.resistance_nonlinearity)
-
-    Q_pump = pump_flow_ml_s(
-        t_s=s.t,
-        hr_bpm=p.hr_bpm,
-        stroke_volume_ml=p.stroke_volume_ml,
-        systole_fraction=p.systole_fraction,
-    )
+    Q_periph = 2.0 * dP / (c.R0 + math.sqrt(c.R0_sq + c.c_res * abs(dP)))
 
     # Pooling wants some fraction of TOTAL blood volume in the pool
-    target_pool = clamp(p.venous_pooling_target, 0.0, 0.6) * p.total_volume_ml
-    tau = max(p.pooling_tau_s, 1e-6)
-    Q_pool = (target_pool - s.V_pool_ml) / tau  # + means ven -> pool
+    Q_pool = (c.target_pool - V_pool) / c.tau  # + means ven -> pool
+    return P_art, P_ven, P_pool, Q_periph, c.pump_flow(t), Q_pool
+
 
+def compute_derived(s: State, p: Params) -> State:
+    P_art, P_ven, P_pool, Q_periph, Q_pump, Q_pool = derive_values(
+        compiled(p), s.t, s.V_art_ml, s.V_ven_ml, s.V_pool_ml)
     return replace(
         s,
         P_art_mmHg=P_art,
@@ -74,3 +87,137 @@ def step(state: State, params: Params) -> State:
     s2 = replace(s, t=s.t + dt, V_art_ml=V_art,
                  V_ven_ml=V_ven, V_pool_ml=V_pool)
     return compute_derived(s2, params)
+
+
+# --- In-place path (no per-step State allocations) ---
+
+def derive_into(buf: StateBuffer, p: Params) -> None:
+    """Same math as compute_derived, written into buf."""
+    (buf.P_art_mmHg, buf.P_ven_mmHg, buf.P_pool_mmHg,
+     buf.Q_periph_ml_s, buf.Q_pump_ml_s, buf.Q_pool_ml_s) = derive_values(
+        compiled(p), buf.t, buf.V_art_ml, buf.V_ven_ml, buf.V_pool_ml)
+
+
+def step_into(buf: StateBuffer, params: Params) -> None:
+    """
+    In-place equivalent of step(): advances buf by one dt.
+    Bit-identical to step(buf.snapshot(), params).
+    """
+    derive_into(buf, params)
+    dt = params.dt
+    total_ml = params.total_volume_ml
+
+    Qp = buf.Q_pump_ml_s
+    Qr = buf.Q_periph_ml_s
+    Qpool = buf.Q_pool_ml_s
+
+    V_art = clamp(buf.V_art_ml + (Qp - Qr) * dt, 0.0, total_ml)
+    V_ven = clamp(buf.V_ven_ml + (Qr - Qp - Qpool) * dt, 0.0, total_ml)
+    V_pool = clamp(buf.V_pool_ml + (Qpool) * dt, 0.0, total_ml)
+
+    total = V_art + V_ven + V_pool
+    if total != 0.0:
+        scale = total_ml / total
+        V_art *= scale
+        V_ven *= scale
+        V_pool *= scale
+
+    buf.t = buf.t + dt
+    buf.V_art_ml = V_art
+    buf.V_ven_ml = V_ven
+    buf.V_pool_ml = V_pool
+    derive_into(buf, params)
+
+
+# --- Fused multi-step kernel ---
+
+def advance(
+    buf: StateBuffer,
+    params: Params,
+    n: int,
+    *,
+    sample_every: int = 0,
+    on_sample: Optional[Callable[[StateBuffer], None]] = None,
+) -> None:
+    """
+    Advance buf by n steps in one fused loop. Bit-identical to n calls of step().
+
+    Parameter clamps and floors (pump HR/SV/systole clamps, compliance floors,
+    R0/k floors, pooling target/tau) come precompiled (compiled.compiled), and each
+    step evaluates only the flows it needs. Derived fields in buf are
+    materialized at the end, and every `sample_every` steps when on_sample is
+    given (on_sample receives buf with derived fields current).
+    """
+    n = max(0, n)
+    if n == 0:
+        derive_into(buf, params)
+        return
+    if on_sample is None:
+        sample_every = 0
+
+    p = params
+    k = compiled(p)
+    dt = k.dt
+    total_ml = k.total_ml
+
+    V0a, V0v = k.V0_art, k.V0_ven
+    Ca, Cv = k.C_art, k.C_ven
+    R0, R0_sq, c = k.R0, k.R0_sq, k.c_res
+    pump_on, period, systole, A = k.pump_on, k.period, k.systole, k.A
+    table = k.table
+    pi = math.pi
+    sin = math.sin
+    sqrt = math.sqrt
+
+    target_pool, tau = k.target_pool, k.tau
+
+    t = buf.t
+    V_art, V_ven, V_pool = buf.V_art_ml, buf.V_ven_ml, buf.V_pool_ml
+
+    for i in range(1, n + 1):
+        P_art = (V_art - V0a) / Ca
+        if P_art < 0.0:
+            P_art = 0.0
+        P_ven = (V_ven - V0v) / Cv
+        if P_ven < 0.0:
+            P_ven = 0.0
+
+        dP = P_art - P_ven
+        Qr = 2.0 * dP / (R0 + sqrt(R0_sq + c * (dP if dP >= 0.0 else -dP)))
+
+        Qp = 0.0
+        if table is not None:
+            Qp = table.flow_at_phase(t % period)
+        elif pump_on:
+            phase = t % period
+            if phase < systole:
+                Qp = A * sin(pi * (phase / systole))
+
+        Qpool = (target_pool - V_pool) / tau
+
+        V_art = V_art + (Qp - Qr) * dt
+        V_ven = V_ven + (Qr - Qp - Qpool) * dt
+        V_pool = V_pool + (Qpool) * dt
+
+        V_art = 0.0 if V_art < 0.0 else total_ml if V_art > total_ml else V_art
+        V_ven = 0.0 if V_ven < 0.0 else total_ml if V_ven > total_ml else V_ven
+        V_pool = 0.0 if V_pool < 0.0 else total_ml if V_pool > total_ml else V_pool
+
+        total = V_art + V_ven + V_pool
+        if total != 0.0:
+            scale = total_ml / total
+            V_art *= scale
+            V_ven *= scale
+            V_pool *= scale
+
+        t = t + dt
+
+        if sample_every and i % sample_every == 0 and i != n:
+            buf.t, buf.V_art_ml, buf.V_ven_ml, buf.V_pool_ml = t, V_art, V_ven, V_pool
+            derive_into(buf, p)
+            on_sample(buf)
+
+    buf.t, buf.V_art_ml, buf.V_ven_ml, buf.V_pool_ml = t, V_art, V_ven, V_pool
+    derive_into(buf, p)
+    if sample_every and n % sample_every == 0:
+        on_sample(buf)
@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import Callable, Mapping, Optional, Sequence
+
+import numpy as np
+
+from .state import Params, State, MODEL_LIMITS
+from .steady import PeriodicSolution, solve_periodic_batch
+from .sensitivity import SENSITIVITY_FIELDS
+from .sweep import METRICS
+
+# Clinical names accepted as metric targets
+METRIC_ALIASES: dict[str, str] = {
+    "MAP": "P_art_mean",
+    "CO": "cardiac_output_l_min",
+    "CVP": "P_ven_mean",
+    "SBP": "P_art_sys",
+    "DBP": "P_art_dia",
+}
+
+
+@dataclass(frozen=True)
+class FitResult:
+    """
+    Outcome of a fit. params is the base with the fitted fields replaced;
+    solution is its periodic steady state (solution.initial warm-starts a
+    follow-up fit). evaluations counts batched steady-state solves.
+
+    converged means the residual met tol. Otherwise status says why the
+    search stopped: "stalled" (cost stopped falling), "no_step" (the
+    projected step vanished, e.g. every field pinned at a bound),
+    "max_iter", or "unsolved" (the starting point has no converged steady
+    state).
+    """
+    params: Params
+    values: dict[str, float]        # fitted field -> value
+    solution: PeriodicSolution
+    residual: np.ndarray            # weighted, scaled residuals at the optimum
+    cost: float                     # 0.5 * |residual|^2
+    iterations: int                 # LM steps tried
+    evaluations: int
+    converged: bool
+    status: str                     # "converged", "stalled", "no_step", "max_iter", "unsolved"
+    at_bound: tuple[str, ...]       # fields pinned at a range limit
+
+    @property
+    def metrics(self) -> dict[str, float]:
+        return self.solution.metrics
+
+
+def fit_bounds(field: str) -> tuple[float, float]:
+    """Search range of a field: the update_params limits, else non-negative."""
+    return MODEL_LIMITS.get(field, (0.0, np.inf))
+
+
+def fit_steady(
+    targets: Mapping[str, float],
+    fields: Sequence[str],
+    base: Optional[Params] = None,
+    *,
+    weights: Optional[Mapping[str, float]] = None,
+    initial: Optional[State] = None,
+    **options,
+) -> FitResult:
+    """
+    Fit `fields` of `base` so the periodic steady state hits target metrics,
+    e.g. fit_steady({"MAP": 93, "CO": 5, "CVP": 6}, ["peripheral_resistance",
+    "stroke_volume_ml", "total_volume_ml"]).
+
+    Targets name PeriodicSolution.metrics keys or METRIC_ALIASES; each
+    residual is the relative error (weights scale it). options go to the
+    Levenberg-Marquardt loop (max_iter, tol, ftol, bounds).
+    """
+    names = [METRIC_ALIASES.get(k, k) for k in targets]
+    for k in names:
+        if k not in METRICS:
+            raise KeyError(f"unknown metric {k!r}; choose from {METRICS} or {tuple(METRIC_ALIASES)}")
+    goal = np.array(list(targets.values()), dtype=float)
+    scale = np.where(goal != 0.0, np.abs(goal), 1.0)
+    w = np.array([(weights or {}).get(k, 1.0) for k in targets], dtype=float)
+
+    def residual(sol: PeriodicSolution) -> np.ndarray:
+        m = sol.metrics
+        return w * (np.array([m[k] for k in names]) - goal) / scale
+
+    return least_squares(residual, fields, base, initial=initial, **options)
+
+
+def fit_trajectory(
+    t: np.ndarray,
+    signals: Mapping[str, np.ndarray],
+    fields: Sequence[str],
+    base: Optional[Params] = None,
+    *,
+    initial: Optional[State] = None,
+    **options,
+) -> FitResult:
+    """
+    Fit `fields` so the steady-state beat reproduces recorded samples, e.g.
+    fit_trajectory(cols["t"], {"P_art_mmHg": cols["P_art_mmHg"]}, [...])
+    with cols = Recording(path).columns().
+
+    The samples must come from a settled run on the simulator's clock: each
+    is compared with the steady-state waveform at the same pump phase
+    (t mod beat period). Signals are normalized by their spread, so the
+    cost is a sum of relative mean-square errors.
+    """
+    t = np.asarray(t, dtype=float)
+    rec = {k: np.asarray(v, dtype=float) for k, v in signals.items()}
+    for k, v in rec.items():
+        if v.shape != t.shape:
+            raise ValueError(f"signal {k!r} does not match t")
+    norm = {k: max(float(np.std(v)), 1e-9) * np.sqrt(len(t)) for k, v in rec.items()}
+
+    def residual(sol: PeriodicSolution) -> np.ndarray:
+        wt = sol.waveform["t"]
+        phase = np.remainder(t, wt[-1])
+        return np.concatenate([
+            (np.interp(phase, wt, sol.waveform[k]) - v) / norm[k] for k, v in rec.items()
+        ])
+
+    return least_squares(residual, fields, base, initial=initial, **options)
+
+
+def least_squares(
+    residual: Callable[[PeriodicSolution], np.ndarray],
+    fields: Sequence[str],
+    base: Optional[Params] = None,
+    *,
+    initial: Optional[State] = None,
+    bounds: Optional[Mapping[str, tuple[float, float]]] = None,
+    max_iter: int = 50,
+    tol: float = 1e-6,
+    ftol: float = 1e-10,
+    rel_step: float = 1e-5,
+) -> FitResult:
+    """
+    Bounded Levenberg-Marquardt on residual(steady state of params).
+
+    Every iteration is one solve_periodic_batch call holding the trial point
+    and one forward-difference probe per field, so the residual and its
+    Jacobian come out of a single batched run; lanes are warm-started from
+    the last accepted steady state. Steps are projected onto the bounds
+    (fit_bounds by default). Converges when max |residual| < tol; gives up
+    when the cost stops falling by more than ftol (relative) or the step
+    vanishes. Trial points whose steady states did not converge are
+    rejected like steps that raise the cost.
+    """
+    base = base or Params()
+    fields = tuple(fields)
+    for name in fields:
+        if name not in SENSITIVITY_FIELDS:
+            raise ValueError(f"cannot fit {name!r}; choose from {SENSITIVITY_FIELDS}")
+    limits = [(bounds or {}).get(f, fit_bounds(f)) for f in fields]
+    lo = np.array([a for a, _ in limits])
+    hi = np.array([b for _, b in limits])
+
+    x = np.clip(np.array([getattr(base, f) for f in fields]), lo, hi)
+    s = np.where(x != 0.0, np.abs(x), 1.0)          # work in units of the start value
+    warm = initial
+    evaluations = 0
+
+    def evaluate(x: np.ndarray):
+        nonlocal evaluations
+        h = rel_step * s
+        sign = np.where(x + h <= hi, 1.0, -1.0)
+        points = [x] + list(x + np.diag(sign * h))
+        lanes = [replace(base, **dict(zip(fields, pt.tolist()))) for pt in points]
+        sols = solve_periodic_batch(lanes, None if warm is None else [warm] * len(lanes), tol_ml=1e-10)
+        evaluations += 1
+        R = np.array([residual(sol) for sol in sols])
+        J = (R[1:] - R[0]).T / (sign * h) * s       # d residual / d (x / s)
+        return R[0], J, sols[0], all(sol.converged for sol in sols)
+
+    r, J, sol, ok = evaluate(x)
+    warm = sol.initial
+    cost = 0.5 * float(r @ r)
+    lam = 1e-3
+    status = "max_iter" if ok else "unsolved"
+    for _ in range(max_iter if ok else 0):
+        if np.max(np.abs(r), initial=0.0) < tol:
+            status = "converged"
+            break
+        A = J.T @ J
+        g = J.T @ r
+        dz = np.linalg.solve(A + lam * np.diag(np.diag(A) + 1e-12), -g)
+        x_new = np.clip(x + dz * s, lo, hi)
+        if np.all(np.abs(x_new - x) <= 1e-12 * s):
+            status = "no_step"
+            break
+
+        r_new, J_new, sol_new, ok = evaluate(x_new)
+        cost_new = 0.5 * float(r_new @ r_new)
+        if ok and cost_new < cost:
+            stalled = cost - cost_new <= ftol * cost
+            x, r, J, sol, cost = x_new, r_new, J_new, sol_new, cost_new
+            warm = sol.initial
+            lam = max(lam / 3.0, 1e-12)
+            if np.max(np.abs(r), initial=0.0) < tol:
+                status = "converged"
+                break
+            if stalled:
+                status = "stalled"
+                break
+        else:
+            lam *= 4.0
+
+    values = dict(zip(fields, x.tolist()))
+    return FitResult(
+        params=replace(base, **values),
+        values=values,
+        solution=sol,
+        residual=r,
+        cost=cost,
+        iterations=evaluations - 1,
+        evaluations=evaluations,
+        converged=status == "converged",
+        status=status,
+        at_bound=tuple(f for f, v, a, b in zip(fields, x, lo, hi) if v <= a or v >= b),
+    )
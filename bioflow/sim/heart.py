@@ -1,5 +1,7 @@
 from __future__ import annotations
 import math
+import threading
+from collections import OrderedDict
 
 
 def clamp(x: float, lo: float, hi: float) -> float:
@@ -40,3 +42,263 @@ def pump_flow_ml_s(
     # We want ∫ Q dt = SV => A*(2*systole/pi) = SV => A = SV*pi/(2*systole)
     A = sv * math.pi / (2.0 * systole)
     return A * shape
+
+
+def pumped_volume_ml(
+    t0_s: float,
+    t1_s: float,
+    hr_bpm: float,
+    stroke_volume_ml: float,
+    systole_fraction: float = 0.35,
+) -> float:
+    """
+    Exact volume pumped over [t0_s, t1_s] (closed-form integral of pump_flow_ml_s).
+    Lets large steps move the right amount of blood even across systole.
+    """
+    hr = clamp(hr_bpm, 20.0, 250.0)
+    sv = clamp(stroke_volume_ml, 0.0, 400.0)
+    sf = clamp(systole_fraction, 0.10, 0.70)
+    if sv <= 0.0:
+        return 0.0
+
+    period = 60.0 / hr
+    systole = sf * period
+
+    def cumulative(t: float) -> float:
+        beats = math.floor(t / period)
+        phase = min(t - beats * period, systole)
+        # ∫0^phase A*sin(pi*x/systole) dx = (sv/2) * (1 - cos(pi*phase/systole))
+        return beats * sv + 0.5 * sv * (1.0 - math.cos(math.pi * phase / systole))
+
+    return cumulative(t1_s) - cumulative(t0_s)
+
+
+def pump_flow_ml_s_array(
+    t_s,
+    hr_bpm,
+    stroke_volume_ml,
+    systole_fraction=0.35,
+):
+    """
+    Vectorized pump_flow_ml_s: any argument may be an array (broadcast).
+    Same clamps and operation order as the scalar function, e.g. a whole
+    beat at once: pump_flow_ml_s_array(np.arange(0, 60 / hr, dt), hr, sv).
+    """
+    import numpy as np  # array path only; the scalar engine never needs NumPy
+
+    hr = np.clip(hr_bpm, 20.0, 250.0)
+    sv = np.clip(stroke_volume_ml, 0.0, 400.0)
+    sf = np.clip(systole_fraction, 0.10, 0.70)
+
+    period = 60.0 / hr
+    systole = sf * period
+    phase = np.remainder(t_s, period)
+
+    x = phase / systole
+    shape = np.sin(np.pi * x)
+    A = sv * np.pi / (2.0 * systole)
+    Q = A * shape
+    return np.where((phase >= systole) | (sv <= 0.0), 0.0, Q)
+
+
+# --- Tabulated pump mode ---
+
+PUMP_INTERP_MODES = ("linear", "cubic")
+
+
+class PumpTable:
+    """
+    Precomputed one-beat pump waveform for a fixed (HR, SV, systole_fraction).
+
+    The systolic half-sine is sampled at `resolution` intervals and read back
+    with linear or cubic (Catmull-Rom) interpolation. Samples are rescaled so
+    the exact integral of the interpolant over one beat == stroke_volume_ml.
+    The table is rebuilt only when one of the three parameters changes.
+
+    Tables handed out by pump_table() are frozen to their parameters, so
+    they can be shared between sims and threads; ensure() with other
+    parameters raises on those.
+    """
+
+    def __init__(self, resolution: int = 256, interp: str = "linear") -> None:
+        if interp not in PUMP_INTERP_MODES:
+            raise ValueError(f"interp must be one of {PUMP_INTERP_MODES}, got {interp!r}")
+        if resolution < 4:
+            raise ValueError("resolution must be >= 4")
+        self.resolution = int(resolution)
+        self.interp = interp
+        self.key: tuple[float, float, float] | None = None
+        self.period = 0.0
+        self.systole = 0.0
+        self.values: list[float] = []
+        self._padded: list[float] = []
+        self._cum: list[float] = []
+        self._array = None
+        self.frozen = False
+
+    def ensure(self, hr_bpm: float, stroke_volume_ml: float, systole_fraction: float) -> None:
+        key = (hr_bpm, stroke_volume_ml, systole_fraction)
+        if key != self.key:
+            if self.frozen:
+                raise ValueError(f"shared PumpTable is fixed to {self.key}, got {key}")
+            self._build(*key)
+            self.key = key
+
+    def _build(self, hr_bpm: float, stroke_volume_ml: float, systole_fraction: float) -> None:
+        hr = clamp(hr_bpm, 20.0, 250.0)
+        sv = clamp(stroke_volume_ml, 0.0, 400.0)
+        sf = clamp(systole_fraction, 0.10, 0.70)
+
+        n = self.resolution
+        self.period = 60.0 / hr
+        self.systole = sf * self.period
+        h = self.systole / n
+
+        y = [math.sin(math.pi * j / n) for j in range(n + 1)]
+        y[0] = y[n] = 0.0
+        # Odd extension past both ends keeps the cubic slope right at the edges
+        pad = [-y[1]] + y + [-y[n - 1]]
+
+        if self.interp == "linear":
+            area = h * sum(y)  # trapezoid rule, end samples are zero
+        else:
+            # Exact Catmull-Rom segment integral: h*(-p0 + 13p1 + 13p2 - p3)/24
+            area = h * sum(
+                -pad[j] + 13.0 * pad[j + 1] + 13.0 * pad[j + 2] - pad[j + 3]
+                for j in range(n)
+            ) / 24.0
+
+        scale = sv / area if area > 0.0 else 0.0
+        self.values = [v * scale for v in y]
+        self._padded = [v * scale for v in pad]
+        self._array = None
+
+        # Volume pumped from the start of systole to each sample
+        cum = [0.0]
+        for j in range(n):
+            cum.append(cum[-1] + self._segment_volume(j, 1.0))
+        self._cum = cum
+
+    def flow_at_phase(self, phase: float) -> float:
+        """Pump flow (mL/s) at phase in [0, period)."""
+        if phase >= self.systole:
+            return 0.0
+        u = phase / self.systole * self.resolution
+        j = int(u)
+        if j >= self.resolution:
+            j = self.resolution - 1
+        f = u - j
+        if self.interp == "linear":
+            y = self.values
+            return y[j] + f * (y[j + 1] - y[j])
+        p0, p1, p2, p3 = self._padded[j:j + 4]
+        return 0.5 * (
+            2.0 * p1
+            + (p2 - p0) * f
+            + (2.0 * p0 - 5.0 * p1 + 4.0 * p2 - p3) * f * f
+            + (3.0 * p1 - p0 - 3.0 * p2 + p3) * f * f * f
+        )
+
+    def _segment_volume(self, j: int, f: float) -> float:
+        """Integral of the interpolant over the first fraction f of segment j."""
+        h = self.systole / self.resolution
+        if self.interp == "linear":
+            y = self.values
+            return h * f * (y[j] + 0.5 * f * (y[j + 1] - y[j]))
+        p0, p1, p2, p3 = self._padded[j:j + 4]
+        return 0.5 * h * f * (
+            2.0 * p1
+            + (p2 - p0) * f / 2.0
+            + (2.0 * p0 - 5.0 * p1 + 4.0 * p2 - p3) * f * f / 3.0
+            + (3.0 * p1 - p0 - 3.0 * p2 + p3) * f * f * f / 4.0
+        )
+
+    def _cumulative(self, t: float) -> float:
+        beats = math.floor(t / self.period)
+        phase = t - beats * self.period
+        if phase >= self.systole:
+            return (beats + 1) * self._cum[-1]
+        u = phase / self.systole * self.resolution
+        j = min(int(u), self.resolution - 1)
+        return beats * self._cum[-1] + self._cum[j] + self._segment_volume(j, u - j)
+
+    def volume(self, t0_s: float, t1_s: float) -> float:
+        """Exact volume of the tabulated waveform over [t0_s, t1_s] (cf. pumped_volume_ml)."""
+        return self._cumulative(t1_s) - self._cumulative(t0_s)
+
+    def flow(self, t_s: float, hr_bpm: float, stroke_volume_ml: float,
+             systole_fraction: float = 0.35) -> float:
+        self.ensure(hr_bpm, stroke_volume_ml, systole_fraction)
+        return self.flow_at_phase(t_s % self.period)
+
+    def flow_array(self, t_array, hr_bpm: float, stroke_volume_ml: float,
+                   systole_fraction: float = 0.35):
+        import numpy as np
+
+        self.ensure(hr_bpm, stroke_volume_ml, systole_fraction)
+        return self.flow_at_phase_array(np.remainder(np.asarray(t_array, dtype=float), self.period))
+
+    def flow_at_phase_array(self, phase):
+        """Vectorized flow_at_phase (same operation order)."""
+        import numpy as np
+
+        if self._array is None:
+            self._array = np.asarray(self._padded)   # idempotent, safe to race
+        n = self.resolution
+        u = phase / self.systole * n
+        j = np.minimum(u.astype(np.intp), n - 1)
+        f = u - j
+        pad = self._array
+        p0, p1, p2, p3 = pad[j], pad[j + 1], pad[j + 2], pad[j + 3]
+        if self.interp == "linear":
+            q = p1 + f * (p2 - p1)
+        else:
+            q = 0.5 * (
+                2.0 * p1
+                + (p2 - p0) * f
+                + (2.0 * p0 - 5.0 * p1 + 4.0 * p2 - p3) * f * f
+                + (3.0 * p1 - p0 - 3.0 * p2 + p3) * f * f * f
+            )
+        return np.where(phase >= self.systole, 0.0, q)
+
+
+# Newest shared tables; compiled params keep their own table alive
+_TABLES: OrderedDict[tuple, PumpTable] = OrderedDict()
+_TABLES_MAX = 64
+_tables_lock = threading.Lock()
+
+
+def pump_table(resolution: int, interp: str, hr_bpm: float, stroke_volume_ml: float,
+               systole_fraction: float) -> PumpTable:
+    """
+    Shared, frozen PumpTable for one (resolution, interp, HR, SV, systole)
+    combination; used by the engine's tabulated mode.
+    """
+    key = (int(resolution), interp, hr_bpm, stroke_volume_ml, systole_fraction)
+    with _tables_lock:
+        table = _TABLES.get(key)
+        if table is not None:
+            _TABLES.move_to_end(key)
+            return table
+    table = PumpTable(resolution, interp)
+    table.ensure(hr_bpm, stroke_volume_ml, systole_fraction)
+    table.frozen = True
+    with _tables_lock:
+        table = _TABLES.setdefault(key, table)
+        _TABLES.move_to_end(key)
+        while len(_TABLES) > _TABLES_MAX:
+            _TABLES.popitem(last=False)
+    return table
+
+
+def tabulated_pump_flow_ml_s(
+    t_s: float,
+    hr_bpm: float,
+    stroke_volume_ml: float,
+    systole_fraction: float = 0.35,
+    resolution: int = 256,
+    interp: str = "linear",
+) -> float:
+    """Drop-in for pump_flow_ml_s that reads from a cached PumpTable."""
+    table = pump_table(resolution, interp, hr_bpm, stroke_volume_ml, systole_fraction)
+    return table.flow_at_phase(t_s % table.period)
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from typing import Iterable, Optional, Sequence, Union
+
+import numpy as np
+
+from .state import State, StateBuffer, STATE_FIELDS
+
+
+class History:
+    """
+    Preallocated ring buffer of simulation samples (one float64 column per field).
+
+    Every sample is stored twice, at slot i and i + capacity, so the newest n
+    samples are always one contiguous slice of the backing array. view() and
+    views() therefore return zero-copy, read-only arrays, and appending costs
+    the same whatever the window length.
+    """
+
+    def __init__(self, capacity: int, fields: Sequence[str] = STATE_FIELDS) -> None:
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.capacity = int(capacity)
+        self.fields: tuple[str, ...] = tuple(fields)
+        self._col = {name: i for i, name in enumerate(self.fields)}
+        self._data = np.zeros((len(self.fields), 2 * self.capacity))
+        self._head = 0       # next write slot in [0, capacity)
+        self._len = 0
+        self.total = 0       # samples ever appended (monotonic, survives wrap)
+        self.epoch = 0       # bumped by clear(), lets derived caches notice
+
+    def __len__(self) -> int:
+        return self._len
+
+    def clear(self) -> None:
+        self._head = 0
+        self._len = 0
+        self.total = 0
+        self.epoch += 1
+
+    # --- Writing ---
+
+    def append(self, s: Union[State, StateBuffer]) -> None:
+        row = [getattr(s, name) for name in self.fields]
+        h = self._head
+        self._data[:, h] = row
+        self._data[:, h + self.capacity] = row
+        self._head = (h + 1) % self.capacity
+        self._len = min(self._len + 1, self.capacity)
+        self.total += 1
+
+    def extend(self, rows: Union[np.ndarray, Iterable[Sequence[float]]]) -> None:
+        """Bulk append; rows is (k, len(fields)), e.g. a list of per-step tuples."""
+        block = np.asarray(rows, dtype=float)
+        if block.size == 0:
+            return
+        block = block.reshape(-1, len(self.fields))
+        k = len(block)
+        self.total += k
+        if k >= self.capacity:
+            block = block[-self.capacity:]
+            k = self.capacity
+        cap, h = self.capacity, self._head
+        cols = block.T
+        first = min(k, cap - h)
+        for off in (0, cap):
+            self._data[:, h + off:h + off + first] = cols[:, :first]
+            self._data[:, off:off + k - first] = cols[:, first:]
+        self._head = (h + k) % cap
+        self._len = min(self._len + k, cap)
+
+    # --- Reading ---
+
+    def view(self, field: str, n: Optional[int] = None) -> np.ndarray:
+        """Newest n samples (default: all) of one field, oldest first. Zero-copy."""
+        n = self._len if n is None else max(0, min(n, self._len))
+        end = self._head + self.capacity
+        v = self._data[self._col[field], end - n:end]
+        v.flags.writeable = False
+        return v
+
+    def views(self, n: Optional[int] = None) -> dict[str, np.ndarray]:
+        return {name: self.view(name, n) for name in self.fields}
+
+    def last(self) -> Optional[State]:
+        if self._len == 0:
+            return None
+        col = self._data[:, self._head + self.capacity - 1]
+        return State(**{name: float(col[i]) for i, name in enumerate(self.fields)})
+
+    def window(self, seconds: float, time_field: str = "t") -> int:
+        """Number of newest samples covering the last `seconds` of time_field."""
+        t = self.view(time_field)
+        if len(t) == 0:
+            return 0
+        return len(t) - int(np.searchsorted(t, t[-1] - seconds, side="left"))
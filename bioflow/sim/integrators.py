@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import math
+from abc import ABC, abstractmethod
+from typing import Callable, Optional
+
+from .state import Params, StateBuffer, PARAM_LIMITS
+from .heart import clamp
+from .vessels import pressure_from_volume, peripheral_flow_nonlinear_ml_s
+from .compiled import compiled
+from .engine import advance, derive_into, derive_values
+
+
+# --- Shared pieces ---
+
+def rates(t: float, V_art: float, V_ven: float, V_pool: float, p: Params) -> tuple[float, float, float]:
+    """dV/dt for (art, ven, pool); the same flows engine.step integrates."""
+    _, _, _, Qr, Qp, Qpool = derive_values(compiled(p), t, V_art, V_ven, V_pool)
+    return Qp - Qr, Qr - Qp - Qpool, Qpool
+
+
+def clamp_and_conserve(V_art: float, V_ven: float, V_pool: float,
+                       total_ml: float) -> tuple[float, float, float]:
+    """Physical clamp + exact volume conservation correction (as in engine.step)."""
+    V_art = clamp(V_art, 0.0, total_ml)
+    V_ven = clamp(V_ven, 0.0, total_ml)
+    V_pool = clamp(V_pool, 0.0, total_ml)
+    total = V_art + V_ven + V_pool
+    if total != 0.0:
+        scale = total_ml / total
+        V_art *= scale
+        V_ven *= scale
+        V_pool *= scale
+    return V_art, V_ven, V_pool
+
+
+def _pump_breakpoint(t: float, p: Params) -> float:
+    """Next time after t where the pump waveform has a kink (systole start/end)."""
+    period = 60.0 / clamp(p.hr_bpm, 20.0, 250.0)
+    systole = clamp(p.systole_fraction, 0.10, 0.70) * period
+    beat_start = math.floor(t / period) * period
+    for edge in (beat_start + systole, beat_start + period, beat_start + period + systole):
+        if edge - t > 1e-9:
+            return edge
+    return beat_start + 2.0 * period
+
+
+# --- Integrators ---
+
+class Integrator(ABC):
+    """
+    Advances a StateBuffer by n macro steps of params.dt.
+    Every accepted (sub)step ends with clamp_and_conserve; derived fields in
+    the buffer are refreshed at the end of advance().
+    """
+
+    name = "base"
+    dt_range: tuple[float, float] = PARAM_LIMITS["dt"]
+
+    @abstractmethod
+    def advance(self, buf: StateBuffer, p: Params, n: int) -> None:
+        """Advance buf by n steps of p.dt."""
+
+    def advance_sampled(self, buf: StateBuffer, p: Params, n: int,
+                        on_sample: Callable[[StateBuffer], None]) -> None:
+        """advance(), calling on_sample(buf) after every macro step."""
+        for _ in range(max(0, n)):
+            self.advance(buf, p, 1)
+            on_sample(buf)
+
+    # Constructor options and integrator-internal caches (for checkpointing);
+    # stateless by default
+    def config(self) -> dict:
+        return {}
+
+    def cache(self) -> dict:
+        return {}
+
+    def load_cache(self, cache: dict) -> None:
+        pass
+
+
+class Euler(Integrator):
+    """Forward Euler: exactly engine.step (runs the fused engine.advance kernel)."""
+
+    name = "euler"
+
+    def advance(self, buf: StateBuffer, p: Params, n: int) -> None:
+        advance(buf, p, n)
+
+    def advance_sampled(self, buf: StateBuffer, p: Params, n: int,
+                        on_sample: Callable[[StateBuffer], None]) -> None:
+        advance(buf, p, n, sample_every=1, on_sample=on_sample)
+
+
+class RK4(Integrator):
+    """Classical fixed-step 4th-order Runge-Kutta."""
+
+    name = "rk4"
+    dt_range = (0.001, 0.1)
+
+    def advance(self, buf: StateBuffer, p: Params, n: int) -> None:
+        dt = p.dt
+        total_ml = p.total_volume_ml
+        t, a, v, q = buf.t, buf.V_art_ml, buf.V_ven_ml, buf.V_pool_ml
+        h2 = 0.5 * dt
+        for _ in range(max(0, n)):
+            k1 = rates(t, a, v, q, p)
+            k2 = rates(t + h2, a + h2 * k1[0], v + h2 * k1[1], q + h2 * k1[2], p)
+            k3 = rates(t + h2, a + h2 * k2[0], v + h2 * k2[1], q + h2 * k2[2], p)
+            k4 = rates(t + dt, a + dt * k3[0], v + dt * k3[1], q + dt * k3[2], p)
+            a = a + dt / 6.0 * (k1[0] + 2.0 * k2[0] + 2.0 * k3[0] + k4[0])
+            v = v + dt / 6.0 * (k1[1] + 2.0 * k2[1] + 2.0 * k3[1] + k4[1])
+            q = q + dt / 6.0 * (k1[2] + 2.0 * k2[2] + 2.0 * k3[2] + k4[2])
+            a, v, q = clamp_and_conserve(a, v, q, total_ml)
+            t = t + dt
+        buf.t, buf.V_art_ml, buf.V_ven_ml, buf.V_pool_ml = t, a, v, q
+        derive_into(buf, p)
+
+
+# Dormand-Prince 5(4) tableau
+_DP_C = (0.0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1.0, 1.0)
+_DP_A = (
+    (),
+    (1 / 5,),
+    (3 / 40, 9 / 40),
+    (44 / 45, -56 / 15, 32 / 9),
+    (19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729),
+    (9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656),
+    (35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84),
+)
+_DP_B5 = (35 / 384, 0.0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84, 0.0)
+_DP_B4 = (5179 / 57600, 0.0, 7571 / 16695, 393 / 640, -92097 / 339200, 187 / 2100, 1 / 40)
+_DP_E = tuple(b5 - b4 for b5, b4 in zip(_DP_B5, _DP_B4))
+
+
+class RK45(Integrator):
+    """
+    Embedded Dormand-Prince 5(4) with error control.
+
+    params.dt is the output (macro) interval; inside it the step size adapts to
+    rtol/atol. Substeps stop exactly at systole start/end, so the half-sine is
+    resolved while diastole is crossed in a few large steps. The last accepted
+    step size is kept between calls (see cache()).
+    """
+
+    name = "rk45"
+    dt_range = (0.001, 2.0)
+
+    def __init__(self, rtol: float = 1e-6, atol_ml: float = 1e-4, h_min: float = 1e-6) -> None:
+        self.rtol = rtol
+        self.atol_ml = atol_ml
+        self.h_min = h_min
+        self.h: Optional[float] = None
+        self.accepted = 0
+        self.rejected = 0
+
+    def config(self) -> dict:
+        return {"rtol": self.rtol, "atol_ml": self.atol_ml, "h_min": self.h_min}
+
+    def cache(self) -> dict:
+        return {"h": self.h}
+
+    def load_cache(self, cache: dict) -> None:
+        self.h = cache.get("h")
+
+    def advance(self, buf: StateBuffer, p: Params, n: int) -> None:
+        total_ml = p.total_volume_ml
+        y = [buf.V_art_ml, buf.V_ven_ml, buf.V_pool_ml]
+        t = buf.t
+        h = self.h or p.dt
+
+        for _ in range(max(0, n)):
+            t_end = t + p.dt
+            while t_end - t > 1e-12:
+                h_use = max(min(h, t_end - t, _pump_breakpoint(t, p) - t), self.h_min)
+                k = []
+                for c, row in zip(_DP_C, _DP_A):
+                    yi = [y[j] + h_use * sum(a * kk[j] for a, kk in zip(row, k)) for j in range(3)]
+                    k.append(rates(t + c * h_use, yi[0], yi[1], yi[2], p))
+
+                y5 = [y[j] + h_use * sum(b * kk[j] for b, kk in zip(_DP_B5, k)) for j in range(3)]
+                err = max(
+                    abs(h_use * sum(e * kk[j] for e, kk in zip(_DP_E, k)))
+                    / (self.atol_ml + self.rtol * max(abs(y[j]), abs(y5[j])))
+                    for j in range(3)
+                )
+
+                if err <= 1.0 or h_use <= self.h_min:
+                    t = t_end if t_end - (t + h_use) <= 1e-12 else t + h_use
+                    y = list(clamp_and_conserve(y5[0], y5[1], y5[2], total_ml))
+                    self.accepted += 1
+                    grow = 5.0 if err == 0.0 else min(5.0, 0.9 * err ** -0.2)
+                    # A step cut short by a breakpoint says nothing against a larger h
+                    h = max(h, h_use * grow) if h_use < h else h_use * grow
+                else:
+                    self.rejected += 1
+                    h = h_use * max(0.2, 0.9 * err ** -0.25)
+            t = t_end
+
+        self.h = h
+        buf.t = t
+        buf.V_art_ml, buf.V_ven_ml, buf.V_pool_ml = y
+        derive_into(buf, p)
+
+
+class IMEX(Integrator):
+    """
+    Semi-implicit step: the stiff resistance/compliance coupling and the pooling
+    relaxation are implicit (backward Euler), the pump is explicit but uses the
+    exact pumped volume over the step (CompiledParams.pumped_volume), so large steps
+    stay stable at low arterial compliance and still deliver the full stroke.
+    """
+
+    name = "imex"
+    dt_range = (0.001, 0.5)
+
+    def advance(self, buf: StateBuffer, p: Params, n: int) -> None:
+        dt = p.dt
+        total_ml = p.total_volume_ml
+        target_pool = clamp(p.venous_pooling_target, 0.0, 0.6) * total_ml
+        tau = max(p.pooling_tau_s, 1e-6)
+        pumped = compiled(p).pumped_volume
+        t, a, v, q = buf.t, buf.V_art_ml, buf.V_ven_ml, buf.V_pool_ml
+
+        for _ in range(max(0, n)):
+            dVp = pumped(t, t + dt)
+
+            # Pooling: V' = V + dt*(target - V')/tau
+            q_new = (q + dt * target_pool / tau) / (1.0 + dt / tau)
+            S = a + v - (q_new - q)  # art + ven after pooling exchange
+
+            a_new = self._solve_arterial(a, dVp, S, dt, p)
+            a, v, q = clamp_and_conserve(a_new, S - a_new, q_new, total_ml)
+            t = t + dt
+
+        buf.t, buf.V_art_ml, buf.V_ven_ml, buf.V_pool_ml = t, a, v, q
+        derive_into(buf, p)
+
+    @staticmethod
+    def _solve_arterial(a: float, dVp: float, S: float, dt: float, p: Params) -> float:
+        """
+        Root of g(x) = x - a - dVp + dt*Q(P_art(x) - P_ven(S - x)).
+        g is increasing in x, so safeguarded Newton on [0, S] always converges.
+        """
+        R0 = max(p.peripheral_resistance, 1e-9)
+        k = max(p.resistance_nonlinearity, 0.0)
+        Ca = max(p.arterial_compliance, 1e-9)
+        Cv = max(p.venous_compliance, 1e-9)
+
+        def g(x: float) -> tuple[float, float]:
+            P_art = pressure_from_volume(x, p.V0_art_ml, Ca)
+            P_ven = pressure_from_volume(S - x, p.V0_ven_ml, Cv)
+            Q = peripheral_flow_nonlinear_ml_s(P_art - P_ven, R0, k)
+            dQ = 1.0 / (R0 * (1.0 + 2.0 * k * abs(Q)))
+            dPdx = (1.0 / Ca if P_art > 0.0 else 0.0) + (1.0 / Cv if P_ven > 0.0 else 0.0)
+            return x - a - dVp + dt * Q, 1.0 + dt * dQ * dPdx
+
+        lo, hi = 0.0, max(S, 0.0)
+        if g(hi)[0] <= 0.0:
+            return hi
+        if g(lo)[0] >= 0.0:
+            return lo
+        x = clamp(a + dVp, lo, hi)
+        tol = 1e-12 * max(S, 1.0)
+        for _ in range(60):
+            gx, dg = g(x)
+            if gx > 0.0:
+                hi = x
+            else:
+                lo = x
+            x_new = x - gx / dg
+            if not (lo < x_new < hi):
+                x_new = 0.5 * (lo + hi)
+            if abs(x_new - x) <= tol:
+                return x_new
+            x = x_new
+        return x
+
+
+INTEGRATORS: dict[str, type[Integrator]] = {
+    "euler": Euler,
+    "rk4": RK4,
+    "rk45": RK45,
+    "imex": IMEX,
+}
+
+
+def make_integrator(name: str, **kwargs) -> Integrator:
+    try:
+        cls = INTEGRATORS[name]
+    except KeyError:
+        raise ValueError(f"unknown integrator {name!r}; choose from {sorted(INTEGRATORS)}") from None
+    return cls(**kwargs)
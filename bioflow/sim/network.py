@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Mapping, Optional, Sequence
+
+import numpy as np
+
+from .state import Params, State
+from .engine import clamp, pump_flow_for
+from .vessels import (
+    pressure_from_volume_array, peripheral_flow_from_coefficients_array, resistance_coefficients_array)
+
+EDGE_KINDS = ("resistance", "pump", "relax")
+
+
+@dataclass(frozen=True)
+class Compartment:
+    name: str
+    compliance: float               # mL / mmHg
+    v0_ml: float = 0.0              # unstressed volume
+    initial_ml: float = 0.0
+
+
+@dataclass(frozen=True)
+class Edge:
+    """
+    Directed flow src -> dst (negative flow runs backwards).
+
+    kind "resistance": Q = peripheral_flow_nonlinear(P_src - P_dst, resistance, nonlinearity)
+    kind "pump":       Q = share * heart output (the network's one pump)
+    kind "relax":      Q = (target_ml - V_dst) / tau_s   (pooling-style relaxation)
+    """
+    src: str
+    dst: str
+    kind: str = "resistance"
+    resistance: float = 1.0
+    nonlinearity: float = 0.0
+    share: float = 1.0
+    target_ml: float = 0.0
+    tau_s: float = 1.0
+    name: str = ""
+
+    @property
+    def label(self) -> str:
+        return self.name or f"{self.src}->{self.dst}"
+
+
+@dataclass(frozen=True)
+class Bed:
+    """A vascular bed between arteries and veins (see Network.parallel_beds)."""
+    resistance: float                 # arterial inflow R0
+    compliance: float = 1.0
+    v0_ml: float = 0.0
+    outflow_resistance: float = 0.05  # bed -> veins, linear
+
+
+class Network:
+    """
+    A circulation declared as data: compartments (compliance, unstressed
+    volume) joined by edges. Only the pump waveform, dt and total volume come
+    from `params`.
+
+    Edge endpoints are stored as index arrays (a sparse incidence matrix), so
+    NetworkEngine evaluates every edge of a kind with one vectorized call and
+    scatters net flows onto compartments with one bincount.
+    """
+
+    def __init__(self, compartments: Sequence[Compartment], edges: Sequence[Edge],
+                 params: Optional[Params] = None) -> None:
+        self.compartments = tuple(compartments)
+        self.edges = tuple(edges)
+        self.params = params or Params()
+        self.index = {c.name: i for i, c in enumerate(self.compartments)}
+        if len(self.index) != len(self.compartments):
+            raise ValueError("compartment names must be unique")
+        for e in self.edges:
+            if e.kind not in EDGE_KINDS:
+                raise ValueError(f"unknown edge kind {e.kind!r}; choose from {EDGE_KINDS}")
+            for end in (e.src, e.dst):
+                if end not in self.index:
+                    raise ValueError(f"edge {e.label} refers to unknown compartment {end!r}")
+
+        c = self.compartments
+        self.v0 = np.array([x.v0_ml for x in c], dtype=float)
+        self.compliance = np.array([x.compliance for x in c], dtype=float)
+        self.src = np.array([self.index[e.src] for e in self.edges], dtype=np.intp)
+        self.dst = np.array([self.index[e.dst] for e in self.edges], dtype=np.intp)
+        # Edge-ordered (src, dst) pairs, so per-compartment sums run in edge order
+        self.ends = np.stack([self.src, self.dst], axis=1).reshape(-1)
+
+        def of_kind(kind: str) -> np.ndarray:
+            return np.array([i for i, e in enumerate(self.edges) if e.kind == kind], dtype=np.intp)
+
+        self.res_idx = of_kind("resistance")
+        self.pump_idx = of_kind("pump")
+        self.relax_idx = of_kind("relax")
+        ed = self.edges
+        self.res_R0 = np.array([ed[i].resistance for i in self.res_idx], dtype=float)
+        self.res_k = np.array([ed[i].nonlinearity for i in self.res_idx], dtype=float)
+        self.res_coeffs = resistance_coefficients_array(self.res_R0, self.res_k)
+        self.pump_share = np.array([ed[i].share for i in self.pump_idx], dtype=float)
+        self.relax_target = np.array([ed[i].target_ml for i in self.relax_idx], dtype=float)
+        self.relax_tau = np.array([max(ed[i].tau_s, 1e-6) for i in self.relax_idx], dtype=float)
+
+    @property
+    def n(self) -> int:
+        return len(self.compartments)
+
+    def initial_volumes(self) -> np.ndarray:
+        return np.array([c.initial_ml for c in self.compartments], dtype=float)
+
+    # --- Builders ---
+
+    @classmethod
+    def from_params(cls, p: Params) -> "Network":
+        """
+        The engine's art/ven/pool model as a network. NetworkEngine on this
+        reproduces engine.step bit-for-bit (edge order periph, pump, pool).
+        """
+        V_pool = 0.10 * p.total_volume_ml
+        V_art = 0.20 * p.total_volume_ml
+        V_ven = p.total_volume_ml - V_art - V_pool
+        return cls(
+            [
+                Compartment("art", p.arterial_compliance, p.V0_art_ml, V_art),
+                Compartment("ven", p.venous_compliance, p.V0_ven_ml, V_ven),
+                Compartment("pool", p.pool_compliance, p.V0_pool_ml, V_pool),
+            ],
+            [
+                Edge("art", "ven", resistance=p.peripheral_resistance,
+                     nonlinearity=p.resistance_nonlinearity, name="periph"),
+                Edge("ven", "art", kind="pump", name="pump"),
+                Edge("ven", "pool", kind="relax",
+                     target_ml=clamp(p.venous_pooling_target, 0.0, 0.6) * p.total_volume_ml,
+                     tau_s=p.pooling_tau_s, name="pool"),
+            ],
+            p,
+        )
+
+    @classmethod
+    def parallel_beds(cls, p: Params, beds: Mapping[str, Bed]) -> "Network":
+        """
+        from_params' circulation with the single peripheral resistance replaced
+        by parallel beds (e.g. brain/heart/kidney/limb), all fed by the one
+        pump. Beds start at their unstressed volume, taken from the veins.
+        """
+        base = cls.from_params(p)
+        art, ven, pool = base.compartments
+        comps = [art]
+        edges = []
+        for name, bed in beds.items():
+            comps.append(Compartment(name, bed.compliance, bed.v0_ml, bed.v0_ml))
+            edges.append(Edge("art", name, resistance=bed.resistance,
+                              nonlinearity=p.resistance_nonlinearity))
+            edges.append(Edge(name, "ven", resistance=bed.outflow_resistance))
+        v_beds = sum(b.v0_ml for b in beds.values())
+        comps += [
+            Compartment("ven", ven.compliance, ven.v0_ml, ven.initial_ml - v_beds),
+            pool,
+        ]
+        return cls(comps, edges + list(base.edges[1:]), p)
+
+
+class NetworkEngine:
+    """
+    Steps a Network with the engine's rules: flows from current volumes,
+    forward-Euler transfer, clamp each volume to [0, total], then rescale so
+    the total is exact. Derived pressures and flows stay current after each
+    step, so a step costs one derived pass.
+    """
+
+    def __init__(self, net: Network, volumes: Optional[np.ndarray] = None, t: float = 0.0) -> None:
+        self.net = net
+        self.t = float(t)
+        self.V = np.array(net.initial_volumes() if volumes is None else volumes, dtype=float)
+        if self.V.shape != (net.n,):
+            raise ValueError("need one volume per compartment")
+        self.P = np.zeros(net.n)
+        self.Q = np.zeros(len(net.edges))
+        self.derive()
+
+    def derive(self) -> None:
+        net = self.net
+        self.P = pressure_from_volume_array(self.V, net.v0, net.compliance)
+        Q = self.Q
+        if len(net.res_idx):
+            dP = self.P[net.src[net.res_idx]] - self.P[net.dst[net.res_idx]]
+            Q[net.res_idx] = peripheral_flow_from_coefficients_array(dP, *net.res_coeffs)
+        if len(net.pump_idx):
+            Q[net.pump_idx] = pump_flow_for(self.t, net.params) * net.pump_share
+        if len(net.relax_idx):
+            Q[net.relax_idx] = (net.relax_target - self.V[net.dst[net.relax_idx]]) / net.relax_tau
+
+    def net_inflow(self) -> np.ndarray:
+        """dV/dt per compartment (incidence matrix times edge flows)."""
+        Q = self.Q
+        w = np.stack([-Q, Q], axis=1).reshape(-1)
+        return np.bincount(self.net.ends, weights=w, minlength=self.net.n)
+
+    def step(self, n: int = 1) -> None:
+        p = self.net.params
+        dt = p.dt
+        total_ml = p.total_volume_ml
+        for _ in range(max(0, n)):
+            V = np.clip(self.V + self.net_inflow() * dt, 0.0, total_ml)
+            total = V.sum()
+            if total != 0.0:
+                V *= total_ml / total
+            self.V = V
+            self.t = self.t + dt
+            self.derive()
+
+    # --- Lookups ---
+
+    def volume(self, name: str) -> float:
+        return float(self.V[self.net.index[name]])
+
+    def pressure(self, name: str) -> float:
+        return float(self.P[self.net.index[name]])
+
+    def flow(self, label: str) -> float:
+        for i, e in enumerate(self.net.edges):
+            if e.label == label:
+                return float(self.Q[i])
+        raise KeyError(label)
+
+    def state(self) -> State:
+        """State view for networks built by Network.from_params."""
+        i = self.net.index
+        return State(
+            t=self.t,
+            V_art_ml=float(self.V[i["art"]]), V_ven_ml=float(self.V[i["ven"]]),
+            V_pool_ml=float(self.V[i["pool"]]),
+            P_art_mmHg=float(self.P[i["art"]]), P_ven_mmHg=float(self.P[i["ven"]]),
+            P_pool_mmHg=float(self.P[i["pool"]]),
+            Q_periph_ml_s=self.flow("periph"), Q_pump_ml_s=self.flow("pump"),
+            Q_pool_ml_s=self.flow("pool"),
+        )
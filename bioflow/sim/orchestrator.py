@@ -1,10 +1,14 @@
 from __future__ import annotations
 
-from dataclasses import replace
-from typing import Optional
+from dataclasses import fields, replace
+from typing import Callable, Optional, Union
 
-from .state import Params, State
-from .engine import step, compute_derived
+from .state import Params, State, StateBuffer, changed_fields, clamp_param_updates
+from .engine import compute_derived, derive_into
+from .compiled import compiled
+from .integrators import Integrator, make_integrator
+from . import checkpoint as _ckpt
+from bioflow.utils.timing import span
 
 
 class SimOrchestrator:
@@ -12,14 +16,41 @@ class SimOrchestrator:
     Owns params + state + run control.
     UI talks to this, not to engine.step directly.
     Deterministic: exactly one step per tick, fixed ordering.
+
+    The live state is a mutable StateBuffer stepped in place; `state` hands
+    out a read-only State snapshot, rebuilt at most once per tick.
     """
 
-    def __init__(self, params: Optional[Params] = None, initial: Optional[State] = None) -> None:
+    def __init__(
+        self,
+        params: Optional[Params] = None,
+        initial: Optional[State] = None,
+        integrator: Union[str, Integrator] = "euler",
+    ) -> None:
         self.params: Params = params or Params()
+        self.integrator: Integrator = (
+            make_integrator(integrator) if isinstance(integrator, str) else integrator)
         self._initial: State = compute_derived(
             initial or self._default_initial(self.params), self.params)
-        self.state: State = self._initial
+        self._buf = StateBuffer(self._initial)
+        self._snapshot: Optional[State] = self._initial
         self.paused: bool = True
+        self._sinks: list = []
+        self.checkpoints: Optional[_ckpt.CheckpointStore] = None
+
+    @property
+    def state(self) -> State:
+        if self._snapshot is None:
+            self._snapshot = self._buf.snapshot()
+        return self._snapshot
+
+    def _load_state(self, s: State) -> None:
+        self._buf.load(s)
+        self._snapshot = s
+
+    def _rederive(self) -> None:
+        derive_into(self._buf, self.params)
+        self._snapshot = None
 
     @staticmethod
     def _default_initial(p: Params) -> State:
@@ -39,70 +70,229 @@ class SimOrchestrator:
 
     def reset(self, *, keep_params: bool = True) -> None:
         p = self.params if keep_params else Params()
-        self.params = p
         self._initial = compute_derived(self._default_initial(p), p)
-        self.state = self._initial
+        self._load_state(self._initial)
+        self._notify_params(p)
+        self.params = p
         self.paused = True
+        self._restart_checkpoints()
+        self._notify_reset()
 
     def soft_reset(self) -> None:
         was_paused = self.paused
-        self.state = compute_derived(
-            self._default_initial(self.params), self.params)
+        self._load_state(compute_derived(
+            self._default_initial(self.params), self.params))
         self.paused = was_paused
+        self._restart_checkpoints()
+        self._notify_reset()
 
     # --- Deterministic stepping ---
 
-    def tick(self, n: int = 1) -> State:
+    def tick(self, n: int = 1, on_sample: Optional[Callable[[StateBuffer], None]] = None) -> State:
         """
         Advance simulation by n fixed steps (dt).
-        Deterministic ordering:
-          1) compute_derived inside step
+        on_sample(buf), if given, sees the live buffer after every step
+        (read it, don't keep it).
+        Deterministic ordering (per step, same as engine.step):
+          1) flows from current volumes
           2) apply transfers
           3) clamp/conserve
-          4) compute_derived again
+        With the default Euler integrator this is one fused engine.advance
+        call; derived fields are materialized once at the end.
         """
         if self.paused:
             return self.state
 
-        s = self.state
-        for _ in range(max(0, n)):
-            s = step(s, self.params)
+        with span("sim.tick"):
+            on_sample = self._sample_hook(on_sample)
+            store = self.checkpoints
+            if store is None:
+                self._advance(n, on_sample)
+            else:
+                # Split at checkpoint times; advancing in pieces is bit-identical
+                left = max(0, n)
+                while left:
+                    k = min(left, store.steps_until_due(self._buf.t, self.params.dt))
+                    self._advance(k, on_sample)
+                    left -= k
+                    if store.due(self._buf.t):
+                        store.add(self._buf.t, self.checkpoint())
+            self._snapshot = None
+            return self.state
+
+    def _sample_hook(self, on_sample):
+        if not self._sinks:
+            return on_sample
+        hooks = [sink.on_step for sink in self._sinks]
+        if on_sample is not None:
+            hooks.append(on_sample)
+        if len(hooks) == 1:
+            return hooks[0]
+
+        def fan_out(buf: StateBuffer) -> None:
+            for hook in hooks:
+                hook(buf)
+        return fan_out
 
-        self.state = s
-        return s
+    def _advance(self, n: int, on_sample) -> None:
+        if on_sample is None:
+            self.integrator.advance(self._buf, self.params, n)
+        else:
+            self.integrator.advance_sampled(self._buf, self.params, n, on_sample)
 
     # --- Convenience: update parameters safely ---
 
     def update_params(self, **kwargs) -> None:
-        # Clamp core stability ranges here (single source of truth)
-        if "dt" in kwargs:
-            kwargs["dt"] = max(0.001, min(0.05, float(kwargs["dt"])))
+        # Clamp core stability ranges here (single source of truth: state.PARAM_LIMITS;
+        # the dt range comes from the active integrator)
+        kwargs = clamp_param_updates(kwargs, {"dt": self.integrator.dt_range})
 
-        if "peripheral_resistance" in kwargs:
-            kwargs["peripheral_resistance"] = max(
-                0.05, min(20.0, float(kwargs["peripheral_resistance"])))
+        # Slider drags resend every field: keep only real changes, and keep
+        # the current Params (and its compiled constants) when there are none
+        changes = changed_fields(self.params, kwargs)
+        if changes:
+            self.set_params(replace(self.params, **changes))
 
-        if "arterial_compliance" in kwargs:
-            kwargs["arterial_compliance"] = max(
-                0.1, min(20.0, float(kwargs["arterial_compliance"])))
+    def set_integrator(self, integrator: Union[str, Integrator]) -> None:
+        """Switch integration scheme; dt is re-clamped to the new scheme's range."""
+        self.integrator = (
+            make_integrator(integrator) if isinstance(integrator, str) else integrator)
+        before = self.params
+        self.update_params(dt=self.params.dt)
+        if self.params is before:
+            self._params_checkpoint()
 
-        if "venous_pooling_target" in kwargs:
-            kwargs["venous_pooling_target"] = max(
-                0.0, min(0.6, float(kwargs["venous_pooling_target"])))
+    def set_params(self, params: Params) -> None:
+        # Rebuild only the derived-constant groups whose fields changed
+        compiled(params, prev=compiled(self.params))
+        self._notify_params(params)
+        self.params = params
+        self._rederive()
+        self._params_checkpoint()
 
-        if "hr_bpm" in kwargs:
-            kwargs["hr_bpm"] = max(20.0, min(250.0, float(kwargs["hr_bpm"])))
+    # --- What-if branches ---
+
+    def fork(self, variants, duration_s: float, *, sample_interval_s: Optional[float] = None):
+        """
+        Preview futures from the current state under each variant (Params or
+        field updates), without touching this timeline. See branch.fork.
+        """
+        from .branch import fork
+        return fork(self.state, self.params, variants, duration_s,
+                    sample_interval_s=sample_interval_s, integrator=self.integrator)
 
-        if "stroke_volume_ml" in kwargs:
-            kwargs["stroke_volume_ml"] = max(
-                0.0, min(400.0, float(kwargs["stroke_volume_ml"])))
+    # --- Checkpoints ---
 
-        self.params = replace(self.params, **kwargs)
-        self.state = compute_derived(self.state, self.params)
+    def checkpoint(self) -> bytes:
+        """Compact blob of state, params, paused flag and integrator caches."""
+        return _ckpt.dumps(self._buf, self.params, self.paused, self.integrator)
 
-    def set_params(self, params: Params) -> None:
+    def restore(self, blob: bytes) -> None:
+        """
+        Return to a checkpoint() blob. Stepping on from here is bit-identical
+        to the run the checkpoint was taken from.
+        """
+        self._restore(blob)
+        self._notify_reset()
+
+    def _restore(self, blob: bytes) -> None:
+        state, params, paused, integ = _ckpt.loads(blob)
+        if integ["name"] != self.integrator.name or integ["config"] != self.integrator.config():
+            self.integrator = make_integrator(integ["name"], **integ["config"])
+        self.integrator.load_cache(integ["cache"])
+        self._load_state(state)
+        self._notify_params(params)
         self.params = params
-        self.state = compute_derived(self.state, self.params)
+        self.paused = paused
+
+    @classmethod
+    def from_checkpoint(cls, blob: bytes) -> "SimOrchestrator":
+        sim = cls()
+        sim.restore(blob)
+        return sim
+
+    def auto_checkpoint(self, every_s: Optional[float], keep: int = 256) -> None:
+        """
+        Checkpoint every `every_s` simulated seconds (and on every parameter
+        change) while ticking, keeping the newest `keep`; None turns it off.
+        Enables seek().
+        """
+        self.checkpoints = None if every_s is None else _ckpt.CheckpointStore(every_s, keep)
+        self._restart_checkpoints()
+
+    def seek(self, t: float) -> State:
+        """
+        Jump to time t of the current run: restore the nearest checkpoint at
+        or before t and fast-forward from it (sinks are not fed the steps,
+        only on_reset at t). Checkpoints after t are dropped, since stepping
+        on from t starts a new future.
+        """
+        store = self.checkpoints
+        blob = None if store is None else store.at_or_before(t)
+        if blob is None:
+            raise ValueError(f"no checkpoint at or before t={t} (auto_checkpoint enabled?)")
+        paused = self.paused
+        self._restore(blob)
+        self.paused = paused
+        store.truncate_after(self._buf.t)
+        n = round((t - self._buf.t) / self.params.dt)
+        while n > 0:
+            k = min(n, store.steps_until_due(self._buf.t, self.params.dt))
+            self.integrator.advance(self._buf, self.params, k)
+            n -= k
+            if store.due(self._buf.t):
+                store.add(self._buf.t, self.checkpoint())
+        self._snapshot = None
+        self._notify_reset()
+        return self.state
+
+    def _restart_checkpoints(self) -> None:
+        if self.checkpoints is not None:
+            self.checkpoints.clear()
+            self.checkpoints.add(self._buf.t, self.checkpoint())
+
+    def _params_checkpoint(self) -> None:
+        if self.checkpoints is not None:
+            self.checkpoints.add(self._buf.t, self.checkpoint())
+
+    # --- Sinks (recorders, metric streams, ...) ---
+
+    def attach(self, sink) -> None:
+        """
+        Attach a sink. Sinks implement on_step(buf), called after every step
+        while attached (read the buffer, don't keep it), and on_params(t,
+        changes) with the changed Params fields. Optional on_attach(sim) and
+        on_detach(sim) bracket the attachment; optional on_reset(sim) follows
+        every jump to another timeline (reset, soft_reset, restore, seek),
+        with sim.state the new starting point.
+        """
+        self._sinks.append(sink)
+        hook = getattr(sink, "on_attach", None)
+        if hook is not None:
+            hook(self)
+
+    def detach(self, sink) -> None:
+        self._sinks.remove(sink)
+        hook = getattr(sink, "on_detach", None)
+        if hook is not None:
+            hook(self)
+
+    def _notify_params(self, new: Params) -> None:
+        if not self._sinks:
+            return
+        changes = {
+            f.name: getattr(new, f.name) for f in fields(Params)
+            if getattr(new, f.name) != getattr(self.params, f.name)
+        }
+        if changes:
+            for sink in self._sinks:
+                sink.on_params(self._buf.t, changes)
+
+    def _notify_reset(self) -> None:
+        for sink in self._sinks:
+            hook = getattr(sink, "on_reset", None)
+            if hook is not None:
+                hook(self)
 
     def baseline_params(self) -> Params:
         return Params()  # your canonical baseline
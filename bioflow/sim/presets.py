@@ -1,16 +1,17 @@
 from __future__ import annotations
 from dataclasses import replace
+from typing import Callable, Optional
 from .state import Params
 
 
-def baseline() -> Params:
+def baseline(p: Optional[Params] = None) -> Params:
     # Keep whatever baseline you started with
-    return Params()
+    return p or Params()
 
 
-def high_resistance() -> Params:
+def high_resistance(p: Optional[Params] = None) -> Params:
     # Stenosis proxy: harder to push through periphery
-    p = baseline()
+    p = baseline(p)
     return replace(
         p,
         peripheral_resistance=3.0,
@@ -18,20 +19,36 @@ def high_resistance() -> Params:
     )
 
 
-def low_compliance() -> Params:
+def low_compliance(p: Optional[Params] = None) -> Params:
     # Stiff arteries proxy: higher pressures for same volume
-    p = baseline()
+    p = baseline(p)
     return replace(
         p,
         arterial_compliance=1.0,
     )
 
 
-def weak_pump() -> Params:
+def weak_pump(p: Optional[Params] = None) -> Params:
     # Heart failure proxy: lower SV, optionally higher HR
-    p = baseline()
+    p = baseline(p)
     return replace(
         p,
         stroke_volume_ml=35.0,
         hr_bpm=max(p.hr_bpm, 90.0),
     )
+
+
+PRESETS: dict[str, Callable[[Optional[Params]], Params]] = {
+    "baseline": baseline,
+    "high_resistance": high_resistance,
+    "low_compliance": low_compliance,
+    "weak_pump": weak_pump,
+}
+
+
+def get(name: str, p: Optional[Params] = None) -> Params:
+    """Preset by name (as listed in PRESETS), optionally applied on top of p."""
+    preset = PRESETS.get(name)
+    if preset is None:
+        raise ValueError(f"unknown preset {name!r}; choose from {sorted(PRESETS)}")
+    return preset(p)
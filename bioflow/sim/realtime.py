@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import replace
+from typing import Optional
+
+from .state import Params, State, changed_fields, clamp_param_updates
+from .orchestrator import SimOrchestrator
+
+
+class SimWorker:
+    """
+    Runs a SimOrchestrator on a background thread, paced by the wall clock.
+
+    - real_time_factor: simulated seconds per wall second (1.0 = real time).
+    - Snapshots are published by swapping a single reference (double buffer:
+      the worker builds a new State, readers keep whatever they last took),
+      so the UI reads `latest` at its own frame rate without locking.
+    - Control calls (play/pause/reset/update_params/...) are queued and applied
+      by the worker between steps, preserving the orchestrator's determinism.
+      `params` reflects queued changes immediately, so UI code can read back
+      what it just set.
+    - record=True also captures every step as a STATE_FIELDS row; the UI
+      collects them with drain_samples() (e.g. into a History) so plots get
+      full time resolution, not one point per frame.
+    """
+
+    def __init__(
+        self,
+        sim: Optional[SimOrchestrator] = None,
+        *,
+        real_time_factor: float = 1.0,
+        max_steps_per_wake: int = 2000,
+        wake_interval_s: float = 0.004,
+        record: bool = False,
+    ) -> None:
+        self.sim = sim or SimOrchestrator()
+        self.real_time_factor = real_time_factor
+        self.max_steps_per_wake = max_steps_per_wake
+        self.wake_interval_s = wake_interval_s
+
+        self._commands: deque = deque()
+        self._params_view: Params = self.sim.params
+        self._paused_view: bool = self.sim.paused
+        self.latest: State = self.sim.state
+        self.steps = 0
+        self.dropped_s = 0.0  # sim time skipped because the worker fell behind
+
+        self.record = record
+        self._chunk: list[tuple] = []
+        self._samples: deque = deque()  # published chunks of rows
+
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # --- Thread lifecycle ---
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="bioflow-sim", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self) -> None:
+        last = time.perf_counter()
+        debt_s = 0.0  # simulated time owed to the wall clock
+        while not self._stop.is_set():
+            now = time.perf_counter()
+            debt_s += (now - last) * self.real_time_factor
+            last = now
+
+            self._drain_commands()
+            if self.sim.paused:
+                debt_s = 0.0
+            else:
+                dt = self.sim.params.dt
+                n = int(debt_s / dt)
+                if n > self.max_steps_per_wake:
+                    self.dropped_s += (n - self.max_steps_per_wake) * dt
+                    debt_s -= (n - self.max_steps_per_wake) * dt
+                    n = self.max_steps_per_wake
+                if n > 0:
+                    self._tick(n)
+                    debt_s -= n * dt
+
+            self._stop.wait(self.wake_interval_s)
+
+    def pump(self, n: int) -> State:
+        """Apply queued commands and run n steps on the caller's thread (tests, headless use)."""
+        self._drain_commands()
+        if not self.sim.paused:
+            self._tick(n)
+        return self.latest
+
+    def _tick(self, n: int) -> None:
+        if self.record:
+            latest = self.sim.tick(n, on_sample=self._record_step)
+            # Queue the rows before publishing: a reader that sees the new
+            # snapshot must find them in the next drain_samples()
+            self._samples.append(self._chunk)
+            self._chunk = []
+        else:
+            latest = self.sim.tick(n)
+        self.steps += n
+        self.latest = latest
+
+    def _record_step(self, b) -> None:
+        self._chunk.append((
+            b.t, b.V_art_ml, b.V_ven_ml, b.V_pool_ml,
+            b.P_art_mmHg, b.P_ven_mmHg, b.P_pool_mmHg,
+            b.Q_periph_ml_s, b.Q_pump_ml_s, b.Q_pool_ml_s,
+        ))
+
+    def drain_samples(self) -> list[tuple]:
+        """All per-step rows (STATE_FIELDS order) published since the last call."""
+        rows: list[tuple] = []
+        while self._samples:
+            rows.extend(self._samples.popleft())
+        return rows
+
+    def _drain_commands(self) -> None:
+        while self._commands:
+            name, args, kwargs = self._commands.popleft()
+            getattr(self.sim, name)(*args, **kwargs)
+            self.latest = self.sim.state
+
+    def _submit(self, name: str, *args, **kwargs) -> None:
+        self._commands.append((name, args, kwargs))
+
+    # --- SimOrchestrator-compatible control surface (queued) ---
+
+    @property
+    def params(self) -> Params:
+        return self._params_view
+
+    @property
+    def paused(self) -> bool:
+        return self._paused_view
+
+    @property
+    def state(self) -> State:
+        return self.latest
+
+    def play(self) -> None:
+        self._paused_view = False
+        self._submit("play")
+
+    def pause(self) -> None:
+        self._paused_view = True
+        self._submit("pause")
+
+    def reset(self, *, keep_params: bool = True) -> None:
+        if not keep_params:
+            self._params_view = Params()
+        self._paused_view = True
+        self._submit("reset", keep_params=keep_params)
+
+    def soft_reset(self) -> None:
+        self._submit("soft_reset")
+
+    def update_params(self, **kwargs) -> None:
+        kwargs = clamp_param_updates(kwargs, {"dt": self.sim.integrator.dt_range})
+        kwargs = changed_fields(self._params_view, kwargs)
+        if not kwargs:
+            return  # nothing changed (e.g. a slider released where it was)
+        self._params_view = replace(self._params_view, **kwargs)
+        self._submit("update_params", **kwargs)
+
+    def set_params(self, params: Params) -> None:
+        self._params_view = params
+        self._submit("set_params", params)
+
+    def baseline_params(self) -> Params:
+        return self.sim.baseline_params()
+
+    def fork(self, variants, duration_s: float, *, sample_interval_s: Optional[float] = None):
+        """
+        What-if preview from the latest published state, on the calling
+        thread (the worker keeps running). Variants given as field updates
+        apply on top of `params`, including changes still queued.
+        """
+        from .branch import fork
+        return fork(self.latest, self._params_view, variants, duration_s,
+                    sample_interval_s=sample_interval_s, integrator=self.sim.integrator)
@@ -0,0 +1,382 @@
+from __future__ import annotations
+
+import json
+import os
+import struct
+from dataclasses import asdict, fields
+from typing import BinaryIO, Iterator, Optional, Union
+
+import numpy as np
+
+from .state import Params, State, StateBuffer, STATE_FIELDS
+
+MAGIC = b"BFREC\x00\x01\x00"
+END_MAGIC = b"BFRECEND"
+_TRAILER = struct.Struct("<5Q8s")
+PARAM_NAMES: tuple[str, ...] = tuple(f.name for f in fields(Params))
+
+_EVENT = np.dtype([("t", "<f8"), ("row", "<i8"), ("field", "<u2"), ("_pad", "<u2", (3,)), ("value", "<f8")])
+
+# File layout (all little-endian):
+#
+#     magic(8) | header_len u32 | header JSON, space-padded so data is 8-aligned
+#     data     : n_chunks fixed-size chunks; a chunk stores chunk_rows values of
+#                each field, column after column (the last chunk is padded)
+#     footer   : chunk_t0 f8[n_chunks]           first t of every chunk
+#                events   _EVENT[n_events]        sorted by (field, row)
+#                offsets  i8[len(PARAM_NAMES)+1]  CSR: events of field j are
+#                                                 events[offsets[j]:offsets[j+1]]
+#                footer JSON (string table for non-numeric parameter values)
+#     trailer  : footer_offset, n_rows, n_chunks, n_events, footer_json_len, END_MAGIC
+#
+# The header carries the field list, column dtypes, chunk_rows and the Params
+# in force at row 0. Event row r means "applies from sample r onwards".
+# The footer JSON lists the first row of every segment: a new segment starts
+# wherever t goes backwards (reset, restore, seek), and t never decreases
+# inside one.
+
+
+class Recorder:
+    """
+    Streams simulation samples to a columnar binary recording.
+
+    Use as an orchestrator sink (sim.attach(rec) records every `every`-th
+    step plus every parameter change; sim.detach(rec) closes the file), or
+    drive it directly with begin()/append()/param_change()/close().
+    dtype "f4" halves the file size; t is always stored as float64.
+
+    When the sim rewinds (reset, restore, seek) or an appended t goes
+    backwards, the recorder starts a new segment, so each continuous
+    timeline stays searchable on its own (Recording.segments).
+    """
+
+    def __init__(
+        self,
+        target: Union[str, os.PathLike, BinaryIO],
+        *,
+        dtype: str = "f8",
+        chunk_rows: int = 4096,
+        every: int = 1,
+        fields: tuple[str, ...] = STATE_FIELDS,
+    ) -> None:
+        if dtype not in ("f4", "f8"):
+            raise ValueError("dtype must be 'f4' or 'f8'")
+        if chunk_rows <= 0 or every <= 0:
+            raise ValueError("chunk_rows and every must be positive")
+        if "t" not in fields:
+            raise ValueError("recordings need the 't' field")
+        self._own = not hasattr(target, "write")
+        self._f: BinaryIO = open(target, "wb") if self._own else target  # type: ignore[arg-type]
+        self.fields = tuple(fields)
+        self.dtypes = tuple("<f8" if name == "t" else "<" + dtype for name in self.fields)
+        self.chunk_rows = chunk_rows
+        self.every = every
+        self.rows = 0
+        self._block = np.zeros((len(self.fields), chunk_rows))
+        self._fill = 0
+        self._chunk_t0: list[float] = []
+        self._events: list[tuple[float, int, int, float]] = []
+        self._strings: list[str] = []
+        self._segments: list[int] = [0]
+        self._t_last = -np.inf
+        self._countdown = every
+        self._pos = 0
+        self._started = False
+        self._closed = False
+
+    def __enter__(self) -> "Recorder":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # --- Orchestrator sink protocol ---
+
+    def on_attach(self, sim) -> None:
+        self.begin(sim.params, sim.state)
+
+    def on_step(self, buf: StateBuffer) -> None:
+        self._countdown -= 1
+        if self._countdown == 0:
+            self._countdown = self.every
+            self.append(buf)
+
+    def on_params(self, t: float, changes: dict) -> None:
+        for name, value in changes.items():
+            self.param_change(t, name, value)
+
+    def on_reset(self, sim) -> None:
+        # The sim jumped to another timeline: open a segment at its new state
+        self.new_segment()
+        self._countdown = self.every
+        self.append(sim.state)
+
+    def on_detach(self, sim) -> None:
+        self.close()
+
+    # --- Writing ---
+
+    def begin(self, params: Params, state: Union[State, StateBuffer, None] = None) -> None:
+        """Write the header (initial params); optionally record `state` as row 0."""
+        if self._started:
+            raise RuntimeError("recording already started")
+        header = json.dumps({
+            "version": 1,
+            "fields": list(self.fields),
+            "dtypes": list(self.dtypes),
+            "chunk_rows": self.chunk_rows,
+            "params": asdict(params),
+        }).encode()
+        pad = (-(len(MAGIC) + 4 + len(header))) % 8
+        self._write(MAGIC + struct.pack("<I", len(header) + pad) + header + b" " * pad)
+        self._started = True
+        if state is not None:
+            self.append(state)
+
+    def new_segment(self) -> None:
+        """Start a new timeline segment at the next appended sample."""
+        if self.rows > self._segments[-1]:
+            self._segments.append(self.rows)
+        self._t_last = -np.inf
+
+    def append(self, s: Union[State, StateBuffer]) -> None:
+        if not self._started:
+            raise RuntimeError("call begin() first")
+        if s.t < self._t_last:
+            self.new_segment()
+        if self.rows == self._segments[-1]:
+            # Changes made on the way into this segment apply from its start
+            for k in range(len(self._events) - 1, -1, -1):
+                t, row, field, value = self._events[k]
+                if row != self.rows:
+                    break
+                self._events[k] = (min(t, s.t), row, field, value)
+        self._t_last = s.t
+        i = self._fill
+        self._block[:, i] = [getattr(s, name) for name in self.fields]
+        if i == 0:
+            self._chunk_t0.append(s.t)
+        self._fill = i + 1
+        self.rows += 1
+        if self._fill == self.chunk_rows:
+            self._flush_chunk()
+
+    def param_change(self, t: float, name: str, value) -> None:
+        """Record `name` = value, effective from the next appended sample."""
+        j = PARAM_NAMES.index(name)
+        if isinstance(value, str):
+            if value not in self._strings:
+                self._strings.append(value)
+            value = float(self._strings.index(value))
+        self._events.append((float(t), self.rows, j, float(value)))
+
+    def _write(self, data: bytes) -> None:
+        self._f.write(data)
+        self._pos += len(data)
+
+    def _flush_chunk(self) -> None:
+        self._block[:, self._fill:] = 0.0
+        self._write(b"".join(
+            self._block[k].astype(dt).tobytes() for k, dt in enumerate(self.dtypes)))
+        self._fill = 0
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        if not self._started:
+            raise RuntimeError("nothing recorded: begin() was never called")
+        if self._fill:
+            self._flush_chunk()
+        if len(self._segments) > 1 and self._segments[-1] == self.rows:
+            self._segments.pop()    # opened, but nothing was appended
+        footer_offset = self._pos
+
+        ev = np.zeros(len(self._events), dtype=_EVENT)
+        if self._events:
+            t, row, field, value = zip(*self._events)
+            ev["t"], ev["row"], ev["field"], ev["value"] = t, row, field, value
+            ev = ev[np.lexsort((ev["row"], ev["field"]))]
+        offsets = np.searchsorted(ev["field"], np.arange(len(PARAM_NAMES) + 1)).astype("<i8")
+        extra = json.dumps({"strings": self._strings, "param_names": list(PARAM_NAMES),
+                            "segments": self._segments}).encode()
+
+        self._write(np.asarray(self._chunk_t0, dtype="<f8").tobytes())
+        self._write(ev.tobytes())
+        self._write(offsets.tobytes())
+        self._write(extra)
+        self._write(_TRAILER.pack(footer_offset, self.rows, len(self._chunk_t0),
+                                  len(ev), len(extra), END_MAGIC))
+        self._f.flush()
+        if self._own:
+            self._f.close()
+        self._closed = True
+
+
+class Recording:
+    """
+    Read-only, memory-mapped view of a Recorder file.
+
+    Only the chunks a query touches are paged in, so hours of samples can
+    be scrubbed without loading them. Time lookups bisect the per-chunk
+    start times and then one chunk (O(log n)); parameter events are indexed
+    per field, so last_change() is a bisection too.
+
+    A recording that spans resets holds several timelines; `segments` lists
+    their row ranges. Time lookups search one segment, the last (the run as
+    it ended) unless `segment` says otherwise.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]) -> None:
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a bioflow recording")
+            (hlen,) = struct.unpack("<I", f.read(4))
+            header = json.loads(f.read(hlen))
+            f.seek(-_TRAILER.size, os.SEEK_END)
+            footer_offset, n_rows, n_chunks, n_events, extra_len, end = _TRAILER.unpack(f.read(_TRAILER.size))
+        if end != END_MAGIC:
+            raise ValueError(f"{path} is truncated (recorder not closed?)")
+
+        self.fields: tuple[str, ...] = tuple(header["fields"])
+        self.chunk_rows: int = header["chunk_rows"]
+        self.initial_params = Params(**header["params"])
+        self.n_rows = n_rows
+        self._col = {name: i for i, name in enumerate(self.fields)}
+
+        data_start = len(MAGIC) + 4 + hlen
+        chunk_dtype = np.dtype([(name, dt, (self.chunk_rows,)) for name, dt in zip(self.fields, header["dtypes"])])
+        self._chunks = np.memmap(path, dtype=chunk_dtype, mode="r", offset=data_start, shape=(n_chunks,)) \
+            if n_chunks else np.zeros(0, dtype=chunk_dtype)
+
+        off = footer_offset
+        self.chunk_t0 = np.fromfile(path, dtype="<f8", count=n_chunks, offset=off)
+        off += 8 * n_chunks
+        self._events = np.fromfile(path, dtype=_EVENT, count=n_events, offset=off)
+        off += _EVENT.itemsize * n_events
+        self._offsets = np.fromfile(path, dtype="<i8", count=len(PARAM_NAMES) + 1, offset=off)
+        off += 8 * (len(PARAM_NAMES) + 1)
+        with open(path, "rb") as f:
+            f.seek(off)
+            extra = json.loads(f.read(extra_len))
+        self._strings: list[str] = extra["strings"]
+        self._names: list[str] = extra["param_names"]
+        starts = extra.get("segments", [0])
+        self.segments: list[tuple[int, int]] = list(zip(starts, starts[1:] + [n_rows]))
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def __enter__(self) -> "Recording":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        # Drop our reference; the mapping goes away once no returned view uses it
+        self._chunks = np.zeros(0, dtype=self._chunks.dtype)
+
+    # --- Samples ---
+
+    def column(self, name: str, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """Rows [start, stop) of one field, reading only the chunks involved."""
+        start, stop, _ = slice(start, stop).indices(self.n_rows)
+        if stop <= start:
+            return np.empty(0)
+        cr = self.chunk_rows
+        c0, c1 = start // cr, (stop - 1) // cr + 1
+        block = np.asarray(self._chunks[name][c0:c1]).reshape(-1)
+        return block[start - c0 * cr: stop - c0 * cr].astype(float)
+
+    def columns(self, start: int = 0, stop: Optional[int] = None) -> dict[str, np.ndarray]:
+        return {name: self.column(name, start, stop) for name in self.fields}
+
+    def row(self, i: int) -> dict[str, float]:
+        if not -self.n_rows <= i < self.n_rows:
+            raise IndexError(i)
+        i %= self.n_rows
+        c, k = divmod(i, self.chunk_rows)
+        rec = self._chunks[c]
+        return {name: float(rec[name][k]) for name in self.fields}
+
+    def state(self, i: int) -> State:
+        """Sample i as a State (fields not recorded keep their defaults)."""
+        return State(**{k: v for k, v in self.row(i).items() if k in STATE_FIELDS})
+
+    def index_at(self, t: float, segment: int = -1) -> int:
+        """Index of the last sample with time <= t in a segment (its first if t precedes it)."""
+        if self.n_rows == 0:
+            raise IndexError("empty recording")
+        r0, r1 = self.segments[segment]
+        cr = self.chunk_rows
+        c0, c1 = r0 // cr, (r1 - 1) // cr
+        # Chunks after c0 start inside the segment, so their t0 are in order
+        c = c0 + int(np.searchsorted(self.chunk_t0[c0 + 1:c1 + 1], t, side="right"))
+        lo, hi = max(r0, c * cr), min(r1, (c + 1) * cr)
+        ts = np.asarray(self._chunks[c]["t"][lo - c * cr:hi - c * cr])
+        k = max(int(np.searchsorted(ts, t, side="right")) - 1, 0)
+        return lo + k
+
+    def state_at(self, t: float, segment: int = -1) -> State:
+        return self.state(self.index_at(t, segment))
+
+    def iter_blocks(self, start_t: float = -np.inf, stop_t: float = np.inf,
+                    rows: Optional[int] = None, segment: int = -1) -> Iterator[dict[str, np.ndarray]]:
+        """Replay [start_t, stop_t] of a segment as dicts of column blocks (default: one chunk each)."""
+        if self.n_rows == 0:
+            return
+        rows = rows or self.chunk_rows
+        i = self.index_at(start_t, segment)
+        if self.row(i)["t"] < start_t:
+            i += 1
+        end = self.index_at(stop_t, segment) + 1
+        while i < end:
+            j = min(i + rows, end)
+            yield self.columns(i, j)
+            i = j
+
+    # --- Parameter events ---
+
+    def _value(self, name: str, v: float):
+        if isinstance(getattr(self.initial_params, name), str):
+            return self._strings[int(v)]
+        if isinstance(getattr(self.initial_params, name), int):
+            return int(v)
+        return float(v)
+
+    def _field_events(self, name: str) -> np.ndarray:
+        j = self._names.index(name)
+        return self._events[self._offsets[j]:self._offsets[j + 1]]
+
+    def events(self, name: Optional[str] = None) -> list[tuple[float, int, str, object]]:
+        """Parameter changes as (t, row, field, value), in recording order."""
+        ev = self._events if name is None else self._field_events(name)
+        ev = ev[np.argsort(ev["row"], kind="stable")] if name is None else ev
+        return [(float(e["t"]), int(e["row"]), self._names[e["field"]],
+                 self._value(self._names[e["field"]], e["value"])) for e in ev]
+
+    def last_change(self, name: str, before_t: float = np.inf,
+                    segment: int = -1) -> Optional[tuple[float, object]]:
+        """(t, value) of the last change of `name` at or before before_t within a segment, or None."""
+        ev = self._field_events(name)
+        r0, r1 = self.segments[segment]
+        lo = int(np.searchsorted(ev["row"], r0, side="left"))
+        hi = len(ev) if r1 == self.n_rows else int(np.searchsorted(ev["row"], r1, side="left"))
+        ev = ev[lo:hi]
+        k = int(np.searchsorted(ev["t"], before_t, side="right"))
+        if k == 0:
+            return None
+        return float(ev["t"][k - 1]), self._value(name, ev["value"][k - 1])
+
+    def params_at_row(self, i: int) -> Params:
+        """Params in force for sample i."""
+        values = asdict(self.initial_params)
+        for name in self._names:
+            ev = self._field_events(name)
+            k = int(np.searchsorted(ev["row"], i, side="right"))
+            if k:
+                values[name] = self._value(name, ev["value"][k - 1])
+        return Params(**values)
+
+    def params_at(self, t: float, segment: int = -1) -> Params:
+        return self.params_at_row(self.index_at(t, segment))
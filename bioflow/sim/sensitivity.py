@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import Optional, Sequence
+
+import numpy as np
+
+from .state import Params, MODEL_LIMITS
+from .steady import solve_periodic_batch
+
+# Physiological Params fields (dt and the pump-table settings are numerics)
+SENSITIVITY_FIELDS: tuple[str, ...] = (
+    "total_volume_ml", "V0_art_ml", "V0_ven_ml", "V0_pool_ml",
+    "arterial_compliance", "venous_compliance", "pool_compliance",
+    "peripheral_resistance", "resistance_nonlinearity",
+    "hr_bpm", "stroke_volume_ml", "systole_fraction",
+    "venous_pooling_target", "pooling_tau_s",
+)
+
+
+@dataclass(frozen=True)
+class Sensitivity:
+    """
+    Steady-state sensitivities of the PeriodicSolution metrics to Params fields.
+
+    jacobian[i, j] is d metrics[i] / d fields[j]; normalized[i, j] is the
+    elasticity (dY/Y) / (dp/p), i.e. the % change of the metric per 1 %
+    change of the field (NaN where the field or metric is 0).
+    """
+    params: Params
+    fields: tuple[str, ...]
+    metrics: tuple[str, ...]
+    base: dict[str, float]
+    jacobian: np.ndarray
+    normalized: np.ndarray
+    converged: bool             # every perturbed steady state converged
+
+    def of(self, metric: str, field: str, *, normalized: bool = True) -> float:
+        m = self.normalized if normalized else self.jacobian
+        return float(m[self.metrics.index(metric), self.fields.index(field)])
+
+    def ranked(self, metric: str) -> list[tuple[str, float]]:
+        """(field, elasticity) pairs for one metric, largest |elasticity| first."""
+        row = self.normalized[self.metrics.index(metric)]
+        order = np.argsort(-np.nan_to_num(np.abs(row), nan=-1.0), kind="stable")
+        return [(self.fields[j], float(row[j])) for j in order]
+
+
+def sensitivity(
+    params: Optional[Params] = None,
+    fields: Sequence[str] = SENSITIVITY_FIELDS,
+    *,
+    rel_step: float = 1e-3,
+    tol_ml: float = 1e-9,
+) -> Sensitivity:
+    """
+    Finite-difference sensitivities of the periodic steady state for every
+    field at once.
+
+    Each field is stepped by rel_step * |value| (rel_step itself for a zero
+    value), both ways when the model's limits allow (central difference),
+    otherwise one way against the unperturbed point. The base point and all
+    perturbed copies are solved together as the lanes of one
+    solve_periodic_batch call, so the whole matrix costs one batched Newton
+    solve rather than one per field.
+    """
+    base = params or Params()
+    fields = tuple(fields)
+    for name in fields:
+        if not isinstance(getattr(base, name, None), float):
+            raise TypeError(f"not a float Params field: {name!r}")
+
+    lanes = [base]
+    plus, minus, steps = [], [], []
+    for name in fields:
+        v = getattr(base, name)
+        h = rel_step * abs(v) if v != 0.0 else rel_step
+        lo, hi = MODEL_LIMITS.get(name, (-np.inf, np.inf))   # step where the field has an effect
+        up, down = v + h <= hi, v - h >= lo
+        plus.append(len(lanes) if up else 0)
+        if up:
+            lanes.append(replace(base, **{name: v + h}))
+        minus.append(len(lanes) if down else 0)
+        if down:
+            lanes.append(replace(base, **{name: v - h}))
+        steps.append(h * (up + down))
+
+    sols = solve_periodic_batch(lanes, tol_ml=tol_ml)
+    names = tuple(sols[0].metrics)
+    values = np.array([[s.metrics[k] for k in names] for s in sols])   # lanes x metrics
+
+    p = np.array([getattr(base, name) for name in fields])
+    y = values[0]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        jac = (values[plus] - values[minus]).T / np.array(steps)
+        norm = jac * p[None, :] / y[:, None]
+    norm[~np.isfinite(norm)] = np.nan
+    norm[:, p == 0.0] = np.nan
+
+    return Sensitivity(
+        params=base,
+        fields=fields,
+        metrics=names,
+        base=dict(zip(names, y.tolist())),
+        jacobian=jac,
+        normalized=norm,
+        converged=all(s.converged for s in sols),
+    )
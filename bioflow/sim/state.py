@@ -1,9 +1,20 @@
 from __future__ import annotations
-from dataclasses import dataclass
+import itertools
+from dataclasses import dataclass, fields
+from typing import Optional
 
+_revisions = itertools.count(1)
 
-@dataclass
+
+@dataclass(frozen=True)
 class Params:
+    """
+    Immutable, hashable parameter set; change it with dataclasses.replace.
+
+    Every instance gets a process-wide revision number (not a field: it is
+    left out of ==, hash, asdict and pickling), so caches such as
+    compiled.compiled() can tell parameter sets apart cheaply.
+    """
     dt: float = 0.01
     total_volume_ml: float = 5000.0
 
@@ -25,6 +36,9 @@ class Params:
     hr_bpm: float = 70.0
     stroke_volume_ml: float = 70.0
     systole_fraction: float = 0.35
+    # Pump waveform: 0 = exact half-sine, N > 0 = PumpTable with N intervals
+    pump_table_size: int = 0
+    pump_interp: str = "linear"       # "linear" | "cubic" (tabulated mode only)
 
     # Pooling
     # fraction of TOTAL blood that wants to sit in pool (0..0.6)
@@ -32,6 +46,17 @@ class Params:
     # seconds (how fast pooling equilibrates)
     pooling_tau_s: float = 6.0
 
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_revision", next(_revisions))
+
+    @property
+    def revision(self) -> int:
+        return self._revision
+
+    def __reduce__(self):
+        # Rebuild from the fields: fresh revision, no cached derived constants
+        return (type(self), tuple(getattr(self, f.name) for f in fields(self)))
+
 
 @dataclass
 class State:
@@ -48,3 +73,83 @@ class State:
     Q_periph_ml_s: float = 0.0
     Q_pump_ml_s: float = 0.0
     Q_pool_ml_s: float = 0.0  # ven <-> pool exchange (+ means ven->pool)
+
+
+# Field order used by array-backed consumers (batch engine, history, files)
+STATE_FIELDS: tuple[str, ...] = tuple(f.name for f in fields(State))
+
+# Stability ranges enforced by SimOrchestrator.update_params (single source of truth)
+PARAM_LIMITS: dict[str, tuple[float, float]] = {
+    "dt": (0.001, 0.05),
+    "peripheral_resistance": (0.05, 20.0),
+    "arterial_compliance": (0.1, 20.0),
+    "venous_pooling_target": (0.0, 0.6),
+    "hr_bpm": (20.0, 250.0),
+    "stroke_volume_ml": (0.0, 400.0),
+}
+
+# PARAM_LIMITS plus the model's internal clamps (heart.py): the range over
+# which each field still has an effect
+MODEL_LIMITS: dict[str, tuple[float, float]] = {
+    **PARAM_LIMITS,
+    "systole_fraction": (0.10, 0.70),
+}
+
+
+def clamp_param_updates(updates: dict, limits: Optional[dict] = None) -> dict:
+    """
+    Returns a copy of `updates` with every field in PARAM_LIMITS clamped to its range.
+    `limits` overrides individual ranges (e.g. the dt range of a non-Euler integrator).
+    """
+    out = dict(updates)
+    table = PARAM_LIMITS if not limits else {**PARAM_LIMITS, **limits}
+    for name, (lo, hi) in table.items():
+        if name in out:
+            out[name] = max(lo, min(hi, float(out[name])))
+    return out
+
+
+_MISSING = object()
+
+
+def changed_fields(params: Params, updates: dict) -> dict:
+    """The entries of `updates` that differ from params (unknown names count as changes)."""
+    return {k: v for k, v in updates.items() if getattr(params, k, _MISSING) != v}
+
+
+class StateBuffer:
+    """
+    Mutable, slot-based twin of State for in-place stepping (engine.step_into).
+    Holds the same fields; snapshot() hands out an immutable-by-convention State.
+    """
+
+    __slots__ = STATE_FIELDS
+
+    def __init__(self, state: Optional[State] = None) -> None:
+        self.load(state if state is not None else State())
+
+    def load(self, s: State) -> None:
+        self.t = s.t
+        self.V_art_ml = s.V_art_ml
+        self.V_ven_ml = s.V_ven_ml
+        self.V_pool_ml = s.V_pool_ml
+        self.P_art_mmHg = s.P_art_mmHg
+        self.P_ven_mmHg = s.P_ven_mmHg
+        self.P_pool_mmHg = s.P_pool_mmHg
+        self.Q_periph_ml_s = s.Q_periph_ml_s
+        self.Q_pump_ml_s = s.Q_pump_ml_s
+        self.Q_pool_ml_s = s.Q_pool_ml_s
+
+    def snapshot(self) -> State:
+        return State(
+            t=self.t,
+            V_art_ml=self.V_art_ml,
+            V_ven_ml=self.V_ven_ml,
+            V_pool_ml=self.V_pool_ml,
+            P_art_mmHg=self.P_art_mmHg,
+            P_ven_mmHg=self.P_ven_mmHg,
+            P_pool_mmHg=self.P_pool_mmHg,
+            Q_periph_ml_s=self.Q_periph_ml_s,
+            Q_pump_ml_s=self.Q_pump_ml_s,
+            Q_pool_ml_s=self.Q_pool_ml_s,
+        )
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, replace
+from typing import Optional, Sequence
+
+import numpy as np
+
+from .state import State, Params, STATE_FIELDS
+from .heart import clamp
+from .batch import BatchEngine
+
+
+@dataclass(frozen=True)
+class PeriodicSolution:
+    """
+    Converged one-beat limit cycle for one parameter set.
+
+    waveform maps every State field to steps_per_beat + 1 samples spanning
+    exactly one beat (first and last sample are the same point of the cycle,
+    up to the residual). Beat-start state is `initial`.
+    """
+    params: Params
+    converged: bool
+    iterations: int
+    beats: int                  # beats simulated for this lane (incl. Jacobian probes)
+    residual_ml: float          # max |F(x) - x| of the beat map at exit
+    dt: float                   # effective step: period / steps_per_beat
+    steps_per_beat: int
+    waveform: dict[str, np.ndarray]
+
+    @property
+    def initial(self) -> State:
+        return State(**{name: float(a[0]) for name, a in self.waveform.items()})
+
+    @property
+    def metrics(self) -> dict[str, float]:
+        w = {name: a[:-1] for name, a in self.waveform.items()}  # one full period
+        return {
+            "P_art_mean": float(np.mean(w["P_art_mmHg"])),
+            "P_art_sys": float(np.max(w["P_art_mmHg"])),
+            "P_art_dia": float(np.min(w["P_art_mmHg"])),
+            "P_ven_mean": float(np.mean(w["P_ven_mmHg"])),
+            "Q_periph_mean": float(np.mean(w["Q_periph_ml_s"])),
+            "cardiac_output_l_min": float(np.mean(w["Q_pump_ml_s"]) * 60.0 / 1000.0),
+            "V_pool_mean": float(np.mean(w["V_pool_ml"])),
+        }
+
+
+def beat_period_s(p: Params) -> float:
+    return 60.0 / clamp(p.hr_bpm, 20.0, 250.0)
+
+
+def solve_periodic(
+    params: Params,
+    initial: Optional[State] = None,
+    **kwargs,
+) -> PeriodicSolution:
+    """Single-lane solve_periodic_batch."""
+    return solve_periodic_batch([params], None if initial is None else [initial], **kwargs)[0]
+
+
+def solve_periodic_batch(
+    params: Sequence[Params],
+    initial: Optional[Sequence[State]] = None,
+    *,
+    tol_ml: float = 1e-6,
+    max_iter: int = 30,
+    probe_ml: float = 1e-2,
+) -> list[PeriodicSolution]:
+    """
+    Periodic steady state for each parameter set, without simulating transients.
+
+    The unknowns are the beat-start volumes x = (V_art, V_pool) (V_ven follows
+    from conservation). F(x) = volumes after one simulated beat starting at
+    t=0. Newton iterations solve F(x) = x, with a forward-difference Jacobian
+    from two probe lanes, so every iteration is a single BatchEngine run of
+    3*N lanes over one beat.
+
+    To make the beat map exact, each lane steps with dt_eff = period / m, where
+    m = max over lanes of ceil(period / dt) (never coarser than the requested dt).
+    Initial guesses default to the orchestrator's starting split; pass a previous
+    solution's `initial` states for warm starts.
+    """
+    params = list(params)
+    n = len(params)
+    periods = np.array([beat_period_s(p) for p in params])
+    m = max(int(math.ceil(per / p.dt - 1e-9)) for per, p in zip(periods, params))
+    lane_params = [replace(p, dt=float(per / m)) for p, per in zip(params, periods)]
+
+    if initial is None:
+        from .orchestrator import SimOrchestrator
+        initial = [SimOrchestrator._default_initial(p) for p in params]
+    total = np.array([p.total_volume_ml for p in params])
+    x_art = np.array([s.V_art_ml for s in initial], dtype=float)
+    x_pool = np.array([s.V_pool_ml for s in initial], dtype=float)
+
+    engine = BatchEngine(lane_params * 3)
+    h = probe_ml * np.ones(n)
+
+    def beat_map(a: np.ndarray, pl: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        s = engine.s
+        s["t"] = np.zeros(3 * n)
+        s["V_art_ml"] = a
+        s["V_pool_ml"] = pl
+        s["V_ven_ml"] = np.tile(total, 3) - a - pl
+        engine.compute_derived()
+        engine.step(m)
+        return s["V_art_ml"].copy(), s["V_pool_ml"].copy()
+
+    converged = np.zeros(n, dtype=bool)
+    residual = np.full(n, np.inf)
+    iterations = np.zeros(n, dtype=int)
+    it = 0
+    for it in range(1, max_iter + 1):
+        # Probe downward when a volume sits at the upper clamp edge
+        ha = np.where(x_art + h <= total, h, -h)
+        hp = np.where(x_pool + h <= total, h, -h)
+        a_in = np.concatenate([x_art, x_art + ha, x_art])
+        p_in = np.concatenate([x_pool, x_pool, x_pool + hp])
+        Fa, Fp = beat_map(a_in, p_in)
+
+        ra = Fa[:n] - x_art
+        rp = Fp[:n] - x_pool
+        res = np.maximum(np.abs(ra), np.abs(rp))
+
+        active = ~converged
+        iterations[active] = it
+        residual[active] = res[active]
+        converged |= res < tol_ml
+        if converged.all():
+            break
+
+        # Jacobian of G(x) = F(x) - x
+        j11 = (Fa[n:2 * n] - Fa[:n]) / ha - 1.0
+        j21 = (Fp[n:2 * n] - Fp[:n]) / ha
+        j12 = (Fa[2 * n:] - Fa[:n]) / hp
+        j22 = (Fp[2 * n:] - Fp[:n]) / hp - 1.0
+        det = j11 * j22 - j12 * j21
+
+        ok = np.abs(det) > 1e-12
+        safe = np.where(ok, det, 1.0)
+        da = np.where(ok, -(j22 * ra - j12 * rp) / safe, ra)   # fall back to x <- F(x)
+        dp = np.where(ok, -(-j21 * ra + j11 * rp) / safe, rp)
+
+        upd = ~converged
+        x_art = np.where(upd, np.clip(x_art + da, 0.0, total), x_art)
+        x_pool = np.where(upd, np.clip(x_pool + dp, 0.0, total - x_art), x_pool)
+
+    # One more beat on the converged lanes, recorded every step
+    engine = BatchEngine(lane_params)
+    s = engine.s
+    s["t"] = np.zeros(n)
+    s["V_art_ml"] = x_art.copy()
+    s["V_pool_ml"] = x_pool.copy()
+    s["V_ven_ml"] = total - x_art - x_pool
+    engine.compute_derived()
+    rows = {name: np.empty((n, m + 1)) for name in STATE_FIELDS}
+    for j in range(m + 1):
+        if j:
+            engine.step(1)
+        for name in STATE_FIELDS:
+            rows[name][:, j] = s[name]
+
+    return [
+        PeriodicSolution(
+            params=params[i],
+            converged=bool(converged[i]),
+            iterations=int(iterations[i]),
+            beats=int(3 * iterations[i] + 1),
+            residual_ml=float(residual[i]),
+            dt=lane_params[i].dt,
+            steps_per_beat=m,
+            waveform={name: rows[name][i] for name in STATE_FIELDS},
+        )
+        for i in range(n)
+    ]
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from typing import Callable, Optional, Sequence, Union
+
+import numpy as np
+
+from .batch import BatchEngine
+from .state import STATE_FIELDS
+from .validate import assess_array, NON_FINITE
+
+
+class LaneMonitor:
+    """
+    Per-lane watcher for run_until. Monitors keep per-lane arrays, so they
+    are told when lanes are dropped (compact). check() runs every
+    check_every steps and returns a stop mask (or None); monitors that set
+    per_step also see every step through observe(). finish() sees lanes
+    (mask over the active set, original indices idx) just before they leave.
+    """
+
+    name = "monitor"
+    per_step = False
+
+    def reset(self, engine: BatchEngine) -> None:
+        pass
+
+    def observe(self, engine: BatchEngine, step: int) -> None:
+        pass
+
+    def check(self, engine: BatchEngine) -> Optional[np.ndarray]:
+        return None
+
+    def finish(self, engine: BatchEngine, mask: np.ndarray, idx: np.ndarray, step: int) -> None:
+        pass
+
+    def compact(self, keep: np.ndarray) -> None:
+        pass
+
+    def describe(self) -> dict:
+        """JSON-able identity of the rule (name plus scalar settings), for sweep manifests."""
+        config = {k: v for k, v in vars(self).items() if isinstance(v, (bool, int, float, str))}
+        return {"name": self.name, **config}
+
+
+class NonFinite(LaneMonitor):
+    """Any NaN/inf in the state or dt/total volume (validate's first rule)."""
+
+    name = "non_finite"
+
+    def check(self, engine: BatchEngine) -> np.ndarray:
+        return assess_array(engine.s, engine.p).code == NON_FINITE
+
+
+class Drift(LaneMonitor):
+    """Total volume off total_volume_ml by more than tol_ml."""
+
+    name = "drift"
+
+    def __init__(self, tol_ml: float = 1e-3) -> None:
+        self.tol_ml = tol_ml
+
+    def check(self, engine: BatchEngine) -> np.ndarray:
+        s = engine.s
+        total = s["V_art_ml"] + s["V_ven_ml"] + s["V_pool_ml"]
+        with np.errstate(invalid="ignore"):
+            return ~(np.abs(total - engine.p["total_volume_ml"]) <= self.tol_ml)
+
+
+class ClampEdge(LaneMonitor):
+    """A compartment pinned at the step's clamp edge (empty or holding everything)."""
+
+    name = "clamp"
+
+    def check(self, engine: BatchEngine) -> np.ndarray:
+        s, total = engine.s, engine.p["total_volume_ml"]
+        hit = np.zeros(engine.n, dtype=bool)
+        for name in ("V_art_ml", "V_ven_ml", "V_pool_ml"):
+            hit |= (s[name] <= 0.0) | (s[name] >= total)
+        return hit
+
+
+class Steady(LaneMonitor):
+    """
+    Periodic steady state: the beat-mean of `signal` changed by less than tol
+    for `beats` consecutive beats. Beat means integrate every step with the
+    trapezoid rule, splitting the step that straddles a beat boundary, so
+    they don't jitter with the boundary's phase against dt.
+    """
+
+    name = "steady"
+    per_step = True
+
+    def __init__(self, tol: float = 0.05, beats: int = 3, signal: str = "P_art_mmHg") -> None:
+        self.tol = tol
+        self.beats = beats
+        self.signal = signal
+
+    def reset(self, engine: BatchEngine) -> None:
+        s, n = engine.s, engine.n
+        self.period = 60.0 / np.clip(engine.p["hr_bpm"], 20.0, 250.0)
+        self.beat = np.floor(s["t"] / self.period)
+        self.prev_y = s[self.signal].copy()
+        self.prev_t = s["t"].copy()
+        self.acc = np.zeros(n)
+        self.last_mean = np.full(n, np.nan)
+        self.calm = np.zeros(n, dtype=int)
+
+    def observe(self, engine: BatchEngine, step: int) -> None:
+        s = engine.s
+        y, t = s[self.signal], s["t"]
+        b = np.floor(t / self.period)
+        area = 0.5 * (y + self.prev_y) * (t - self.prev_t)
+        new = b > self.beat
+        if new.any():
+            f = np.where(new, (b * self.period - self.prev_t) / np.maximum(t - self.prev_t, 1e-300), 1.0)
+            done = self.acc + area * f
+            mean = done / self.period
+            with np.errstate(invalid="ignore"):
+                calm = np.abs(mean - self.last_mean) < self.tol
+            self.calm = np.where(new, np.where(calm, self.calm + 1, 0), self.calm)
+            self.last_mean = np.where(new, mean, self.last_mean)
+            self.acc = np.where(new, area * (1.0 - f), self.acc + area)
+        else:
+            self.acc += area
+        self.beat = b
+        self.prev_y = y
+        self.prev_t = t
+
+    def check(self, engine: BatchEngine) -> np.ndarray:
+        return self.calm >= self.beats
+
+    def compact(self, keep: np.ndarray) -> None:
+        for name in ("period", "beat", "prev_y", "prev_t", "acc", "last_mean", "calm"):
+            setattr(self, name, getattr(self, name)[keep])
+
+
+class Predicate(LaneMonitor):
+    """
+    User rule: fn(s, p) -> stop mask over the active lanes (BatchEngine.s/.p).
+
+    describe() fingerprints fn by qualname and a hash of its code, constants,
+    defaults and closure values, so resuming a sharded sweep after editing
+    the rule is refused. Multi-process sweeps pickle fn: use a module-level
+    function there (lambdas and local functions only run with workers <= 1).
+    """
+
+    def __init__(self, name: str, fn: Callable[[dict, dict], np.ndarray]) -> None:
+        self.name = name
+        self.fn = fn
+
+    def check(self, engine: BatchEngine) -> np.ndarray:
+        return np.asarray(self.fn(engine.s, engine.p), dtype=bool)
+
+    def describe(self) -> dict:
+        fn = self.fn
+        qualname = f"{getattr(fn, '__module__', None)}.{getattr(fn, '__qualname__', type(fn).__qualname__)}"
+        h = hashlib.sha256()
+        code = getattr(fn, "__code__", None)
+        if code is not None:
+            _hash_code(h, code)
+            h.update(repr(fn.__defaults__).encode())
+            for cell in fn.__closure__ or ():
+                h.update(repr(cell.cell_contents).encode())
+        else:
+            h.update(repr(fn).encode())
+        return {**super().describe(), "fn": f"{qualname}:{h.hexdigest()[:16]}"}
+
+
+def _hash_code(h, code) -> None:
+    h.update(code.co_code)
+    h.update(repr(code.co_names).encode())
+    for c in code.co_consts:
+        if hasattr(c, "co_code"):
+            _hash_code(h, c)        # nested function/lambda (its repr has an address)
+        else:
+            h.update(repr(c).encode())
+
+
+@dataclass(frozen=True)
+class RunReport:
+    """Why and when each lane stopped ("completed" = ran all its steps)."""
+    reason: np.ndarray              # str per lane
+    stop_step: np.ndarray           # steps taken by the lane
+    stop_t: np.ndarray
+    final: dict[str, np.ndarray]    # state at stop, per field
+    lane_steps: int                 # total lane-steps simulated (work done)
+
+
+def run_until(
+    engine: BatchEngine,
+    steps: Union[int, np.ndarray],
+    stop: Sequence[LaneMonitor] = (),
+    *,
+    check_every: int = 50,
+    observers: Sequence[LaneMonitor] = (),
+) -> RunReport:
+    """
+    Step every lane up to `steps` (scalar or per lane), checking the stop
+    conditions every check_every steps (first matching condition names the
+    reason). Stopped and completed lanes are compacted out of the engine, so
+    the remaining work shrinks; on return the engine holds no lanes.
+    Observers watch like stop conditions but never stop a lane.
+    """
+    if check_every <= 0:
+        raise ValueError("check_every must be positive")
+    n = engine.n
+    target = np.broadcast_to(np.asarray(steps, dtype=int), (n,)).copy()
+    reason = np.full(n, "completed", dtype=object)
+    stop_step = np.zeros(n, dtype=int)
+    final = {name: np.full(n, np.nan) for name in STATE_FIELDS}
+
+    monitors = list(stop) + list(observers)
+    for m in monitors:
+        m.reset(engine)
+    watch_steps = [m for m in monitors if m.per_step]
+
+    lanes = np.arange(n)            # original index of each active lane
+    done = 0
+    work = 0
+    until_check = check_every
+
+    def retire(mask: np.ndarray, why: Optional[str]) -> None:
+        nonlocal lanes, target
+        idx = lanes[mask]
+        if why is not None:
+            reason[idx] = why
+        stop_step[idx] = done
+        for name in STATE_FIELDS:
+            final[name][idx] = engine.s[name][mask]
+        for m in monitors:
+            m.finish(engine, mask, idx, done)
+        keep = np.flatnonzero(~mask)
+        engine.compact(keep)
+        for m in monitors:
+            m.compact(keep)
+        lanes, target = lanes[keep], target[keep]
+
+    while len(lanes):
+        k = min(until_check, int(target.min()) - done)
+        if k > 0:
+            if watch_steps:
+                for _ in range(k):
+                    engine.step(1)
+                    done += 1
+                    for m in watch_steps:
+                        m.observe(engine, done)
+            else:
+                engine.step(k)
+                done += k
+            work += k * len(lanes)
+            until_check -= k
+
+        finished = target <= done
+        if finished.any():
+            retire(finished, None)
+        if until_check == 0:
+            until_check = check_every
+            for m in stop:
+                if not len(lanes):
+                    break
+                hit = m.check(engine)
+                if hit is not None and hit.any():
+                    retire(hit, m.name)
+
+    return RunReport(reason.astype(str), stop_step, final["t"].copy(), final, work)
@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import hashlib
+import itertools
+import json
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, replace
+from typing import Callable, Optional, Sequence, Union
+
+import numpy as np
+
+from .batch import BatchEngine, PARAM_FIELDS
+from .state import Params, clamp_param_updates
+from .stopping import LaneMonitor, run_until
+from .validate import assess_array
+
+METRICS: tuple[str, ...] = (
+    "P_art_mean", "P_art_sys", "P_art_dia", "P_ven_mean",
+    "Q_periph_mean", "cardiac_output_l_min", "V_pool_mean",
+)
+
+# Distribution spec for monte_carlo: (lo, hi) uniform, or rng, n -> samples
+Dist = Union[tuple[float, float], Callable[[np.random.Generator, int], np.ndarray]]
+
+
+@dataclass(frozen=True)
+class Sweep:
+    """A list of parameter sets plus the varied values, laid out as `shape`."""
+    params: list[Params]
+    axes: dict[str, np.ndarray]     # varied field -> value per point (flat)
+    shape: tuple[int, ...]
+
+    def __len__(self) -> int:
+        return len(self.params)
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    """
+    Summary metrics per sweep point, every array shaped like the sweep.
+
+    metrics holds the METRICS averaged (or max/min) over the measurement
+    window; level/ok are validate.assess on the final state. stop_reason is
+    "completed" or the name of the stop condition that ended the run, at
+    simulated time stop_t.
+    """
+    axes: dict[str, np.ndarray]
+    metrics: dict[str, np.ndarray]
+    level: np.ndarray               # "OK" | "WARN"
+    ok: np.ndarray                  # Health.ok (False = non-finite/negative/drift)
+    shape: tuple[int, ...]
+    stop_reason: np.ndarray
+    stop_t: np.ndarray
+
+
+def grid(base: Optional[Params] = None, **axes) -> Sweep:
+    """Cartesian product of the given field values (last axis varies fastest)."""
+    base = base or Params()
+    names = list(axes)
+    values = [np.asarray(axes[k], dtype=float).ravel() for k in names]
+    points = [
+        _with(base, dict(zip(names, combo)))
+        for combo in itertools.product(*(v.tolist() for v in values))
+    ]
+    shape = tuple(len(v) for v in values)
+    flat = {
+        k: np.array([getattr(p, k) for p in points]) for k in names
+    }
+    return Sweep(points, flat, shape)
+
+
+def monte_carlo(n: int, base: Optional[Params] = None, *, seed: int = 0, **dists: Dist) -> Sweep:
+    """
+    n random parameter sets. Fields are drawn in sorted-name order from one
+    seeded generator, so the same seed always gives the same points.
+    """
+    base = base or Params()
+    rng = np.random.default_rng(seed)
+    draws: dict[str, np.ndarray] = {}
+    for name in sorted(dists):
+        d = dists[name]
+        if callable(d):
+            draws[name] = np.asarray(d(rng, n), dtype=float).reshape(n)
+        else:
+            lo, hi = d
+            draws[name] = rng.uniform(lo, hi, n)
+    points = [_with(base, {k: float(v[i]) for k, v in draws.items()}) for i in range(n)]
+    flat = {k: np.array([getattr(p, k) for p in points]) for k in draws}
+    return Sweep(points, flat, (n,))
+
+
+def _with(base: Params, updates: dict) -> Params:
+    for name in updates:
+        if name not in PARAM_FIELDS:
+            raise TypeError(f"unknown parameter field: {name!r}")
+    return replace(base, **clamp_param_updates(updates))
+
+
+def run_sweep(
+    sweep: Sweep,
+    *,
+    warmup_s: float = 20.0,
+    window_s: float = 10.0,
+    chunk_size: int = 256,
+    workers: Optional[int] = None,
+    shard_dir: Optional[str] = None,
+    stop: Sequence[LaneMonitor] = (),
+    check_every: int = 50,
+) -> SweepResult:
+    """
+    Simulate every point for warmup_s + window_s and summarise the window.
+
+    Points are split into fixed chunks of chunk_size lanes, each run as one
+    BatchEngine on a ProcessPoolExecutor (workers=0 or 1 runs in-process).
+    Lanes never interact and chunk boundaries do not depend on the worker
+    count, so results are identical for any number of workers.
+
+    With shard_dir, each finished chunk is saved as shard-NNNNN.npz next to a
+    manifest fingerprinting the sweep; rerunning the same sweep skips the
+    chunks already on disk.
+
+    stop (see bioflow.sim.stopping) ends lanes early, e.g. [NonFinite(),
+    Drift(), Steady()], checked every check_every steps; finished lanes are
+    compacted out of their chunk so the remaining work shrinks. The window
+    stats then cover each lane's last window_s before it stopped. The stop
+    rules go into the shard manifest (LaneMonitor.describe) and, with
+    several workers, must pickle (no lambda Predicates).
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    n = len(sweep)
+    chunks = [(i, sweep.params[i:i + chunk_size]) for i in range(0, n, chunk_size)]
+
+    done: dict[int, dict[str, np.ndarray]] = {}
+    if shard_dir is not None:
+        os.makedirs(shard_dir, exist_ok=True)
+        _check_manifest(shard_dir, sweep, warmup_s, window_s, chunk_size,
+                        [m.describe() for m in stop], check_every)
+        for start, _ in chunks:
+            path = _shard_path(shard_dir, start // chunk_size)
+            if os.path.exists(path):
+                with np.load(path) as z:
+                    done[start] = {k: z[k] for k in z.files}
+
+    todo = [(start, ps) for start, ps in chunks if start not in done]
+
+    def finish(start: int, out: dict[str, np.ndarray]) -> None:
+        done[start] = out
+        if shard_dir is not None:
+            path = _shard_path(shard_dir, start // chunk_size)
+            tmp = path + ".tmp.npz"
+            np.savez(tmp, **out)
+            os.replace(tmp, path)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers > 1 and len(todo) > 1:
+        try:
+            pickle.dumps(list(stop))
+        except Exception as e:
+            raise ValueError(
+                f"stop conditions must pickle to run on {workers} workers "
+                f"(use module-level functions in Predicate, or workers=0): {e}") from None
+    if workers <= 1 or len(todo) <= 1:
+        for start, ps in todo:
+            finish(start, run_chunk(ps, warmup_s, window_s, stop, check_every))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(todo))) as pool:
+            futures = {pool.submit(run_chunk, ps, warmup_s, window_s, stop, check_every): start for start, ps in todo}
+            for fut in as_completed(futures):
+                finish(futures[fut], fut.result())
+
+    parts = [done[start] for start, _ in chunks]
+    shape = sweep.shape
+
+    def gather(key: str) -> np.ndarray:
+        return np.concatenate([p[key] for p in parts]).reshape(shape)
+
+    return SweepResult(
+        axes={k: v.reshape(shape) for k, v in sweep.axes.items()},
+        metrics={k: gather(k) for k in METRICS},
+        level=gather("level"),
+        ok=gather("ok"),
+        shape=shape,
+        stop_reason=gather("stop_reason"),
+        stop_t=gather("stop_t"),
+    )
+
+
+class WindowStats(LaneMonitor):
+    """
+    Keeps the newest `window` samples (per lane) of the summary signals in a
+    ring and turns them into METRICS as lanes finish, so a lane stopped early
+    reports on the last window it actually ran.
+    """
+
+    per_step = True
+    SIGNALS = ("P_art_mmHg", "P_ven_mmHg", "Q_periph_ml_s", "Q_pump_ml_s", "V_pool_ml")
+
+    def __init__(self, window: np.ndarray) -> None:
+        self.window = np.asarray(window, dtype=int)
+
+    def reset(self, engine: BatchEngine) -> None:
+        n = engine.n
+        self.W = int(self.window.max()) if n else 1
+        self.ring = {k: np.zeros((n, self.W)) for k in self.SIGNALS}
+        self.out = {k: np.full(n, np.nan) for k in METRICS}
+
+    def observe(self, engine: BatchEngine, step: int) -> None:
+        col = (step - 1) % self.W
+        for k, r in self.ring.items():
+            r[:, col] = engine.s[k]
+
+    def finish(self, engine: BatchEngine, mask: np.ndarray, idx: np.ndarray, step: int) -> None:
+        count = np.minimum(self.window[mask], step)
+        cols = (step - 1 - np.arange(self.W)) % self.W          # newest first
+        valid = np.arange(self.W)[None, :] < count[:, None]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            def mean(k: str) -> np.ndarray:
+                return np.where(valid, self.ring[k][mask][:, cols], 0.0).sum(axis=1) / count
+            P = self.ring["P_art_mmHg"][mask][:, cols]
+            o = self.out
+            o["P_art_mean"][idx] = mean("P_art_mmHg")
+            o["P_art_sys"][idx] = np.where(count > 0, np.where(valid, P, -np.inf).max(axis=1), np.nan)
+            o["P_art_dia"][idx] = np.where(count > 0, np.where(valid, P, np.inf).min(axis=1), np.nan)
+            o["P_ven_mean"][idx] = mean("P_ven_mmHg")
+            o["Q_periph_mean"][idx] = mean("Q_periph_ml_s")
+            o["cardiac_output_l_min"][idx] = mean("Q_pump_ml_s") * 60.0 / 1000.0
+            o["V_pool_mean"][idx] = mean("V_pool_ml")
+
+    def compact(self, keep: np.ndarray) -> None:
+        self.window = self.window[keep]
+        self.ring = {k: r[keep] for k, r in self.ring.items()}
+
+
+def run_chunk(params: list[Params], warmup_s: float, window_s: float,
+              stop: Sequence[LaneMonitor] = (), check_every: int = 50) -> dict[str, np.ndarray]:
+    """
+    Run one chunk as a BatchEngine for warmup_s + window_s (each lane in
+    steps of its own dt); metrics cover each lane's last window_s, or less if
+    a stop condition ended it sooner.
+    """
+    engine = BatchEngine(params)
+    dt = engine.p["dt"]
+    window = np.maximum(np.rint(window_s / dt).astype(int), 1)
+    steps = np.rint(warmup_s / dt).astype(int) + window
+
+    stats = WindowStats(window)
+    report = run_until(engine, steps, stop, check_every=check_every, observers=[stats])
+    p = {name: np.array([getattr(q, name) for q in params]) for name in ("dt", "total_volume_ml")}
+    health = assess_array(report.final, p)
+    return {
+        **stats.out,
+        "level": health.level,
+        "ok": health.ok,
+        "stop_reason": report.reason,
+        "stop_t": report.stop_t,
+    }
+
+
+def _shard_path(shard_dir: str, index: int) -> str:
+    return os.path.join(shard_dir, f"shard-{index:05d}.npz")
+
+
+def _check_manifest(shard_dir: str, sweep: Sweep, warmup_s: float, window_s: float, chunk_size: int,
+                    stop: list[dict], check_every: int) -> None:
+    h = hashlib.sha256()
+    for p in sweep.params:
+        h.update(json.dumps(asdict(p), sort_keys=True).encode())
+    manifest = {
+        "points": len(sweep),
+        "params_sha256": h.hexdigest(),
+        "warmup_s": warmup_s,
+        "window_s": window_s,
+        "chunk_size": chunk_size,
+        "stop": stop,
+        "check_every": check_every,
+    }
+    path = os.path.join(shard_dir, "manifest.json")
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            if json.load(f) != manifest:
+                raise ValueError(f"{shard_dir} holds shards from a different sweep")
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
@@ -1,9 +1,13 @@
 from __future__ import annotations
 import math
 from dataclasses import dataclass
+from typing import TYPE_CHECKING, Mapping, Union
 
 from .state import State, Params
 
+if TYPE_CHECKING:
+    import numpy as np
+
 
 @dataclass(frozen=True)
 class Health:
@@ -12,45 +16,163 @@ class Health:
     message: str
 
 
+# Rule codes, in the order assess() checks them (first match wins).
+# Codes below FIRST_SOFT are fatal (Health.ok is False).
+OK = 0
+NON_FINITE = 1
+NEGATIVE_VOLUME = 2
+CONSERVATION_DRIFT = 3
+HIGH_PRESSURE = 4
+LOW_PRESSURE_PUMPING = 5
+LOW_PERFUSION = 6
+EXCESSIVE_POOLING = 7
+AFTERLOAD_OVERLOAD = 8
+FIRST_SOFT = HIGH_PRESSURE
+
+HEALTH: tuple[Health, ...] = (
+    Health(True, "OK", "Stable."),
+    Health(False, "WARN", "Non-finite value detected (NaN/inf)."),
+    Health(False, "WARN", "Negative volume detected."),
+    Health(False, "WARN", "Volume conservation drift."),
+    Health(True, "WARN", "Arterial pressure very high (clamped?)."),
+    Health(True, "WARN", "Pressure very low while pumping (unstable params)."),
+    Health(True, "WARN", "Very low peripheral flow (poor perfusion)."),
+    Health(True, "WARN", "Excessive venous pooling (low preload)."),
+    Health(True, "WARN", "High pressure with low flow (afterload overload)."),
+)
+
+
 def is_finite(x: float) -> bool:
     return math.isfinite(x)
 
 
-def assess(state: State, params: Params) -> Health:
+def assess_code(state: State, params: Params) -> int:
+    """Rule code (index into HEALTH) for one state."""
+    isf = math.isfinite
     # NaN/inf guard
-    vals = [
-        state.V_art_ml, state.V_ven_ml, state.V_pool_ml,
-        state.P_art_mmHg, state.P_ven_mmHg, state.P_pool_mmHg,
-        state.Q_periph_ml_s, state.Q_pump_ml_s, state.Q_pool_ml_s,
-        params.dt, params.total_volume_ml,
-    ]
-    if any(not is_finite(v) for v in vals):
-        return Health(False, "WARN", "Non-finite value detected (NaN/inf).")
+    if not (isf(state.V_art_ml) and isf(state.V_ven_ml) and isf(state.V_pool_ml)
+            and isf(state.P_art_mmHg) and isf(state.P_ven_mmHg) and isf(state.P_pool_mmHg)
+            and isf(state.Q_periph_ml_s) and isf(state.Q_pump_ml_s) and isf(state.Q_pool_ml_s)
+            and isf(params.dt) and isf(params.total_volume_ml)):
+        return NON_FINITE
 
     # Physical sanity
     if state.V_art_ml < 0 or state.V_ven_ml < 0 or state.V_pool_ml < 0:
-        return Health(False, "WARN", "Negative volume detected.")
+        return NEGATIVE_VOLUME
 
     total = state.V_art_ml + state.V_ven_ml + state.V_pool_ml
     if abs(total - params.total_volume_ml) > 1e-3:
-        return Health(False, "WARN", "Volume conservation drift.")
+        return CONSERVATION_DRIFT
 
     # Soft warnings (not fatal)
     if state.P_art_mmHg > 250:
-        return Health(True, "WARN", "Arterial pressure very high (clamped?).")
+        return HIGH_PRESSURE
     if state.P_art_mmHg < 1 and state.Q_pump_ml_s > 0:
-        return Health(True, "WARN", "Pressure very low while pumping (unstable params).")
+        return LOW_PRESSURE_PUMPING
 
     # Very low perfusion (user can trigger by high R or high pooling)
     if abs(state.Q_periph_ml_s) < 0.5 and state.Q_pump_ml_s > 5:
-        return Health(True, "WARN", "Very low peripheral flow (poor perfusion).")
+        return LOW_PERFUSION
 
     # Pooling too high (user can trigger by raising pooling target)
     if state.V_pool_ml / params.total_volume_ml > 0.45:
-        return Health(True, "WARN", "Excessive venous pooling (low preload).")
+        return EXCESSIVE_POOLING
 
     # Pumping into a 'stuck' system (high R + low compliance tends to do this)
     if state.P_art_mmHg > 180 and abs(state.Q_periph_ml_s) < 2:
-        return Health(True, "WARN", "High pressure with low flow (afterload overload).")
+        return AFTERLOAD_OVERLOAD
+
+    return OK
+
+
+def assess(state: State, params: Params) -> Health:
+    return HEALTH[assess_code(state, params)]
+
+
+# --- Array version ---
+
+_STATE_CHECKED = (
+    "V_art_ml", "V_ven_ml", "V_pool_ml",
+    "P_art_mmHg", "P_ven_mmHg", "P_pool_mmHg",
+    "Q_periph_ml_s", "Q_pump_ml_s", "Q_pool_ml_s",
+)
+
+
+@dataclass(frozen=True)
+class HealthArray:
+    """
+    assess() over many samples. code has the shape of the inputs; the
+    first-violation indices run along the last axis (time), -1 if none.
+    """
+    code: np.ndarray
+    first_violation: np.ndarray   # first non-OK sample
+    first_fatal: np.ndarray       # first sample with ok=False
+
+    @property
+    def ok(self) -> np.ndarray:
+        return (self.code == OK) | (self.code >= FIRST_SOFT)
+
+    @property
+    def level(self) -> np.ndarray:
+        import numpy as np
+        return np.where(self.code == OK, "OK", "WARN")
+
+    def health(self, index) -> Health:
+        return HEALTH[int(self.code[index])]
+
+
+def assess_array(
+    states: Mapping[str, np.ndarray],
+    params: Union[Params, Mapping[str, np.ndarray]],
+) -> HealthArray:
+    """
+    Vectorized assess(): same rules and priority, one NumPy pass.
+
+    states maps State fields to arrays of one shape, e.g. a BatchEngine's
+    `s` (lanes), PeriodicSolution.waveform or Recording.columns() (time), or
+    (lanes, time) trajectories. params is one Params or per-lane arrays
+    (BatchEngine.p); 1-D per-lane params broadcast over a trailing time axis.
+    """
+    import numpy as np  # array path only
+
+    s = {name: np.asarray(states[name], dtype=float) for name in _STATE_CHECKED}
+    shape = s["V_art_ml"].shape
+
+    def param(name: str):
+        v = np.asarray(getattr(params, name) if isinstance(params, Params) else params[name], dtype=float)
+        if v.ndim == 1 and len(shape) == 2:
+            v = v[:, None]
+        return v
+
+    dt, total_ml = param("dt"), param("total_volume_ml")
+    V_art, V_ven, V_pool = s["V_art_ml"], s["V_ven_ml"], s["V_pool_ml"]
+    P_art, Q_per, Q_pump = s["P_art_mmHg"], s["Q_periph_ml_s"], s["Q_pump_ml_s"]
+
+    finite = np.isfinite(dt) & np.isfinite(total_ml)
+    for a in s.values():
+        finite = finite & np.isfinite(a)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        total = V_art + V_ven + V_pool
+        conditions = [
+            ~finite,
+            (V_art < 0) | (V_ven < 0) | (V_pool < 0),
+            np.abs(total - total_ml) > 1e-3,
+            P_art > 250,
+            (P_art < 1) & (Q_pump > 0),
+            (np.abs(Q_per) < 0.5) & (Q_pump > 5),
+            V_pool / total_ml > 0.45,
+            (P_art > 180) & (np.abs(Q_per) < 2),
+        ]
+        code = np.select(
+            [np.broadcast_to(c, shape) for c in conditions],
+            list(range(NON_FINITE, AFTERLOAD_OVERLOAD + 1)), default=OK).astype(np.int8)
+
+    return HealthArray(code, _first(code != OK), _first((code != OK) & (code < FIRST_SOFT)))
+
 
-    return Health(True, "OK", "Stable.")
+def _first(mask):
+    import numpy as np
+    if mask.ndim == 0:
+        return np.array(0 if mask else -1)
+    return np.where(mask.any(axis=-1), np.argmax(mask, axis=-1), -1)
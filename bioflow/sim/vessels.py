@@ -16,6 +16,16 @@ def pressure_from_volume(V_ml: float, V0_ml: float, C_ml_per_mmHg: float) -> flo
     return max(P, 0.0)
 
 
+def resistance_coefficients(R0: float, k: float) -> tuple[float, float, float]:
+    """
+    (R0, R0^2, 4*R0*k) after the R0/k floors: the parameter-only part of
+    the nonlinear resistance root (the engine keeps it per Params revision,
+    see compiled.compiled).
+    """
+    R0f = max(R0, 1e-9)
+    return R0f, R0f * R0f, 4.0 * R0f * max(k, 0.0)
+
+
 def peripheral_flow_nonlinear_ml_s(dP_mmHg: float, R0: float, k: float) -> float:
     """
     Nonlinear resistance model:
@@ -27,22 +37,39 @@ def peripheral_flow_nonlinear_ml_s(dP_mmHg: float, R0: float, k: float) -> float
     For dP >= 0: Q >= 0 solves:
       (R0*k) Q^2 + (R0) Q - dP = 0
     Mirror for dP < 0.
+
+    The root is taken in the rationalized form
+      Q = 2*dP / (R0 + sqrt(R0^2 + 4*R0*k*|dP|))
+    which has no cancellation as k -> 0, reduces exactly to dP/R0 at k = 0
+    and carries the sign of dP by itself.
     """
-    R0 = max(R0, 1e-9)
-    k = max(k, 0.0)
+    R0, R0_sq, c = resistance_coefficients(R0, k)
+    return 2.0 * dP_mmHg / (R0 + math.sqrt(R0_sq + c * abs(dP_mmHg)))
+
+
+def pressure_from_volume_array(V_ml, V0_ml, C_ml_per_mmHg):
+    """Vectorized pressure_from_volume (broadcasting, same operation order)."""
+    import numpy as np  # array path only; the scalar engine never needs NumPy
+
+    C = np.maximum(C_ml_per_mmHg, 1e-9)
+    return np.maximum((V_ml - V0_ml) / C, 0.0)
+
+
+def resistance_coefficients_array(R0, k):
+    """Vectorized resistance_coefficients (no cache; keep the result per lane set)."""
+    import numpy as np
+
+    R0 = np.maximum(R0, 1e-9)
+    return R0, R0 * R0, 4.0 * R0 * np.maximum(k, 0.0)
 
-    if k == 0.0:
-        return dP_mmHg / R0
 
-    sign = 1.0 if dP_mmHg >= 0.0 else -1.0
-    dP = abs(dP_mmHg)
+def peripheral_flow_from_coefficients_array(dP_mmHg, R0, R0_sq, c):
+    """Stable-root flow from resistance_coefficients_array's (R0, R0^2, 4*R0*k)."""
+    import numpy as np
 
-    a = R0 * k
-    b = R0
-    c = -dP
+    return 2.0 * dP_mmHg / (R0 + np.sqrt(R0_sq + c * np.abs(dP_mmHg)))
 
-    disc = b * b - 4.0 * a * c
-    disc = max(disc, 0.0)
 
-    Q = (-b + math.sqrt(disc)) / (2.0 * a)  # positive root
-    return sign * Q
+def peripheral_flow_nonlinear_array(dP_mmHg, R0, k):
+    """Vectorized peripheral_flow_nonlinear_ml_s; bit-identical element-wise."""
+    return peripheral_flow_from_coefficients_array(dP_mmHg, *resistance_coefficients_array(R0, k))
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 from dataclasses import replace
+from typing import Union
+
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QGroupBox, QLabel, QSlider, QHBoxLayout, QPushButton
 )
 
 from bioflow.sim.orchestrator import SimOrchestrator
+from bioflow.sim.realtime import SimWorker
 from bioflow.sim import presets
 
 
@@ -77,7 +80,7 @@ class _SliderRow(QWidget):
 
 
 class ControlsPanel(QWidget):
-    def __init__(self, sim: SimOrchestrator, on_reset_views=None) -> None:
+    def __init__(self, sim: Union[SimOrchestrator, SimWorker], on_reset_views=None) -> None:
         super().__init__()
         self.sim = sim
         self.on_reset_views = on_reset_views
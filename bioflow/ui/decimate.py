@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import numpy as np
+
+from bioflow.sim.history import History
+
+
+def _interleave(t_min, y_min, t_max, y_max) -> tuple[np.ndarray, np.ndarray]:
+    """Two points per block, min and max, in the order they occurred."""
+    min_first = t_min <= t_max
+    xs = np.empty(2 * len(t_min))
+    ys = np.empty(2 * len(t_min))
+    xs[0::2] = np.where(min_first, t_min, t_max)
+    ys[0::2] = np.where(min_first, y_min, y_max)
+    xs[1::2] = np.where(min_first, t_max, t_min)
+    ys[1::2] = np.where(min_first, y_max, y_min)
+    return xs, ys
+
+
+class _Level:
+    """Ring of min/max blocks for one pyramid level, addressed by absolute block index."""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.y_min = np.empty(capacity)
+        self.y_max = np.empty(capacity)
+        self.t_min = np.empty(capacity)
+        self.t_max = np.empty(capacity)
+        self.done = 0  # complete blocks written (absolute)
+        self.first = 0  # oldest block still valid
+
+    def take(self, j0: int, j1: int) -> tuple[np.ndarray, ...]:
+        idx = np.arange(j0, j1) % self.capacity
+        return self.t_min[idx], self.y_min[idx], self.t_max[idx], self.y_max[idx]
+
+    def put(self, j0: int, t_min, y_min, t_max, y_max) -> None:
+        idx = np.arange(j0, j0 + len(y_min)) % self.capacity
+        self.t_min[idx] = t_min
+        self.y_min[idx] = y_min
+        self.t_max[idx] = t_max
+        self.y_max[idx] = y_max
+
+
+class MinMaxPyramid:
+    """
+    Multi-resolution min/max summary of one History field.
+
+    Level k holds one (min, max) block per factor**k samples, aligned to the
+    history's absolute sample count. update() folds in only the samples and
+    blocks completed since the last call. decimated() then covers any recent
+    window with the coarsest blocks that are still at most one pixel wide,
+    topped up with finer blocks/raw samples at the ragged edges, so the number
+    of points handed to the plot depends on the pixel width, not the window.
+    """
+
+    def __init__(self, history: History, field: str, time_field: str = "t", factor: int = 4) -> None:
+        if factor < 2:
+            raise ValueError("factor must be >= 2")
+        self.history = history
+        self.field = field
+        self.time_field = time_field
+        self.factor = factor
+        self.levels: list[_Level] = []
+        size = factor
+        while size <= history.capacity:
+            self.levels.append(_Level(history.capacity // size + 2))
+            size *= factor
+        self._epoch = history.epoch
+
+    def _raw(self, i0: int, i1: int) -> tuple[np.ndarray, np.ndarray]:
+        """Raw (t, y) for absolute sample range [i0, i1)."""
+        back = self.history.total - i0
+        t = self.history.view(self.time_field, back)[: i1 - i0]
+        y = self.history.view(self.field, back)[: i1 - i0]
+        return t, y
+
+    def update(self) -> None:
+        h = self.history
+        total = h.total
+        oldest = total - len(h)
+        if h.epoch != self._epoch:  # history was cleared
+            for lv in self.levels:
+                lv.done = lv.first = 0
+            self._epoch = h.epoch
+
+        B = self.factor
+        child_done, child_first = total, oldest
+        for k, lv in enumerate(self.levels):
+            start = max(lv.done, -(-child_first // B))
+            end = child_done // B
+            if end > start:
+                if start > lv.done:  # source data skipped: older blocks are stale
+                    lv.first = start
+                if k == 0:
+                    t, y = self._raw(start * B, end * B)
+                    tn = tx = t.reshape(-1, B)
+                    yn = yx = y.reshape(-1, B)
+                else:
+                    tn, yn, tx, yx = (a.reshape(-1, B) for a in self.levels[k - 1].take(start * B, end * B))
+                rows = np.arange(end - start)
+                ci_min = np.argmin(yn, axis=1)
+                ci_max = np.argmax(yx, axis=1)
+                lv.put(start, tn[rows, ci_min], yn[rows, ci_min], tx[rows, ci_max], yx[rows, ci_max])
+                lv.done = end
+            lv.first = max(lv.first, lv.done - lv.capacity)
+            child_done, child_first = lv.done, lv.first
+
+    def decimated(self, n: int, width_px: int) -> tuple[np.ndarray, np.ndarray]:
+        """(x, y) for the newest n samples, at most ~2 points per block per pixel."""
+        self.update()
+        total = self.history.total
+        n = min(n, len(self.history))
+        a, b = total - n, total
+        if n <= 0:
+            return np.empty(0), np.empty(0)
+
+        spp = n / max(width_px, 1)
+        B = self.factor
+        top = -1  # coarsest usable level: block size <= samples per pixel
+        size = B
+        while top + 1 < len(self.levels) and size <= spp:
+            top += 1
+            size *= B
+        if top < 0:
+            return self._raw(a, b)  # already no more than ~B points per pixel
+
+        parts: list[tuple[np.ndarray, ...]] = []
+        i = a
+        while i < b:
+            k, size = -1, 1
+            while (k + 1 <= top and i % (size * B) == 0 and i + size * B <= b
+                   and i // (size * B) >= self.levels[k + 1].first):
+                k += 1
+                size *= B
+            if k < 0:
+                # raw samples up to the next level-0 boundary (or the end)
+                stop = min(b, (i // B + 1) * B)
+                t, y = self._raw(i, stop)
+                parts.append((t, y, t, y))
+                i = stop
+            else:
+                # a run of level-k blocks, up to the next level-(k+1) boundary
+                count = (b - i) // size
+                if k < top:
+                    count = min(count, ((i // (size * B) + 1) * size * B - i) // size)
+                j0 = i // size
+                parts.append(self.levels[k].take(j0, j0 + count))
+                i += count * size
+
+        t_min, y_min, t_max, y_max = (np.concatenate(c) for c in zip(*parts))
+        return _interleave(t_min, y_min, t_max, y_max)
@@ -5,6 +5,7 @@ from PySide6.QtGui import QPainter, QPen
 from PySide6.QtWidgets import QWidget
 
 from bioflow.sim.state import State
+from bioflow.utils.timing import timed
 
 
 class LoopView(QWidget):
@@ -26,6 +27,7 @@ class LoopView(QWidget):
         self._phase = (self._phase + speed) % 1.0
         self.update()
 
+    @timed("paint.loop_view")
     def paintEvent(self, _ev) -> None:
         p = QPainter(self)
         p.setRenderHint(QPainter.Antialiasing, True)
@@ -1,25 +1,33 @@
 from __future__ import annotations
 
 from PySide6.QtCore import QTimer
+from PySide6.QtGui import QKeySequence, QShortcut
 from PySide6.QtWidgets import QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, QLabel
 
 from bioflow.sim.orchestrator import SimOrchestrator
+from bioflow.sim.realtime import SimWorker
 from bioflow.sim.validate import assess
+from bioflow.utils.timing import span
 
 from .loop_view import LoopView
 from .plots import PlotsPanel
 from .volume_bar import VolumeBar
 from .controls import ControlsPanel
+from .timing_overlay import TimingOverlay
 
 
 class MainWindow(QMainWindow):
-    def __init__(self) -> None:
+    def __init__(self, real_time_factor: float = 1.0, show_timing: bool = False) -> None:
         super().__init__()
         self.setWindowTitle("BioFlow Lab")
         self.resize(1200, 700)
 
+        # Physics runs on its own thread at real_time_factor x wall clock;
+        # the UI only reads published snapshots and queues control changes.
         self.sim = SimOrchestrator()
-        self.sim.play()
+        self.worker = SimWorker(self.sim, real_time_factor=real_time_factor, record=True)
+        self.worker.play()
+        self._shown = None   # (state, params) drawn last
 
         self.loop_view = LoopView()
         self.plots = PlotsPanel()
@@ -29,7 +37,7 @@ class MainWindow(QMainWindow):
         layout = QHBoxLayout(root)
 
         self.controls = ControlsPanel(
-            self.sim, on_reset_views=self.reset_views)
+            self.worker, on_reset_views=self.reset_views)
 
         self.status = QLabel("OK")
         self.status.setStyleSheet("padding: 6px; font-weight: 600;")
@@ -47,28 +55,51 @@ class MainWindow(QMainWindow):
 
         self.setCentralWidget(root)
 
+        # F3: per-span frame timings (bioflow.utils.timing) over the window
+        self.timing_overlay = TimingOverlay(root)
+        QShortcut(QKeySequence("F3"), self, self.timing_overlay.toggle)
+        if show_timing:
+            self.timing_overlay.toggle()
+        self._frames = 0
+
         self.timer = QTimer(self)
         self.timer.setInterval(16)  # ~60 FPS UI
         self.timer.timeout.connect(self.on_tick)
         self.timer.start()
+        self.worker.start()
 
     def on_tick(self) -> None:
-        # Run multiple sim steps per UI frame for stability
-        steps_per_frame = 3
-        self.sim.tick(steps_per_frame)
-        s = self.sim.state
-
-        h = assess(s, self.sim.params)
-        if h.level == "OK":
-            self.status.setText("OK — Stable")
-            self.status.setStyleSheet("padding: 6px; font-weight: 600;")
-        else:
-            self.status.setText(f"WARN — {h.message}")
-            self.status.setStyleSheet("padding: 6px; font-weight: 600;")
-
-        self.loop_view.update_from_state(s)
-        self.plots.update_from_state(s)
-        self.volbar.update_from_state(s, self.sim.params)
+        # Frame timer only renders; the worker owns simulation pacing.
+        # Published states and Params are immutable, so identity tells us
+        # whether anything changed (stepping, or a slider moved while paused).
+        self._frames += 1
+        if self._frames % 30 == 0:  # ~2 Hz
+            self.timing_overlay.refresh()
+
+        s, p = self.worker.latest, self.worker.params
+        if self._shown is not None and s is self._shown[0] and p is self._shown[1]:
+            return
+        self._shown = (s, p)
+
+        with span("ui.on_tick"):
+            with span("ui.assess"):
+                h = assess(s, p)
+            if h.level == "OK":
+                self.status.setText("OK — Stable")
+                self.status.setStyleSheet("padding: 6px; font-weight: 600;")
+            else:
+                self.status.setText(f"WARN — {h.message}")
+                self.status.setStyleSheet("padding: 6px; font-weight: 600;")
+
+            self.loop_view.update_from_state(s)
+            self.plots.update_from_samples(self.worker.drain_samples())
+            self.volbar.update_from_state(s, p)
 
     def reset_views(self) -> None:
         self.plots.reset()
+        self._shown = None
+
+    def closeEvent(self, ev) -> None:
+        self.timer.stop()
+        self.worker.stop()
+        super().closeEvent(ev)
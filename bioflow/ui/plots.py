@@ -1,57 +1,112 @@
 from __future__ import annotations
 
-from collections import deque
+from typing import Sequence
 
-import pyqtgraph as pg
+import numpy as np
+from PySide6.QtCore import QTimer
 from PySide6.QtWidgets import QWidget, QVBoxLayout
 
+from bioflow.sim.history import History
 from bioflow.sim.state import State
+from bioflow.utils.timing import span, timed
+
+from .decimate import MinMaxPyramid
 
 
 class PlotsPanel(QWidget):
-    def __init__(self, seconds: float = 10.0, dt_hint: float = 0.01) -> None:
+    """
+    Pressure/flow traces over the last `seconds` of simulated time.
+
+    Samples live in a preallocated History (history_seconds deep). Each curve
+    reads through a MinMaxPyramid, so it gets about as many points as the plot
+    has pixels: frame cost stays flat however long the window is, and
+    systolic peaks survive decimation.
+
+    pyqtgraph is imported and the plots built right after the panel first
+    paints, so the window's first frame doesn't wait for it; samples
+    arriving before that just accumulate. ensure_plots() builds them now.
+    """
+
+    def __init__(self, seconds: float = 10.0, dt_hint: float = 0.01,
+                 history_seconds: float = 300.0) -> None:
         super().__init__()
 
-        self._maxlen = int(seconds / dt_hint)
+        self.seconds = seconds
+        self.history = History(int(max(history_seconds, seconds) / dt_hint))
 
-        self.t = deque(maxlen=self._maxlen)
-        self.p_art = deque(maxlen=self._maxlen)
-        self.p_ven = deque(maxlen=self._maxlen)
-        self.q_per = deque(maxlen=self._maxlen)
+        self._layout = QVBoxLayout(self)
+        self.p_plot = self.q_plot = None
+        self.p_art_curve = self.p_ven_curve = self.q_curve = None
 
-        layout = QVBoxLayout(self)
+        self._lod = {
+            name: MinMaxPyramid(self.history, name)
+            for name in ("P_art_mmHg", "P_ven_mmHg", "Q_periph_ml_s")
+        }
 
-        pg.setConfigOptions(antialias=True)
+    def paintEvent(self, ev) -> None:
+        super().paintEvent(ev)
+        if self.p_plot is None:
+            QTimer.singleShot(0, self.ensure_plots)
 
-        self.p_plot = pg.PlotWidget(title="Pressure (mmHg)")
-        self.p_plot.showGrid(x=True, y=True, alpha=0.2)
-        self.p_art_curve = self.p_plot.plot()
-        self.p_ven_curve = self.p_plot.plot()
+    def ensure_plots(self) -> None:
+        if self.p_plot is not None:
+            return
+        with span("plots.build"):
+            import pyqtgraph as pg
 
-        self.q_plot = pg.PlotWidget(title="Flow (mL/s)")
-        self.q_plot.showGrid(x=True, y=True, alpha=0.2)
-        self.q_curve = self.q_plot.plot()
+            pg.setConfigOptions(antialias=True)
 
-        layout.addWidget(self.p_plot, 1)
-        layout.addWidget(self.q_plot, 1)
+            self.p_plot = pg.PlotWidget(title="Pressure (mmHg)")
+            self.p_plot.showGrid(x=True, y=True, alpha=0.2)
+            self.p_art_curve = self.p_plot.plot()
+            self.p_ven_curve = self.p_plot.plot()
 
-    def update_from_state(self, s: State) -> None:
-        self.t.append(float(s.t))
-        self.p_art.append(float(s.P_art_mmHg))
-        self.p_ven.append(float(s.P_ven_mmHg))
-        self.q_per.append(float(s.Q_periph_ml_s))
+            self.q_plot = pg.PlotWidget(title="Flow (mL/s)")
+            self.q_plot.showGrid(x=True, y=True, alpha=0.2)
+            self.q_curve = self.q_plot.plot()
+
+            self._layout.addWidget(self.p_plot, 1)
+            self._layout.addWidget(self.q_plot, 1)
+        self._redraw()
 
-        # update curves
-        xs = list(self.t)
-        self.p_art_curve.setData(xs, list(self.p_art))
-        self.p_ven_curve.setData(xs, list(self.p_ven))
-        self.q_curve.setData(xs, list(self.q_per))
+    def update_from_state(self, s: State) -> None:
+        self._restart_if_rewound(s.t)
+        self.history.append(s)
+        self._redraw()
+
+    def update_from_samples(self, rows: Sequence[Sequence[float]]) -> None:
+        """Bulk update from STATE_FIELDS-ordered rows (e.g. SimWorker.drain_samples())."""
+        if not rows:
+            return
+        with span("plots.ingest"):
+            block = np.asarray(rows, dtype=float)
+            back = np.flatnonzero(np.diff(block[:, 0]) < 0.0)
+            if len(back):
+                self.history.clear()
+                block = block[back[-1] + 1:]
+            self._restart_if_rewound(block[0, 0])
+            self.history.extend(block)
+        self._redraw()
+
+    def _restart_if_rewound(self, t: float) -> None:
+        # Time going backwards means the sim was reset behind our back
+        if len(self.history) and t < self.history.view("t")[-1]:
+            self.history.clear()
+
+    @timed("plots.redraw")
+    def _redraw(self) -> None:
+        if self.p_plot is None:
+            return
+        n = self.history.window(self.seconds)
+        px = max(self.p_plot.width(), 100)
+        self.p_art_curve.setData(*self._lod["P_art_mmHg"].decimated(n, px))
+        self.p_ven_curve.setData(*self._lod["P_ven_mmHg"].decimated(n, px))
+        self.q_curve.setData(*self._lod["Q_periph_ml_s"].decimated(n, max(self.q_plot.width(), 100)))
 
     def reset(self) -> None:
-        self.t.clear()
-        self.p_art.clear()
-        self.p_ven.clear()
-        self.q_per.clear()
+        self.history.clear()
+        if self.p_plot is None:
+            return
 
         self.p_art_curve.clear()
         self.p_ven_curve.clear()
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QFontDatabase
+from PySide6.QtWidgets import QLabel, QWidget
+
+from bioflow.utils import timing
+
+
+class TimingOverlay(QLabel):
+    """
+    Translucent p50/p95/p99 table of the timing spans, floated over the
+    top-left corner of its parent. Showing it turns timing on.
+    """
+
+    def __init__(self, parent: QWidget) -> None:
+        super().__init__(parent)
+        self.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        self.setStyleSheet("background: rgba(0, 0, 0, 170); color: #8f8; padding: 6px;")
+        self.setAttribute(Qt.WA_TransparentForMouseEvents, True)
+        self.hide()
+
+    def toggle(self) -> None:
+        self.setVisible(self.isHidden())
+        if not self.isHidden():
+            timing.enable(trace=timing.profiler.tracing)
+            self.refresh()
+
+    def refresh(self) -> None:
+        if self.isHidden():
+            return
+        self.setText(timing.report())
+        self.adjustSize()
+        self.move(8, 8)
+        self.raise_()
@@ -5,6 +5,7 @@ from PySide6.QtGui import QPainter, QColor
 from PySide6.QtWidgets import QWidget
 
 from bioflow.sim.state import State, Params
+from bioflow.utils.timing import timed
 
 
 class VolumeBar(QWidget):
@@ -28,6 +29,7 @@ class VolumeBar(QWidget):
         self._total = float(p.total_volume_ml)
         self.update()
 
+    @timed("paint.volume_bar")
     def paintEvent(self, _ev) -> None:
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing, True)
@@ -0,0 +1,233 @@
+"""
+Hot-path instrumentation: named spans timed with a monotonic ns clock.
+
+    from bioflow.utils import timing
+
+    with timing.span("plots.redraw"):
+        ...
+
+    @timing.timed("paint.loop_view")
+    def paintEvent(self, ev): ...
+
+    timing.enable()                 # or BIOFLOW_TIMING=1 in the environment
+    timing.summary()                # {name: SpanStats(count, p50_us, p95_us, p99_us, ...)}
+    timing.enable(trace=True)       # also keep individual events ...
+    timing.dump_chrome_trace("trace.json")  # ... for chrome://tracing / Perfetto
+
+Disabled (the default), span() hands back one shared no-op context and
+timed() wrappers fall straight through, so instrumented code pays about a
+function call. Enabled, each span keeps its newest `window` durations; the
+percentiles are computed from those on demand. Recording is safe from any
+thread (appends to bounded deques), which the sim worker relies on.
+"""
+from __future__ import annotations
+
+import functools
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Optional, TypeVar
+
+F = TypeVar("F", bound=Callable)
+
+_clock = time.perf_counter_ns
+
+
+@dataclass(frozen=True)
+class SpanStats:
+    """Rolling stats of one span over its newest `count` samples (microseconds)."""
+    count: int                  # samples in the window
+    total: int                  # samples ever recorded
+    mean_us: float
+    p50_us: float
+    p95_us: float
+    p99_us: float
+    max_us: float
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc) -> bool:
+        return False
+
+
+_NULL = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("profiler", "name", "t0")
+
+    def __init__(self, profiler: "Profiler", name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.t0 = _clock()
+
+    def __exit__(self, *exc) -> bool:
+        self.profiler.record(self.name, self.t0, _clock() - self.t0)
+        return False
+
+
+class Profiler:
+    """
+    Collects span durations. The module-level functions use one shared
+    instance; make your own for isolated measurements (tests, benchmarks).
+    """
+
+    def __init__(self, window: int = 1024, trace_capacity: int = 200_000) -> None:
+        self.enabled = False
+        self.tracing = False
+        self.window = window
+        self.trace_capacity = trace_capacity
+        self._samples: dict[str, deque] = {}
+        self._totals: dict[str, int] = {}
+        self._events: deque = deque(maxlen=trace_capacity)
+        self._threads: dict[int, str] = {}
+        self._t0 = _clock()
+
+    def enable(self, trace: bool = False) -> None:
+        if trace and not self.tracing:
+            self._events.clear()
+            self._t0 = _clock()
+        self.tracing = trace
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+        self.tracing = False
+
+    def reset(self) -> None:
+        self._samples.clear()
+        self._totals.clear()
+        self._events.clear()
+        self._threads.clear()
+        self._t0 = _clock()
+
+    # --- Recording ---
+
+    def span(self, name: str):
+        """Context manager timing its body as `name` (no-op while disabled)."""
+        if not self.enabled:
+            return _NULL
+        return _Span(self, name)
+
+    def timed(self, name: Optional[str] = None) -> Callable[[F], F]:
+        """Decorator form of span(); name defaults to the function's qualname."""
+        def wrap(fn: F) -> F:
+            label = name or fn.__qualname__
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                t0 = _clock()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.record(label, t0, _clock() - t0)
+            return wrapper  # type: ignore[return-value]
+        return wrap
+
+    def record(self, name: str, start_ns: int, dur_ns: int) -> None:
+        ring = self._samples.get(name)
+        if ring is None:
+            ring = self._samples.setdefault(name, deque(maxlen=self.window))
+        ring.append(dur_ns)
+        self._totals[name] = self._totals.get(name, 0) + 1
+        if self.tracing:
+            tid = threading.get_ident()
+            if tid not in self._threads:
+                self._threads[tid] = threading.current_thread().name
+            self._events.append((name, start_ns, dur_ns, tid))
+
+    # --- Reading ---
+
+    def stats(self, name: str) -> Optional[SpanStats]:
+        ring = self._samples.get(name)
+        if not ring:
+            return None
+        xs = sorted(ring)
+        n = len(xs)
+
+        def pct(q: float) -> float:
+            return xs[max(0, math.ceil(q * n) - 1)] / 1e3    # nearest rank
+
+        return SpanStats(
+            count=n,
+            total=self._totals.get(name, n),
+            mean_us=sum(xs) / n / 1e3,
+            p50_us=pct(0.50),
+            p95_us=pct(0.95),
+            p99_us=pct(0.99),
+            max_us=xs[-1] / 1e3,
+        )
+
+    def summary(self) -> dict[str, SpanStats]:
+        out = {}
+        for name in sorted(self._samples):
+            s = self.stats(name)
+            if s is not None:
+                out[name] = s
+        return out
+
+    def report(self) -> str:
+        """summary() as a fixed-width table, e.g. for an overlay or a log."""
+        lines = [f"{'span':<24}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  us"]
+        for name, s in self.summary().items():
+            lines.append(f"{name:<24}{s.p50_us:>9.1f}{s.p95_us:>9.1f}{s.p99_us:>9.1f}{s.max_us:>9.1f}")
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> dict:
+        """Recorded events in Chrome trace-event format (complete 'X' events, us)."""
+        pid = os.getpid()
+        events = [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": tname}}
+            for tid, tname in list(self._threads.items())
+        ]
+        t0 = self._t0
+        for name, start, dur, tid in list(self._events):
+            events.append({
+                "name": name, "cat": name.split(".", 1)[0], "ph": "X",
+                "ts": (start - t0) / 1e3, "dur": dur / 1e3, "pid": pid, "tid": tid,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def dump_chrome_trace(self, path: str) -> int:
+        """Write chrome_trace() to path; returns the number of span events."""
+        trace = self.chrome_trace()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(trace, f)
+        return sum(1 for e in trace["traceEvents"] if e["ph"] == "X")
+
+
+# --- Shared instance ---
+
+profiler = Profiler()
+
+span = profiler.span
+timed = profiler.timed
+enable = profiler.enable
+disable = profiler.disable
+reset = profiler.reset
+stats = profiler.stats
+summary = profiler.summary
+report = profiler.report
+chrome_trace = profiler.chrome_trace
+dump_chrome_trace = profiler.dump_chrome_trace
+
+
+def is_enabled() -> bool:
+    return profiler.enabled
+
+
+if os.environ.get("BIOFLOW_TIMING"):
+    enable(trace=os.environ["BIOFLOW_TIMING"] == "trace")
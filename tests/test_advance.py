@@ -0,0 +1,55 @@
+from dataclasses import replace
+
+from bioflow.sim.state import State, StateBuffer, Params
+from bioflow.sim.engine import step, advance, compute_derived
+from bioflow.sim.orchestrator import SimOrchestrator
+from bioflow.sim import presets
+
+
+def _run_scalar(s, p, n):
+    for _ in range(n):
+        s = step(s, p)
+    return s
+
+
+def test_advance_matches_step_loop():
+    for p in (Params(), presets.high_resistance(), presets.weak_pump(),
+              replace(Params(), resistance_nonlinearity=0.0),
+              replace(Params(), stroke_volume_ml=0.0)):
+        s = compute_derived(State(V_art_ml=1300.0, V_ven_ml=3500.0, V_pool_ml=200.0), p)
+        buf = StateBuffer(s)
+        advance(buf, p, 1500)
+        assert buf.snapshot() == _run_scalar(s, p, 1500)
+
+
+def test_advance_samples_at_requested_points():
+    p = Params()
+    s0 = SimOrchestrator(p).state
+    buf = StateBuffer(s0)
+    samples = []
+    advance(buf, p, 100, sample_every=25, on_sample=lambda b: samples.append(b.snapshot()))
+
+    assert len(samples) == 4
+    assert samples[0] == _run_scalar(s0, p, 25)
+    assert samples[-1] == buf.snapshot()
+
+
+def test_tick_is_chunking_invariant():
+    a = SimOrchestrator()
+    b = SimOrchestrator()
+    a.play()
+    b.play()
+    a.tick(300)
+    for _ in range(100):
+        b.tick(3)
+    assert a.state == b.state
+
+
+def test_advance_matches_step_in_tabulated_mode():
+    p = replace(Params(), pump_table_size=128, pump_interp="cubic")
+    s = compute_derived(State(V_art_ml=1300.0, V_ven_ml=3500.0, V_pool_ml=200.0), p)
+    buf = StateBuffer(s)
+    advance(buf, p, 1000)
+    assert buf.snapshot() == _run_scalar(s, p, 1000)
+    exact = _run_scalar(s, Params(), 1000)
+    assert abs(buf.P_art_mmHg - exact.P_art_mmHg) < 0.5
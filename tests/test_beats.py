@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from bioflow.sim.beats import BEAT_FIELDS, BeatMeter, beat_period_s
+from bioflow.sim.orchestrator import SimOrchestrator
+
+
+def _run(sim, seconds, rows=None):
+    hook = None if rows is None else (lambda b: rows.append((b.t, b.P_art_mmHg)))
+    sim.tick(round(seconds / sim.params.dt), on_sample=hook)
+
+
+def test_beats_match_a_rescan_of_the_samples():
+    sim = SimOrchestrator()
+    meter = BeatMeter()
+    sim.attach(meter)
+    sim.play()
+    rows = [(sim.state.t, sim.state.P_art_mmHg)]
+    _run(sim, 30.0, rows)
+
+    period = beat_period_s(sim.params.hr_bpm)
+    assert meter.count == int(30.0 / period)          # first beat opens at t=0
+    b = meter.last
+    assert b.duration_s == pytest.approx(period)
+    assert b.hr_bpm == pytest.approx(sim.params.hr_bpm)
+    assert b.stroke_volume_ml == pytest.approx(sim.params.stroke_volume_ml, rel=1e-3)
+    assert b.cardiac_output_l_min == pytest.approx(b.stroke_volume_ml * b.hr_bpm / 1000.0)
+
+    t, P = np.array(rows).T
+    inside = (t >= b.t_start) & (t <= b.t_start + b.duration_s)
+    assert b.P_sys_mmHg == pytest.approx(P[inside].max(), abs=0.5)
+    assert b.P_dia_mmHg == pytest.approx(P[inside].min(), abs=0.5)
+    fine = np.linspace(b.t_start, b.t_start + b.duration_s, 20001)
+    assert b.MAP_mmHg == pytest.approx(np.interp(fine, t, P).mean(), abs=0.05)
+    assert b.pulse_pressure_mmHg == pytest.approx(b.P_sys_mmHg - b.P_dia_mmHg)
+
+    cols = meter.columns()
+    assert set(cols) == set(BEAT_FIELDS)
+    assert cols["index"].tolist() == list(range(meter.count))
+
+
+def test_hr_change_and_reset():
+    sim = SimOrchestrator()
+    seen = []
+    meter = BeatMeter(seen.append, keep=5)
+    sim.attach(meter)
+    sim.play()
+    _run(sim, 10.0)
+    sim.update_params(hr_bpm=120.0)
+    _run(sim, 10.0)
+    assert len(meter.beats) == 5 and len(seen) == meter.count
+    assert meter.last.duration_s == pytest.approx(0.5)
+
+    n = meter.count
+    sim.reset()
+    sim.play()
+    _run(sim, 0.45)
+    assert meter.count == n                           # no beat across the reset
+    _run(sim, 1.2)
+    assert meter.count == n + 3                       # first beat opens at the new t=0
+    assert [b.t_start for b in list(meter.beats)[-3:]] == pytest.approx([0.0, 0.5, 1.0])
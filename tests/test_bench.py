@@ -0,0 +1,39 @@
+import json
+
+from bioflow import bench
+
+
+def test_bench_json_and_baseline_gate(tmp_path, capsys):
+    out = tmp_path / "now.json"
+    args = ["-k", "pump_flow", "-k", "assess", "--budget", "0.05", "--repeat", "1"]
+    assert bench.main(args + ["--json", str(out)]) == 0
+    res = json.loads(out.read_text())
+    assert set(res["results"]) == {"heart.pump_flow_ml_s", "validate.assess"}
+    assert res["results"]["heart.pump_flow_ml_s"]["unit"] == "calls/s"
+    assert res["meta"]["repeat"] == 1
+
+    # A baseline 10x faster than now must trip the gate, a 10x slower one must not
+    fast, slow = json.loads(out.read_text()), json.loads(out.read_text())
+    for name, r in fast["results"].items():
+        r["value"] = r["value"] * 10 if r["higher_is_better"] else r["value"] / 10
+    for name, r in slow["results"].items():
+        r["value"] = r["value"] / 10 if r["higher_is_better"] else r["value"] * 10
+    (tmp_path / "fast.json").write_text(json.dumps(fast))
+    (tmp_path / "slow.json").write_text(json.dumps(slow))
+    assert bench.main(args + ["--baseline", str(tmp_path / "fast.json")]) == 1
+    assert "Regressions" in capsys.readouterr().out
+    assert bench.main(args + ["--baseline", str(tmp_path / "slow.json")]) == 0
+
+
+def test_every_case_is_listed(capsys):
+    bench.main(["--list"])
+    listed = capsys.readouterr().out
+    for name in ("engine.step", "orchestrator.tick", "MainWindow.on_tick", "PlotsPanel.update_from_state"):
+        assert name in listed
+
+
+def test_committed_baseline_covers_every_case():
+    from pathlib import Path
+    base = json.loads((Path(__file__).parent.parent / "benchmarks" / "baseline.json").read_text())
+    assert {c.name for c in bench.CASES} <= set(base["results"])
+    assert bench.compare(base, base, 0.0) == []
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from bioflow.sim.orchestrator import SimOrchestrator
+from bioflow.sim.realtime import SimWorker
+from bioflow.sim.branch import BATCH_MIN_BRANCHES
+from bioflow.sim.state import Params, STATE_FIELDS
+
+
+def _main():
+    sim = SimOrchestrator()
+    sim.play()
+    sim.tick(200)
+    return sim
+
+
+def test_fork_matches_committing_each_variant():
+    sim = _main()
+    before = sim.state
+    variants = [{"peripheral_resistance": r} for r in (0.6, 1.0, 2.5)] + [{"hr_bpm": 400.0}]
+    br = sim.fork(variants, 3.0, sample_interval_s=0.5)
+
+    assert sim.state == before  # main timeline untouched
+    assert len(br) == 4 and br.traj["t"].shape == (4, 7)
+    assert br.params[3].hr_bpm == 250.0  # clamped like update_params
+
+    for i, v in enumerate(variants):
+        ref = _main()
+        ref.update_params(**v)
+        assert br.final(i) == ref.tick(300)
+
+
+def test_wide_fork_uses_batch_lanes(monkeypatch):
+    from bioflow.sim import branch
+    sim = _main()
+    variants = [{"stroke_volume_ml": sv} for sv in (40.0, 70.0, 100.0)]
+    scalar = sim.fork(variants, 1.0)
+    monkeypatch.setattr(branch, "BATCH_MIN_BRANCHES", 1)
+    batched = sim.fork(variants, 1.0)
+    for name in STATE_FIELDS:
+        np.testing.assert_array_equal(scalar.traj[name], batched.traj[name])
+
+
+@pytest.mark.parametrize("name", ["rk4", "imex"])
+def test_fork_other_integrators(name):
+    sim = SimOrchestrator(integrator=name)
+    sim.play()
+    sim.tick(50)
+    br = sim.fork([{"arterial_compliance": 1.0}], 1.0)
+    sim.update_params(arterial_compliance=1.0)
+    assert br.final(0) == sim.tick(100)
+
+
+def test_fork_rejects_dt_change_and_worker_fork():
+    sim = _main()
+    with pytest.raises(ValueError):
+        sim.fork([{"dt": 0.02}], 1.0)
+
+    w = SimWorker(_main())
+    w.update_params(hr_bpm=90.0)  # queued, but visible to fork
+    br = w.fork([{}], 0.5)
+    assert br.params[0].hr_bpm == 90.0
+    assert set(br.traj) == set(STATE_FIELDS)
+    assert np.all(np.diff(br.t) > 0)
+
+
+def test_tabulated_pump_fork_does_not_depend_on_width():
+    sim = SimOrchestrator(Params(pump_table_size=16))
+    sim.play()
+    sim.tick(100)
+    one = sim.fork([{"hr_bpm": 80.0}], 2.0)
+    wide = sim.fork([{"hr_bpm": 80.0}] * BATCH_MIN_BRANCHES, 2.0)
+    assert wide.final(0) == one.final(0) == wide.final(BATCH_MIN_BRANCHES - 1)
@@ -0,0 +1,61 @@
+import pytest
+
+from bioflow.sim.integrators import INTEGRATORS
+from bioflow.sim.orchestrator import SimOrchestrator
+
+
+@pytest.mark.parametrize("name", sorted(INTEGRATORS))
+def test_restore_then_step_is_bit_identical(name):
+    a = SimOrchestrator(integrator=name)
+    a.update_params(dt=0.01, peripheral_resistance=1.4)
+    a.play()
+    a.tick(150)
+    blob = a.checkpoint()
+    expected = a.tick(230)
+
+    b = SimOrchestrator.from_checkpoint(blob)
+    assert b.integrator.name == name and not b.paused
+    assert b.integrator.cache() == SimOrchestrator.from_checkpoint(blob).integrator.cache()
+    assert b.tick(230) == expected
+
+
+def test_blob_is_compact():
+    assert len(SimOrchestrator().checkpoint()) < 1024
+
+
+def test_auto_checkpoints_do_not_perturb_the_run():
+    plain = SimOrchestrator()
+    plain.play()
+    ck = SimOrchestrator()
+    ck.auto_checkpoint(0.37)
+    ck.play()
+    for n in (1, 50, 333, 1000):
+        assert plain.tick(n) == ck.tick(n)
+    assert len(ck.checkpoints) > 10
+
+
+def test_seek_replays_from_nearest_checkpoint():
+    ref = SimOrchestrator()
+    ref.play()
+    sim = SimOrchestrator()
+    sim.auto_checkpoint(1.0)
+    sim.play()
+
+    ref.tick(300)
+    sim.tick(300)
+    ref.update_params(hr_bpm=110.0)
+    sim.update_params(hr_bpm=110.0)
+    ref.tick(250)
+    at_5_5 = ref.state
+    ref.tick(450)
+    final = sim.tick(700)
+    assert final == ref.state
+
+    assert sim.seek(5.5) == at_5_5
+    assert sim.params.hr_bpm == 110.0
+    assert sim.tick(450) == final  # stepping on from the seek matches too
+
+    sim.seek(2.0)
+    assert sim.params.hr_bpm != 110.0  # params as they were at t=2
+    with pytest.raises(ValueError):
+        SimOrchestrator().seek(1.0)
@@ -0,0 +1,67 @@
+import csv
+import json
+import struct
+import subprocess
+import sys
+
+import pytest
+
+from bioflow import cli
+from bioflow.sim.state import STATE_FIELDS
+
+
+def test_run_csv_rows_match_duration(tmp_path):
+    out = tmp_path / "out.csv"
+    rc = cli.main(["run", "--preset", "weak_pump", "--duration", "2", "--sample-interval", "0.1", "-o", str(out)])
+    assert rc == 0
+    rows = list(csv.reader(out.open()))
+    assert tuple(rows[0]) == STATE_FIELDS
+    assert len(rows) == 1 + 21  # initial sample + one per 0.1 s
+    assert float(rows[-1][0]) == pytest.approx(2.0)
+
+
+def test_run_bin_and_params_file(tmp_path):
+    pfile = tmp_path / "p.json"
+    pfile.write_text(json.dumps({"hr_bpm": 1000.0, "stroke_volume_ml": 50}))
+    out = tmp_path / "out.bin"
+    cli.main(["run", "--params", str(pfile), "--duration", "1", "--sample-interval", "0.5",
+              "--format", "bin", "-o", str(out)])
+    data = out.read_bytes()
+    width = 8 * len(STATE_FIELDS)
+    assert len(data) == 3 * width
+    last = struct.unpack("<" + "d" * len(STATE_FIELDS), data[-width:])
+    assert last[0] == pytest.approx(1.0)
+
+
+def test_params_file_and_overrides_are_validated():
+    cfg = cli.load_params(None, None, ["hr_bpm=1000"])
+    assert cfg["updates"] == {"hr_bpm": 1000.0}
+    with pytest.raises(ValueError):
+        cli.load_params(None, None, ["nope=1"])
+
+
+@pytest.mark.parametrize("override", ["pump_table_size=2", "pump_interp=quad"])
+def test_bad_pump_options_are_usage_errors(override, capsys):
+    with pytest.raises(SystemExit) as exc:
+        cli.main(["run", "--duration", "0.1", "--set", override])
+    assert exc.value.code == 2 and "pump_" in capsys.readouterr().err
+
+
+def test_params_file_must_be_an_object(tmp_path, capsys):
+    pfile = tmp_path / "p.json"
+    pfile.write_text("[1, 2]")
+    with pytest.raises(SystemExit) as exc:
+        cli.main(["run", "--params", str(pfile), "--duration", "0.1"])
+    assert exc.value.code == 2 and "JSON object" in capsys.readouterr().err
+
+
+def test_cli_does_not_import_qt():
+    code = (
+        "import sys, io, contextlib\n"
+        "from bioflow import cli\n"
+        "with contextlib.redirect_stdout(io.StringIO()):\n"
+        "    cli.main(['run', '--duration', '0.1', '--format', 'jsonl'])\n"
+        "bad = [m for m in sys.modules if m.split('.')[0] in ('PySide6', 'pyqtgraph')]\n"
+        "assert not bad, bad\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
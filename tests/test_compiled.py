@@ -0,0 +1,89 @@
+import math
+import pickle
+from dataclasses import FrozenInstanceError, replace
+
+import pytest
+
+from bioflow.sim.compiled import compiled
+from bioflow.sim.engine import pump_flow_for
+from bioflow.sim.heart import pump_flow_ml_s, tabulated_pump_flow_ml_s
+from bioflow.sim.orchestrator import SimOrchestrator
+from bioflow.sim.state import Params
+
+
+def test_params_frozen_hashable_with_revisions():
+    p = Params()
+    with pytest.raises(FrozenInstanceError):
+        p.hr_bpm = 90.0
+    q = Params()
+    assert p == q and hash(p) == hash(q) and p.revision != q.revision
+    r = replace(p, hr_bpm=90.0)
+    assert r.revision > p.revision and r != p
+
+
+def test_pickle_gives_fresh_revision_without_cache():
+    p = Params(hr_bpm=80.0)
+    compiled(p)
+    q = pickle.loads(pickle.dumps(p))
+    assert q == p and q.revision != p.revision
+    assert "_compiled" not in q.__dict__
+
+
+def test_compiled_once_per_revision():
+    p = Params()
+    assert compiled(p) is compiled(p)
+    assert compiled(replace(p)) is not compiled(p)
+
+
+def test_slider_change_rebuilds_only_its_group():
+    sim = SimOrchestrator(Params())
+    before = compiled(sim.params)
+    sim.update_params(peripheral_resistance=1.4)
+    after = compiled(sim.params)
+    for name in ("compliance", "pump", "pooling"):
+        assert after.groups[name] is before.groups[name]
+    assert after.groups["resistance"] is not before.groups["resistance"]
+    assert after.R0 == 1.4
+
+
+def test_unchanged_update_keeps_params():
+    sim = SimOrchestrator(Params())
+    p = sim.params
+    seen = []
+
+    class Sink:
+        def on_step(self, buf):
+            pass
+
+        def on_params(self, t, changes):
+            seen.append(changes)
+
+    sim.attach(Sink())
+    sim.update_params(hr_bpm=p.hr_bpm, stroke_volume_ml=p.stroke_volume_ml)
+    assert sim.params is p and not seen
+    sim.update_params(hr_bpm=p.hr_bpm, stroke_volume_ml=80.0)
+    assert seen == [{"stroke_volume_ml": 80.0}]
+
+
+@pytest.mark.parametrize("table", [0, 64])
+def test_pump_flow_matches_reference(table):
+    p = Params(hr_bpm=97.0, systole_fraction=0.31, pump_table_size=table)
+    c = compiled(p)
+    for i in range(500):
+        t = i * 0.0037
+        ref = (tabulated_pump_flow_ml_s(t, p.hr_bpm, p.stroke_volume_ml, p.systole_fraction,
+                                        resolution=table, interp=p.pump_interp)
+               if table else pump_flow_ml_s(t, p.hr_bpm, p.stroke_volume_ml, p.systole_fraction))
+        assert c.pump_flow(t) == ref == pump_flow_for(t, p)
+
+
+def test_stopped_pump():
+    c = compiled(Params(stroke_volume_ml=0.0))
+    assert not c.pump_on and c.pump_flow(0.1) == 0.0
+    assert math.isfinite(c.period)
+
+
+def test_changed_fields():
+    from bioflow.sim.state import changed_fields
+    p = Params()
+    assert changed_fields(p, {"hr_bpm": p.hr_bpm, "dt": 0.02, "bogus": 1}) == {"dt": 0.02, "bogus": 1}
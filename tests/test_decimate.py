@@ -0,0 +1,69 @@
+import numpy as np
+
+from bioflow.sim.history import History
+from bioflow.sim.state import STATE_FIELDS
+from bioflow.ui.decimate import MinMaxPyramid
+
+Y = STATE_FIELDS.index("P_art_mmHg")
+
+
+def _fill(h: History, values: np.ndarray, chunks: np.ndarray) -> None:
+    rows = np.zeros((len(values), len(STATE_FIELDS)))
+    rows[:, 0] = np.arange(len(values)) * 0.01
+    rows[:, Y] = values
+    i = 0
+    for k in chunks:
+        h.extend(rows[i:i + k])
+        i += k
+    h.extend(rows[i:])
+
+
+def test_peaks_survive_and_point_count_tracks_pixels():
+    rng = np.random.default_rng(3)
+    for capacity in (2_000, 60_000):
+        h = History(capacity)
+        pyr = MinMaxPyramid(h, "P_art_mmHg")
+        _fill(h, rng.normal(size=capacity + 777), rng.integers(1, 400, size=50))
+
+        for n in (capacity, capacity // 3):
+            x, y = pyr.decimated(n, 500)
+            src = h.view("P_art_mmHg", n)
+            assert y.max() == src.max() and y.min() == src.min()
+            assert np.all(np.diff(x) >= 0.0)
+            assert len(x) < 2 * 4 * 500 + 200
+
+
+def test_incremental_updates_match_one_shot():
+    rng = np.random.default_rng(4)
+    n = 9_000
+    rows = np.zeros((n, len(STATE_FIELDS)))
+    rows[:, 0] = np.arange(n) * 0.01
+    rows[:, Y] = np.sin(np.linspace(0, 200, n)) + rng.normal(scale=0.1, size=n)
+
+    h1 = History(5_000)
+    p1 = MinMaxPyramid(h1, "P_art_mmHg")
+    i = 0
+    while i < n:
+        k = int(rng.integers(1, 300))
+        h1.extend(rows[i:i + k])
+        p1.update()
+        i += k
+
+    h2 = History(5_000)
+    p2 = MinMaxPyramid(h2, "P_art_mmHg")
+    h2.extend(rows)
+
+    a = p1.decimated(4_000, 300)
+    b = p2.decimated(4_000, 300)
+    assert np.array_equal(a[0], b[0]) and np.array_equal(a[1], b[1])
+
+
+def test_clear_resets_levels():
+    h = History(1_000)
+    pyr = MinMaxPyramid(h, "P_art_mmHg")
+    _fill(h, np.full(900, 50.0), np.array([], dtype=int))
+    pyr.update()
+    h.clear()
+    _fill(h, np.full(900, 7.0), np.array([], dtype=int))
+    x, y = pyr.decimated(900, 50)
+    assert np.all(y == 7.0)
@@ -0,0 +1,57 @@
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from bioflow.sim.fit import fit_steady, fit_trajectory
+from bioflow.sim.orchestrator import SimOrchestrator
+from bioflow.sim.state import Params, PARAM_LIMITS
+
+
+def test_fit_steady_hits_clinical_targets():
+    fields = ["peripheral_resistance", "stroke_volume_ml", "total_volume_ml"]
+    res = fit_steady({"MAP": 93.0, "CO": 5.0, "CVP": 6.0}, fields)
+    assert res.converged and res.status == "converged" and res.at_bound == ()
+    assert res.metrics["P_art_mean"] == pytest.approx(93.0, rel=1e-5)
+    assert res.metrics["cardiac_output_l_min"] == pytest.approx(5.0, rel=1e-5)
+    assert res.metrics["P_ven_mean"] == pytest.approx(6.0, rel=1e-5)
+    assert res.evaluations < 15
+    assert set(res.values) == set(fields)
+    assert res.params.peripheral_resistance == res.values["peripheral_resistance"]
+
+    # Warm start from the previous solution for a nearby target
+    again = fit_steady({"MAP": 95.0, "CO": 5.0, "CVP": 6.0}, fields, res.params,
+                       initial=res.solution.initial)
+    assert again.converged and again.evaluations <= res.evaluations
+
+
+def test_unreachable_target_stops_at_bound():
+    lo, _ = PARAM_LIMITS["peripheral_resistance"]
+    res = fit_steady({"MAP": 1.0}, ["peripheral_resistance"])
+    assert not res.converged and res.status == "no_step"
+    assert res.at_bound == ("peripheral_resistance",)
+    assert res.values["peripheral_resistance"] == lo
+
+
+def test_fit_trajectory_recovers_params():
+    base = Params(hr_bpm=60.0)                  # period / dt is whole: same grid as the solver
+    truth = replace(base, peripheral_resistance=1.6, arterial_compliance=1.4)
+    sim = SimOrchestrator(truth)
+    sim.play()
+    sim.tick(6000)                              # settle
+    rows = []
+    sim.tick(300, on_sample=lambda b: rows.append((b.t, b.P_art_mmHg, b.P_ven_mmHg)))
+    t, P_art, P_ven = np.array(rows).T
+
+    res = fit_trajectory(t, {"P_art_mmHg": P_art, "P_ven_mmHg": P_ven},
+                         ["peripheral_resistance", "arterial_compliance"], base)
+    assert res.converged
+    assert res.values["peripheral_resistance"] == pytest.approx(1.6, rel=1e-3)
+    assert res.values["arterial_compliance"] == pytest.approx(1.4, rel=1e-3)
+
+
+def test_rejects_bad_names():
+    with pytest.raises(KeyError):
+        fit_steady({"HR": 70.0}, ["hr_bpm"])
+    with pytest.raises(ValueError):
+        fit_steady({"MAP": 90.0}, ["dt"])
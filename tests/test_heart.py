@@ -1,4 +1,7 @@
-from bioflow.sim.heart import pump_flow_ml_s
+import numpy as np
+import pytest
+
+from bioflow.sim.heart import pump_flow_ml_s, PumpTable, pump_flow_ml_s_array, pump_table
 
 
 def integrate_over_period(hr_bpm: float, sv_ml: float, dt: float = 1e-4) -> float:
@@ -43,3 +46,66 @@ def test_mean_flow_matches_cardiac_output():
     mean_flow = total / period
     expected = hr * sv / 60.0
     assert abs(mean_flow - expected) < 1e-1
+
+
+# --- Tabulated mode ---
+
+
+def integrate_table_over_period(table: PumpTable, hr_bpm: float, sv_ml: float,
+                                dt: float = 1e-4) -> float:
+    period = 60.0 / hr_bpm
+    t = np.arange(0.0, period, dt)
+    return float(np.sum(table.flow_array(t, hr_bpm, sv_ml)) * dt)
+
+
+def test_table_integral_equals_stroke_volume():
+    for interp in ("linear", "cubic"):
+        table = PumpTable(resolution=64, interp=interp)
+        assert abs(integrate_table_over_period(table, 60.0, 80.0) - 80.0) < 1e-2
+        assert abs(integrate_table_over_period(table, 150.0, 45.0) - 45.0) < 1e-2
+
+
+def test_table_tracks_exact_waveform():
+    table = PumpTable(resolution=256, interp="cubic")
+    t = np.linspace(0.0, 2.0, 2001)
+    exact = pump_flow_ml_s_array(t, 75.0, 70.0)
+    approx = table.flow_array(t, 75.0, 70.0)
+    assert np.max(np.abs(approx - exact)) < 1e-3 * np.max(exact)
+    assert table.flow(0.1, 75.0, 70.0) == approx[100]
+
+
+def test_table_rebuilds_only_on_parameter_change():
+    table = PumpTable(resolution=32)
+    table.flow(0.1, 70.0, 70.0)
+    values = table.values
+    table.flow(0.2, 70.0, 70.0)
+    assert table.values is values
+    table.flow(0.2, 70.0, 90.0)
+    assert table.values is not values
+
+
+def test_array_matches_scalar():
+    t = np.linspace(0.0, 3.0, 3001)
+    arr = pump_flow_ml_s_array(t, 88.0, 65.0, 0.3)
+    ref = [pump_flow_ml_s(x, hr_bpm=88.0, stroke_volume_ml=65.0, systole_fraction=0.3) for x in t]
+    assert np.array_equal(arr, np.array(ref))
+
+
+def test_table_volume_integrates_its_flow():
+    for interp in ("linear", "cubic"):
+        table = PumpTable(resolution=32, interp=interp)
+        table.ensure(72.0, 70.0, 0.35)
+        assert abs(table.volume(0.0, table.period) - 70.0) < 1e-9
+        t = np.linspace(0.13, 0.97, 20001)
+        q = table.flow_array(t, 72.0, 70.0, 0.35)
+        riemann = float(np.sum(0.5 * (q[1:] + q[:-1]) * np.diff(t)))
+        assert abs(table.volume(0.13, 0.97) - riemann) < 1e-4
+
+
+def test_shared_tables_are_frozen_per_parameters():
+    a = pump_table(32, "cubic", 70.0, 70.0, 0.35)
+    assert pump_table(32, "cubic", 70.0, 70.0, 0.35) is a
+    assert pump_table(32, "cubic", 90.0, 70.0, 0.35) is not a
+    assert a.key == (70.0, 70.0, 0.35)
+    with pytest.raises(ValueError):
+        a.ensure(90.0, 70.0, 0.35)
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from bioflow.sim.history import History
+from bioflow.sim.orchestrator import SimOrchestrator
+from bioflow.sim.state import STATE_FIELDS
+
+
+def _rows(k, start=0):
+    return [tuple(float(start + i) for _ in STATE_FIELDS) for i in range(k)]
+
+
+def test_views_are_contiguous_zero_copy_after_wrap():
+    h = History(capacity=8)
+    h.extend(_rows(13))
+    t = h.view("t")
+    assert list(t) == [5.0, 6.0, 7.0, 8.0, 9.0, 10.0, 11.0, 12.0]
+    assert t.flags.c_contiguous
+    assert np.shares_memory(t, h._data)
+    with pytest.raises(ValueError):
+        t[0] = 0.0
+
+
+def test_append_and_extend_agree():
+    a = History(capacity=5)
+    b = History(capacity=5)
+    sim = SimOrchestrator()
+    sim.play()
+    rows = []
+    for _ in range(12):
+        s = sim.tick()
+        a.append(s)
+        rows.append(tuple(getattr(s, f) for f in STATE_FIELDS))
+    b.extend(rows[:3])
+    b.extend(rows[3:10])
+    b.extend(rows[10:])
+    for f in STATE_FIELDS:
+        assert np.array_equal(a.view(f), b.view(f))
+    assert a.last() == s
+    assert a.total == b.total == 12
+
+
+def test_window_counts_samples_by_time():
+    h = History(capacity=1000)
+    h.extend(_rows(500))
+    assert h.window(9.5) == 10
+    assert len(h.view("P_art_mmHg", h.window(9.5))) == 10
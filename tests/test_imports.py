@@ -0,0 +1,67 @@
+import os
+import subprocess
+import sys
+
+# Modules a headless user of the scalar simulator touches; none may pull in
+# NumPy or Qt. Array features (batch, steady, sweep, ...) bring NumPy.
+SCALAR = (
+    "bioflow.sim.state", "bioflow.sim.heart", "bioflow.sim.vessels", "bioflow.sim.engine",
+    "bioflow.sim.integrators", "bioflow.sim.orchestrator", "bioflow.sim.realtime",
+    "bioflow.sim.validate", "bioflow.sim.presets", "bioflow.sim.checkpoint",
+    "bioflow.cli", "bioflow.utils.timing",
+)
+IMPORT_BUDGET_MS = 150.0      # self time of bioflow's own modules above
+
+
+def _run(code: str) -> str:
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    return subprocess.run([sys.executable, "-X", "importtime", "-c", code], env=env,
+                          check=True, capture_output=True, text=True).stderr
+
+
+def _loaded(prefixes):
+    return (
+        "import sys\n"
+        f"print('LOADED', sorted({{m.split('.')[0] for m in sys.modules}} & {set(prefixes)!r}), file=sys.stderr)\n"
+    )
+
+
+def _loaded_line(err: str) -> str:
+    return next(line for line in err.splitlines() if line.startswith("LOADED"))
+
+
+def test_scalar_sim_imports_stay_light():
+    err = _run("".join(f"import {m}\n" for m in SCALAR) + _loaded(("numpy", "PySide6", "pyqtgraph")))
+    assert _loaded_line(err) == "LOADED []"
+
+    own_us = 0
+    for line in err.splitlines():
+        if line.startswith("import time:") and "bioflow" in line:
+            self_us, _, name = line.split(":", 1)[1].split("|")
+            own_us += int(self_us)
+    assert own_us / 1e3 < IMPORT_BUDGET_MS
+
+
+def test_array_features_bring_numpy_only():
+    err = _run("import bioflow.sim.batch, bioflow.sim.sweep, bioflow.sim.recording\n"
+               + _loaded(("numpy", "PySide6", "pyqtgraph")))
+    assert _loaded_line(err) == "LOADED ['numpy']"
+
+
+def test_pyqtgraph_loads_after_first_paint():
+    code = (
+        "import sys\n"
+        "from PySide6.QtWidgets import QApplication\n"
+        "from bioflow.ui.main_window import MainWindow\n"
+        "app = QApplication(sys.argv[:1])\n"
+        "win = MainWindow()\n"
+        "assert 'pyqtgraph' not in sys.modules\n"
+        "win.show()\n"
+        "for _ in range(50):\n"
+        "    app.processEvents()\n"
+        "    if win.plots.p_plot is not None:\n"
+        "        break\n"
+        "win.close()\n"
+        + _loaded(("pyqtgraph",))
+    )
+    assert _loaded_line(_run(code)) == "LOADED ['pyqtgraph']"
@@ -0,0 +1,83 @@
+from dataclasses import replace
+
+import pytest
+
+from bioflow.sim.state import Params, StateBuffer
+from bioflow.sim.engine import step
+from bioflow.sim.compiled import compiled
+from bioflow.sim.heart import pump_flow_ml_s, pumped_volume_ml
+from bioflow.sim.integrators import make_integrator, rates, INTEGRATORS
+from bioflow.sim.orchestrator import SimOrchestrator
+from bioflow.sim import presets
+
+
+def _reference(p: Params, seconds: float):
+    sim = SimOrchestrator(replace(p, dt=0.0005))
+    sim.play()
+    sim.tick(round(seconds / 0.0005))
+    return sim.state
+
+
+def test_euler_integrator_is_engine_step():
+    p = Params()
+    s = SimOrchestrator(p).state
+    buf = StateBuffer(s)
+    make_integrator("euler").advance(buf, p, 500)
+    for _ in range(500):
+        s = step(s, p)
+    assert buf.snapshot() == s
+
+
+@pytest.mark.parametrize("name,dt,tol_ml", [
+    ("rk4", 0.05, 0.1),
+    ("rk45", 0.5, 0.1),
+    ("imex", 0.1, 0.5),
+])
+def test_higher_order_and_large_steps_track_fine_reference(name, dt, tol_ml):
+    p = presets.low_compliance()
+    ref = _reference(p, 30.0)
+
+    sim = SimOrchestrator(p, integrator=name)
+    sim.update_params(dt=dt)
+    assert sim.params.dt == dt  # not clamped to the Euler range
+    sim.play()
+    s = sim.tick(round(30.0 / dt))
+
+    assert abs(s.t - 30.0) < 1e-9
+    assert abs(s.V_art_ml - ref.V_art_ml) < tol_ml
+    assert abs(s.V_art_ml + s.V_ven_ml + s.V_pool_ml - p.total_volume_ml) < 1e-9
+
+
+def test_imex_stable_where_euler_would_not_be():
+    # Ca=0.1 at dt=0.5 is far outside forward Euler's stability region
+    p = replace(Params(), arterial_compliance=0.1, peripheral_resistance=0.05, dt=0.5)
+    sim = SimOrchestrator(p, integrator="imex")
+    sim.play()
+    s = sim.tick(200)
+    assert 0.0 <= s.V_art_ml <= p.total_volume_ml
+    assert s.P_art_mmHg < 1000.0
+
+
+def test_rk45_and_imex_read_the_tabulated_pump():
+    p = replace(Params(), pump_table_size=4)
+    c = compiled(p)
+    exact = pumped_volume_ml(0.05, 0.2, p.hr_bpm, p.stroke_volume_ml, p.systole_fraction)
+    assert c.pumped_volume(0.05, 0.2) == c.table.volume(0.05, 0.2) != exact
+
+    tab = rates(0.1, 1000.0, 3500.0, 500.0, p)       # RK45 right-hand side
+    ref = rates(0.1, 1000.0, 3500.0, 500.0, Params())
+    assert tab[0] - ref[0] == pytest.approx(c.pump_flow(0.1) - pump_flow_ml_s(0.1, p.hr_bpm, p.stroke_volume_ml))
+
+
+def test_set_integrator_reclamps_dt():
+    sim = SimOrchestrator(integrator="imex")
+    sim.update_params(dt=0.4)
+    sim.set_integrator("euler")
+    assert sim.params.dt == 0.05
+    assert set(INTEGRATORS) == {"euler", "rk4", "rk45", "imex"}
+
+
+def test_integrator_base_is_abstract():
+    from bioflow.sim.integrators import Integrator
+    with pytest.raises(TypeError):
+        Integrator()
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from bioflow.sim.engine import step
+from bioflow.sim.network import Bed, Compartment, Edge, Network, NetworkEngine
+from bioflow.sim.orchestrator import SimOrchestrator
+from bioflow.sim.state import Params
+
+
+@pytest.mark.parametrize("p", [
+    Params(),
+    Params(resistance_nonlinearity=0.0, arterial_compliance=0.7, hr_bpm=140.0),
+    Params(peripheral_resistance=4.0, venous_pooling_target=0.4, pooling_tau_s=2.0),
+])
+def test_three_compartment_special_case_is_exact(p):
+    net = NetworkEngine(Network.from_params(p))
+    s = SimOrchestrator(p).state
+    assert net.state() == s
+    for _ in range(1500):
+        s = step(s, p)
+    net.step(1500)
+    assert net.state() == s
+
+
+def test_many_beds_conserve_volume():
+    p = Params()
+    beds = {f"bed{i}": Bed(resistance=50.0 + i, compliance=0.5, v0_ml=5.0) for i in range(300)}
+    net = Network.parallel_beds(p, beds)
+    assert net.n == 303 and len(net.edges) == 602
+    eng = NetworkEngine(net)
+    assert eng.V.sum() == pytest.approx(p.total_volume_ml)
+    eng.step(2000)
+    assert eng.V.sum() == pytest.approx(p.total_volume_ml, rel=1e-12)
+    assert np.all(eng.V >= 0.0)
+    # all beds are perfused from the arteries
+    assert all(eng.flow(f"art->bed{i}") > 0.0 for i in range(300))
+
+
+def test_unknown_compartment_rejected():
+    with pytest.raises(ValueError):
+        Network([Compartment("a", 1.0)], [Edge("a", "b")])
@@ -18,3 +18,28 @@ def test_nonlinear_sublinear_scaling():
 
     assert Q2 < 2.0 * Q1
     assert Q2 > Q1  # still increases
+
+
+def test_stable_root_for_tiny_k():
+    from decimal import Decimal, getcontext
+
+    getcontext().prec = 50
+    for k in (1e-3, 1e-8, 1e-14):
+        dP, R0 = 50.0, 1.3
+        Q = peripheral_flow_nonlinear_ml_s(dP, R0, k)
+        D = Decimal
+        exact = 2 * D(dP) / (D(R0) + (D(R0) ** 2 + 4 * D(R0) * D(k) * D(dP)).sqrt())
+        assert abs((D(Q) - exact) / exact) < D("1e-15")
+        # Q solves the model: dP = R0 * (1 + k|Q|) * Q
+        assert abs(R0 * (1.0 + k * abs(Q)) * Q - dP) < 1e-12 * dP
+
+
+def test_array_matches_scalar_bitwise():
+    import numpy as np
+    from bioflow.sim.vessels import peripheral_flow_nonlinear_array
+
+    dP = np.array([-120.0, -3.5, -0.0, 0.0, 1e-9, 42.0, 300.0])
+    for R0, k in ((1.0, 0.015), (0.05, 0.0), (20.0, 1e-12), (0.0, 0.3)):
+        Q = peripheral_flow_nonlinear_array(dP, R0, k)
+        assert Q.tolist() == [peripheral_flow_nonlinear_ml_s(x, R0, k) for x in dP.tolist()]
+        assert Q.tolist() == (-peripheral_flow_nonlinear_array(-dP, R0, k)).tolist()
@@ -18,3 +18,16 @@ def test_weak_pump_reduces_sv():
     p = Params(stroke_volume_ml=70.0)
     p2 = presets.weak_pump(p)
     assert p2.stroke_volume_ml < p.stroke_volume_ml
+
+
+def test_get_by_name(monkeypatch):
+    import pytest
+    assert presets.get("weak_pump") == presets.weak_pump()
+    with pytest.raises(ValueError):
+        presets.get("nope")
+
+    def broken(p=None):
+        return {}["missing"]
+    monkeypatch.setitem(presets.PRESETS, "broken", broken)
+    with pytest.raises(KeyError):           # not reported as an unknown preset
+        presets.get("broken")
@@ -0,0 +1,43 @@
+import time
+
+from bioflow.sim.orchestrator import SimOrchestrator
+from bioflow.sim.realtime import SimWorker
+from bioflow.sim import presets
+
+
+def test_queued_changes_apply_at_step_boundaries():
+    # Same schedule through the worker and directly must give identical states
+    ref = SimOrchestrator()
+    ref.play()
+    ref.tick(100)
+    ref.update_params(peripheral_resistance=2.5, dt=1.0)
+    ref.tick(100)
+
+    w = SimWorker(SimOrchestrator())
+    w.play()
+    w.pump(100)
+    w.update_params(peripheral_resistance=2.5, dt=1.0)
+    assert w.params.peripheral_resistance == 2.5   # visible immediately
+    assert w.params.dt == 0.05                      # clamped like the orchestrator
+    assert w.sim.params.peripheral_resistance == 1.0  # not applied yet
+    w.pump(100)
+
+    assert w.latest == ref.state
+
+
+def test_set_params_reads_back_before_apply():
+    w = SimWorker(SimOrchestrator())
+    w.set_params(presets.weak_pump())
+    assert w.params.stroke_volume_ml == presets.weak_pump().stroke_volume_ml
+
+
+def test_thread_paces_to_real_time_factor():
+    w = SimWorker(SimOrchestrator(), real_time_factor=20.0)
+    w.play()
+    w.start()
+    time.sleep(0.3)
+    w.stop()
+
+    assert not w.running
+    # ~6 s of sim in 0.3 s of wall time; generous bounds for slow CI boxes
+    assert 2.0 < w.latest.t < 8.0
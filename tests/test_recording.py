@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+from bioflow import cli
+from bioflow.sim.orchestrator import SimOrchestrator
+from bioflow.sim.recording import Recorder, Recording
+
+
+def _record(path, **kw):
+    sim = SimOrchestrator()
+    sim.play()
+    rec = Recorder(path, chunk_rows=64, **kw)
+    sim.attach(rec)
+    ts, p_art = [sim.state.t], [sim.state.P_art_mmHg]
+    for i in range(500):
+        if i == 100:
+            sim.update_params(peripheral_resistance=1.6)
+        if i == 300:
+            sim.update_params(peripheral_resistance=0.9, hr_bpm=90.0)
+        s = sim.tick(1)
+        ts.append(s.t)
+        p_art.append(s.P_art_mmHg)
+    sim.detach(rec)
+    return np.array(ts), np.array(p_art)
+
+
+def test_roundtrip_columns_and_seek(tmp_path):
+    path = tmp_path / "run.rec"
+    ts, p_art = _record(path)
+    with Recording(path) as r:
+        assert len(r) == 501
+        np.testing.assert_array_equal(r.column("t"), ts)
+        np.testing.assert_array_equal(r.column("P_art_mmHg", 130, 260), p_art[130:260])
+        i = r.index_at(2.345)
+        assert ts[i] <= 2.345 < ts[i + 1]
+        assert r.state_at(2.345).t == ts[i]
+        blocks = list(r.iter_blocks(1.0, 2.0, rows=40))
+        got = np.concatenate([b["t"] for b in blocks])
+        np.testing.assert_array_equal(got, ts[(ts >= 1.0) & (ts <= 2.0)])
+
+
+def test_param_event_index(tmp_path):
+    path = tmp_path / "run.rec"
+    _record(path)
+    with Recording(path) as r:
+        t, v = r.last_change("peripheral_resistance")
+        assert v == 0.9 and t == pytest.approx(3.0)
+        t, v = r.last_change("peripheral_resistance", before_t=2.5)
+        assert v == 1.6 and t == pytest.approx(1.0)
+        assert r.last_change("peripheral_resistance", before_t=0.5) is None
+        assert r.params_at(0.5).peripheral_resistance == r.initial_params.peripheral_resistance
+        assert r.params_at(3.5).hr_bpm == 90.0
+        assert [(e[1], e[2]) for e in r.events()] == [
+            (101, "peripheral_resistance"), (301, "peripheral_resistance"), (301, "hr_bpm")]
+
+
+def test_float32_decimated(tmp_path):
+    path = tmp_path / "small.rec"
+    ts, p_art = _record(path, dtype="f4", every=10)
+    with Recording(path) as r:
+        assert len(r) == 51
+        np.testing.assert_array_equal(r.column("t"), ts[::10])
+        np.testing.assert_allclose(r.column("P_art_mmHg"), p_art[::10], rtol=1e-6)
+
+
+def test_cli_rec_format(tmp_path):
+    out = tmp_path / "cli.rec"
+    cli.main(["run", "--duration", "1", "--sample-interval", "0.1", "--format", "rec", "-o", str(out)])
+    with Recording(out) as r:
+        assert len(r) == 11
+        assert r.column("t")[-1] == pytest.approx(1.0)
+
+
+def test_reset_starts_a_new_segment(tmp_path):
+    path = tmp_path / "two.rec"
+    sim = SimOrchestrator()
+    sim.play()
+    rec = Recorder(path, chunk_rows=64)
+    sim.attach(rec)
+    sim.tick(150)
+    first = sim.state
+    sim.reset(keep_params=False)
+    sim.update_params(hr_bpm=90.0)
+    sim.play()
+    sim.tick(100)
+    second = sim.state
+    sim.detach(rec)
+
+    with Recording(path) as r:
+        assert r.segments == [(0, 151), (151, 252)]
+        assert r.row(151)["t"] == 0.0
+        assert r.state_at(second.t) == second
+        assert r.state_at(second.t, segment=0).t == second.t  # same clock, other timeline
+        assert r.state_at(first.t, segment=0) == first
+        assert r.params_at(0.5).hr_bpm == 90.0
+        assert r.params_at(0.5, segment=0).hr_bpm == r.initial_params.hr_bpm
+        assert r.last_change("hr_bpm")[1] == 90.0
+        assert r.last_change("hr_bpm", segment=0) is None
+        assert np.all(np.diff(np.concatenate([b["t"] for b in r.iter_blocks()])) > 0)
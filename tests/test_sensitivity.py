@@ -0,0 +1,40 @@
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from bioflow.sim.sensitivity import SENSITIVITY_FIELDS, sensitivity
+from bioflow.sim.state import Params
+from bioflow.sim.steady import solve_periodic
+
+
+def test_matches_sequential_finite_difference():
+    p = Params()
+    S = sensitivity(p)
+    assert S.converged
+    assert S.jacobian.shape == (len(S.metrics), len(SENSITIVITY_FIELDS))
+
+    h = 1e-3 * p.peripheral_resistance
+    hi = solve_periodic(replace(p, peripheral_resistance=p.peripheral_resistance + h), tol_ml=1e-9)
+    lo = solve_periodic(replace(p, peripheral_resistance=p.peripheral_resistance - h), tol_ml=1e-9)
+    d = (hi.metrics["P_art_mean"] - lo.metrics["P_art_mean"]) / (2 * h)
+    assert S.of("P_art_mean", "peripheral_resistance", normalized=False) == pytest.approx(d, rel=1e-3)
+
+
+def test_known_elasticities():
+    S = sensitivity()
+    # Mean pump output is SV * HR, and the pool settles at target * total
+    assert S.of("Q_periph_mean", "hr_bpm") == pytest.approx(1.0, abs=1e-4)
+    assert S.of("Q_periph_mean", "stroke_volume_ml") == pytest.approx(1.0, abs=1e-4)
+    assert S.of("V_pool_mean", "venous_pooling_target") == pytest.approx(1.0, abs=1e-4)
+    assert S.of("P_art_mean", "peripheral_resistance") > 0.5
+    assert S.ranked("V_pool_mean")[0][0] in ("venous_pooling_target", "total_volume_ml")
+    assert np.isnan(S.of("P_art_mean", "V0_pool_ml"))      # zero-valued field
+
+
+def test_one_sided_at_limits_and_bad_fields():
+    p = replace(Params(), hr_bpm=250.0)
+    S = sensitivity(p, ["hr_bpm"])
+    assert S.of("Q_periph_mean", "hr_bpm") == pytest.approx(1.0, abs=1e-3)
+    with pytest.raises(TypeError):
+        sensitivity(fields=["pump_interp"])
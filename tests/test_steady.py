@@ -0,0 +1,44 @@
+from dataclasses import replace
+
+from bioflow.sim.state import Params
+from bioflow.sim.orchestrator import SimOrchestrator
+from bioflow.sim.steady import solve_periodic, solve_periodic_batch
+from bioflow.sim import presets
+
+
+def _brute_force_beat_start(p: Params, sol, beats: int = 600):
+    sim = SimOrchestrator(replace(p, dt=sol.dt))
+    sim.play()
+    sim.tick(sol.steps_per_beat * beats)
+    return sim.state
+
+
+def test_matches_long_transient_run():
+    for p in (Params(), presets.high_resistance()):
+        sol = solve_periodic(p)
+        assert sol.converged
+        assert sol.beats < 40
+
+        s = _brute_force_beat_start(p, sol)
+        assert abs(s.V_art_ml - sol.initial.V_art_ml) < 1e-3
+        assert abs(s.V_pool_ml - sol.initial.V_pool_ml) < 1e-3
+
+
+def test_waveform_is_one_closed_beat():
+    sol = solve_periodic(presets.low_compliance())
+    w = sol.waveform
+    assert len(w["t"]) == sol.steps_per_beat + 1
+    assert abs(w["t"][-1] - 60.0 / sol.params.hr_bpm) < 1e-9
+    assert abs(w["V_art_ml"][-1] - w["V_art_ml"][0]) < 1e-5
+    m = sol.metrics
+    assert m["P_art_dia"] < m["P_art_mean"] < m["P_art_sys"]
+    assert abs(m["cardiac_output_l_min"] - 70.0 * 70.0 / 1000.0) < 0.05
+
+
+def test_batch_lanes_match_single_solves():
+    ps = [Params(), presets.weak_pump()]
+    batch = solve_periodic_batch(ps)
+    for p, sol in zip(ps, batch):
+        single = solve_periodic(p)
+        # Lanes share one step count, so weak_pump runs at a finer dt than alone
+        assert abs(single.metrics["P_art_mean"] - sol.metrics["P_art_mean"]) < 0.05
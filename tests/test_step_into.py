@@ -0,0 +1,31 @@
+import pytest
+
+from bioflow.sim.state import State, StateBuffer, Params
+from bioflow.sim.engine import step, step_into, compute_derived
+from bioflow.sim.orchestrator import SimOrchestrator
+
+
+def test_step_into_matches_step():
+    p = Params(hr_bpm=95.0, peripheral_resistance=2.5)
+    s = compute_derived(State(V_art_ml=1200.0, V_ven_ml=3600.0, V_pool_ml=200.0), p)
+    buf = StateBuffer(s)
+
+    for _ in range(3000):
+        s = step(s, p)
+        step_into(buf, p)
+
+    assert buf.snapshot() == s
+
+
+def test_orchestrator_state_is_read_only_snapshot():
+    sim = SimOrchestrator()
+    sim.play()
+    s1 = sim.tick(10)
+    assert sim.state is s1  # cached until the next tick
+
+    with pytest.raises(AttributeError):
+        sim.state = State()
+
+    s2 = sim.tick(1)
+    assert s2 is not s1
+    assert s2.t > s1.t
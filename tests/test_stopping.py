@@ -0,0 +1,84 @@
+import math
+
+import numpy as np
+import pytest
+
+from bioflow.sim.batch import BatchEngine
+from bioflow.sim.state import Params
+from bioflow.sim.stopping import Drift, NonFinite, Predicate, Steady, run_until
+from bioflow.sim.sweep import grid, run_sweep
+
+
+def test_completed_lanes_match_plain_stepping():
+    params = [Params(), Params(dt=0.02, hr_bpm=95.0), Params(dt=0.005)]
+    report = run_until(BatchEngine(params), [400, 150, 777], [NonFinite(), Drift()], check_every=64)
+    assert list(report.reason) == ["completed"] * 3
+    assert list(report.stop_step) == [400, 150, 777]
+    for i, (p, n) in enumerate(zip(params, (400, 150, 777))):
+        ref = BatchEngine([p])
+        ref.step(n)
+        assert report.final["V_art_ml"][i] == ref.s["V_art_ml"][0]
+        assert report.stop_t[i] == ref.s["t"][0]
+
+
+def test_predicate_and_non_finite_compact_lanes():
+    params = [Params(), Params(peripheral_resistance=8.0), Params(arterial_compliance=math.nan)]
+    eng = BatchEngine(params)
+    high = Predicate("hypertensive", lambda s, p: s["P_art_mmHg"] > 200.0)
+    report = run_until(eng, 3000, [NonFinite(), high], check_every=10)
+
+    assert list(report.reason) == ["completed", "hypertensive", "non_finite"]
+    assert report.stop_step[2] == 10
+    assert 0 < report.stop_step[1] < 3000 and report.stop_step[1] % 10 == 0
+    assert report.lane_steps == 3000 + report.stop_step[1] + 10
+    assert eng.n == 0
+
+    ref = BatchEngine(params[:1])
+    ref.step(3000)
+    assert report.final["P_art_mmHg"][0] == ref.s["P_art_mmHg"][0]
+
+
+def test_compact_keeps_pump_options_with_their_lanes():
+    eng = BatchEngine([Params(), Params(pump_interp="cubic"), Params(hr_bpm=90.0)])
+    eng.compact(np.array([False, True, True]))
+    assert [eng.params(i).pump_interp for i in range(eng.n)] == ["cubic", "linear"]
+    assert eng.params(1).hr_bpm == 90.0
+
+
+def test_steady_state_ends_run():
+    report = run_until(BatchEngine([Params(), Params(hr_bpm=120.0)]), 20000, [Steady(tol=0.05)])
+    assert list(report.reason) == ["steady", "steady"]
+    assert np.all(report.stop_t < 150.0)
+
+
+def test_sweep_reports_stops():
+    sw = grid(peripheral_resistance=[1.0, 8.0])
+    high = Predicate("hypertensive", lambda s, p: s["P_art_mmHg"] > 200.0)
+    res = run_sweep(sw, warmup_s=20.0, window_s=1.0, workers=0, stop=[NonFinite(), high], check_every=20)
+    assert list(res.stop_reason) == ["completed", "hypertensive"]
+    assert res.stop_t[0] == pytest.approx(21.0)
+    assert res.stop_t[1] < 21.0
+    assert res.metrics["P_art_sys"][1] > 200.0  # stats over the last window before the stop
+
+
+def test_predicate_fingerprint_tracks_the_callback(tmp_path):
+    def rule(limit):
+        return Predicate("high", lambda s, p: s["P_art_mmHg"] > limit)
+
+    assert rule(200.0).describe() == rule(200.0).describe()
+    assert rule(200.0).describe() != rule(150.0).describe()
+    assert Predicate("high", lambda s, p: s["P_art_mmHg"] > 1.0).describe() != \
+        Predicate("high", lambda s, p: s["P_ven_mmHg"] > 1.0).describe()
+
+    sw = grid(peripheral_resistance=[1.0, 8.0])
+    kw = dict(warmup_s=1.0, window_s=0.5, chunk_size=1, shard_dir=str(tmp_path))
+    run_sweep(sw, workers=0, stop=[rule(200.0)], **kw)
+    with pytest.raises(ValueError):
+        run_sweep(sw, workers=0, stop=[rule(150.0)], **kw)
+
+
+def test_unpicklable_predicate_rejected_for_workers():
+    sw = grid(peripheral_resistance=[1.0, 8.0])
+    high = Predicate("high", lambda s, p: s["P_art_mmHg"] > 200.0)
+    with pytest.raises(ValueError, match="pickle"):
+        run_sweep(sw, warmup_s=1.0, window_s=0.5, chunk_size=1, workers=2, stop=[high])
@@ -0,0 +1,60 @@
+import os
+
+import numpy as np
+import pytest
+
+from bioflow.sim.orchestrator import SimOrchestrator
+from bioflow.sim.state import Params
+from bioflow.sim.sweep import grid, monte_carlo, run_sweep
+
+
+def test_grid_shape_and_clamping():
+    sw = grid(hr_bpm=[60, 90, 400], stroke_volume_ml=[50, 70])
+    assert sw.shape == (3, 2) and len(sw) == 6
+    assert sw.params[-1].hr_bpm == 250.0  # clamped like update_params
+    assert sw.params[1].hr_bpm == 60.0 and sw.params[1].stroke_volume_ml == 70.0
+
+
+def test_monte_carlo_is_seeded():
+    a = monte_carlo(5, seed=3, hr_bpm=(60, 120), peripheral_resistance=(0.5, 2.0))
+    b = monte_carlo(5, seed=3, hr_bpm=(60, 120), peripheral_resistance=(0.5, 2.0))
+    assert a.params == b.params
+
+
+def test_metrics_match_orchestrator():
+    sw = grid(hr_bpm=[70, 110])
+    res = run_sweep(sw, warmup_s=1.0, window_s=1.0, workers=0)
+
+    sim = SimOrchestrator(sw.params[1])
+    sim.play()
+    sim.tick(100)
+    p_art = []
+    for _ in range(100):
+        p_art.append(sim.tick(1).P_art_mmHg)
+    assert res.metrics["P_art_mean"][1] == pytest.approx(np.mean(p_art), rel=1e-12)
+    assert res.metrics["P_art_sys"][1] == pytest.approx(max(p_art), rel=1e-12)
+    assert res.level.shape == (2,) and set(res.level) <= {"OK", "WARN"}
+
+
+def test_deterministic_across_workers_and_resumable(tmp_path):
+    sw = grid(hr_bpm=[60, 80, 100], peripheral_resistance=[0.8, 1.5], dt=[0.01])
+    kw = dict(warmup_s=0.5, window_s=0.5, chunk_size=2)
+    serial = run_sweep(sw, workers=0, **kw)
+    pooled = run_sweep(sw, workers=2, shard_dir=str(tmp_path), **kw)
+    for k in serial.metrics:
+        np.testing.assert_array_equal(serial.metrics[k], pooled.metrics[k])
+    np.testing.assert_array_equal(serial.level, pooled.level)
+
+    os.remove(tmp_path / "shard-00001.npz")
+    resumed = run_sweep(sw, workers=0, shard_dir=str(tmp_path), **kw)
+    np.testing.assert_array_equal(serial.metrics["P_art_mean"], resumed.metrics["P_art_mean"])
+
+    with pytest.raises(ValueError):
+        run_sweep(sw, workers=0, shard_dir=str(tmp_path), warmup_s=1.0, window_s=0.5, chunk_size=2)
+
+
+def test_manifest_covers_pump_options(tmp_path):
+    kw = dict(warmup_s=0.2, window_s=0.2, chunk_size=2, workers=0, shard_dir=str(tmp_path))
+    run_sweep(grid(base=Params(pump_table_size=256), hr_bpm=[60, 80]), **kw)
+    with pytest.raises(ValueError):
+        run_sweep(grid(base=Params(pump_table_size=256, pump_interp="cubic"), hr_bpm=[60, 80]), **kw)
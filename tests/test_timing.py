@@ -0,0 +1,68 @@
+import json
+
+from bioflow.sim.orchestrator import SimOrchestrator
+from bioflow.utils import timing
+from bioflow.utils.timing import Profiler
+
+
+def test_disabled_profiler_records_nothing():
+    prof = Profiler()
+
+    @prof.timed("f")
+    def f(x):
+        return x + 1
+
+    with prof.span("s"):
+        assert f(1) == 2
+    assert prof.summary() == {}
+
+
+def test_percentiles_and_rolling_window():
+    prof = Profiler(window=100)
+    prof.enable()
+    for i in range(1, 201):                 # only 101..200 stay in the window
+        prof.record("x", 0, i * 1000)
+    s = prof.stats("x")
+    assert (s.count, s.total) == (100, 200)
+    assert (s.p50_us, s.p95_us, s.p99_us, s.max_us) == (150.0, 195.0, 199.0, 200.0)
+    assert "x" in prof.report()
+
+
+def test_decorator_times_failures_and_keeps_metadata():
+    prof = Profiler()
+    prof.enable()
+
+    @prof.timed()
+    def boom():
+        """doc"""
+        raise RuntimeError
+
+    try:
+        boom()
+    except RuntimeError:
+        pass
+    assert boom.__doc__ == "doc"
+    assert prof.stats(boom.__qualname__).count == 1
+
+
+def test_sim_tick_span_and_chrome_trace(tmp_path):
+    timing.reset()
+    timing.enable(trace=True)
+    try:
+        sim = SimOrchestrator()
+        sim.play()
+        for _ in range(5):
+            sim.tick(10)
+        assert timing.stats("sim.tick").count == 5
+        path = tmp_path / "trace.json"
+        assert timing.dump_chrome_trace(str(path)) == 5
+    finally:
+        timing.disable()
+        timing.reset()
+
+    events = json.loads(path.read_text())["traceEvents"]
+    spans = [e for e in events if e["ph"] == "X"]
+    assert {e["name"] for e in spans} == {"sim.tick"}
+    assert all(e["dur"] >= 0 for e in spans)
+    assert spans == sorted(spans, key=lambda e: e["ts"])
+    assert any(e["ph"] == "M" and e["name"] == "thread_name" for e in events)
@@ -18,3 +18,49 @@ def test_main_window_constructs(qapp):
     # Don’t show; just ensure it builds and has a title
     assert "BioFlow" in w.windowTitle()
     w.close()
+
+
+def test_timing_overlay_reports_frame_spans(qapp):
+    from bioflow.utils import timing
+
+    w = MainWindow(show_timing=True)
+    try:
+        w.timer.stop()
+        w.worker.stop()
+        w.show()
+        timing.reset()
+        for _ in range(30):
+            w.worker.pump(2)
+            w.on_tick()
+            qapp.processEvents()
+        names = set(timing.summary())
+        assert {"sim.tick", "ui.on_tick", "ui.assess", "plots.redraw", "plots.ingest"} <= names
+        assert {"paint.loop_view", "paint.volume_bar"} <= names
+        assert "ui.on_tick" in w.timing_overlay.text()
+    finally:
+        timing.disable()
+        timing.reset()
+        w.close()
+
+
+def test_paused_window_redraws_on_param_change(qapp):
+    w = MainWindow()
+    try:
+        w.timer.stop()
+        w.worker.stop()
+        w.worker.pause()
+        w.worker.pump(0)
+        w.on_tick()
+        drawn = []
+        w.volbar.update_from_state = lambda s, p: drawn.append((s, p))
+        w.on_tick()
+        assert drawn == []  # nothing new to draw
+
+        w.worker.update_params(peripheral_resistance=2.0)
+        w.worker.pump(0)
+        w.on_tick()
+        s, p = drawn[-1]
+        assert p.peripheral_resistance == 2.0
+        assert s.Q_periph_ml_s == w.worker.sim.state.Q_periph_ml_s
+    finally:
+        w.close()
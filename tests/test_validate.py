@@ -0,0 +1,64 @@
+import math
+
+import numpy as np
+
+from bioflow.sim.batch import BatchEngine
+from bioflow.sim.state import Params, State, STATE_FIELDS
+from bioflow.sim.validate import (
+    AFTERLOAD_OVERLOAD, NON_FINITE, OK, assess, assess_array, assess_code,
+)
+
+
+def _random_states(n, seed=0):
+    rng = np.random.default_rng(seed)
+    cols = {
+        "t": rng.uniform(0, 10, n),
+        "V_art_ml": rng.uniform(-50, 2500, n),
+        "V_pool_ml": rng.uniform(0, 2600, n),
+        "P_art_mmHg": rng.uniform(-1, 300, n),
+        "P_ven_mmHg": rng.uniform(0, 20, n),
+        "P_pool_mmHg": rng.uniform(0, 20, n),
+        "Q_periph_ml_s": rng.uniform(-3, 3, n) * rng.choice([1, 100], n),
+        "Q_pump_ml_s": rng.uniform(0, 400, n) * rng.choice([0, 1], n),
+        "Q_pool_ml_s": rng.uniform(-10, 10, n),
+    }
+    cols["V_ven_ml"] = 5000.0 - cols["V_art_ml"] - cols["V_pool_ml"] + rng.choice([0, 0, 0, 1.0], n)
+    cols["P_art_mmHg"][::17] = math.nan
+    return cols
+
+
+def test_array_matches_scalar_rule_by_rule():
+    p = Params()
+    cols = _random_states(4000)
+    h = assess_array(cols, p)
+    for i in range(4000):
+        s = State(**{name: float(cols[name][i]) for name in STATE_FIELDS})
+        assert h.code[i] == assess_code(s, p)
+        assert h.health(i) == assess(s, p)
+        assert h.level[i] == assess(s, p).level and h.ok[i] == assess(s, p).ok
+    assert set(np.unique(h.code)) == set(range(OK, AFTERLOAD_OVERLOAD + 1))
+
+
+def test_first_violation_over_lane_trajectories():
+    cols = _random_states(60, seed=3)
+    for name in cols:
+        cols[name] = cols[name].reshape(3, 20)
+    cols["P_art_mmHg"][:] = 100.0
+    cols["V_art_ml"][:] = 1000.0
+    cols["V_pool_ml"][:] = 500.0
+    cols["V_ven_ml"][:] = 3500.0
+    cols["Q_periph_ml_s"][:] = 80.0
+    cols["V_ven_ml"][1, 7:] = np.inf
+    cols["P_art_mmHg"][2, 4] = 260.0
+    h = assess_array(cols, {"dt": np.full(3, 0.01), "total_volume_ml": np.full(3, 5000.0)})
+    assert list(h.first_violation) == [-1, 7, 4]
+    assert list(h.first_fatal) == [-1, 7, -1]
+    assert h.code[1, 7] == NON_FINITE
+
+
+def test_batch_engine_lanes():
+    eng = BatchEngine([Params(), Params(peripheral_resistance=20.0, arterial_compliance=0.1)])
+    eng.step(500)
+    h = assess_array(eng.s, eng.p)
+    for i in range(2):
+        assert h.health(i) == assess(eng.state(i), eng.params(i))